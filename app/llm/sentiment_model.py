@@ -1,6 +1,9 @@
 from textblob import TextBlob
 
 class SentimentModel:
+    # Identity in the shared sentiment cache; the API's TextBlob fallback uses the same one
+    MODEL_ID = "textblob"
+
     def __init__(self):
         pass
 
@@ -26,3 +29,16 @@ class SentimentModel:
             "sentiment_type": sentiment_type,
             "sentiment_score": score
         }
+
+    def analyze_many(self, texts, cache=None):
+        """
+        Analyzes a list of texts, scoring each distinct text once.
+        With a SentimentCache, texts scored in earlier runs (or by other
+        workers) are read back instead of re-analyzed.
+        """
+        known = cache.get_many(self.MODEL_ID, texts) if cache is not None else {}
+        fresh = {text: self.analyze(text) for text in dict.fromkeys(texts) if text not in known}
+        if cache is not None:
+            cache.put_many(self.MODEL_ID, {t: r for t, r in fresh.items() if t})
+        results = {**known, **fresh}
+        return [dict(results[text]) for text in texts]
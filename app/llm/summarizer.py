@@ -1,3 +1,29 @@
+from collections import Counter
+
+class SummaryStats:
+    """Running counts for the weekly summary, so records can be streamed past it."""
+    def __init__(self):
+        self.num_engagements = 0
+        self.sentiments = Counter()
+        self.topics = Counter()
+
+    def add(self, record):
+        self.num_engagements += 1
+        self.sentiments[record.get("sentiment", {}).get("sentiment_type", "neutral")] += 1
+        self.topics[record.get("topic", {}).get("topic", "general")] += 1
+
+    def add_columns(self, sentiment_types, topics):
+        """Adds already-flattened rows, e.g. from a columnar results file."""
+        self.num_engagements += len(sentiment_types)
+        self.sentiments.update(sentiment_types)
+        self.topics.update(topics)
+
+    def add_counts(self, sentiment_counts, topic_counts):
+        """Adds rows already counted per label, e.g. by ProcessedIndex.counts()."""
+        self.num_engagements += sum(sentiment_counts.values())
+        self.sentiments.update(sentiment_counts)
+        self.topics.update(topic_counts)
+
 class Summarizer:
     def __init__(self):
         pass
@@ -6,19 +32,24 @@ class Summarizer:
         """
         Generates a weekly executive summary based on analytics results.
         """
-        num_engagements = len(analytics_results)
-        
+        stats = SummaryStats()
+        for record in analytics_results:
+            stats.add(record)
+        return self.summarize(stats)
+
+    def summarize(self, stats):
+        """
+        Generates the weekly executive summary from accumulated SummaryStats.
+        """
         # Calculate sentiment stats
-        sentiments = [r.get("sentiment", {}).get("sentiment_type", "neutral") for r in analytics_results]
-        positive_count = sentiments.count("positive")
-        negative_count = sentiments.count("negative")
-        
+        positive_count = stats.sentiments["positive"]
+        negative_count = stats.sentiments["negative"]
+
         # Calculate top topics
-        topics = [r.get("topic", {}).get("topic", "general") for r in analytics_results]
-        top_topic = max(set(topics), key=topics.count) if topics else "N/A"
-        
+        top_topic = stats.topics.most_common(1)[0][0] if stats.topics else "N/A"
+
         summary = f"""WEEKLY PS EXEC SUMMARY
-- {num_engagements} engagements analyzed this week
+- {stats.num_engagements} engagements analyzed this week
 - Top topic: {top_topic}
 - Sentiment: {positive_count} positive, {negative_count} negative
 - Recommended focus: Address recurring issues in {top_topic} and ensure team is upskilled.
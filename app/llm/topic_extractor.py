@@ -1,6 +1,10 @@
-import random
+from backend.shared.topics import TOPIC_KEYWORDS, TopicMatcher
 
 class TopicExtractor:
+    # Compiled once and shared by every instance; the API uses the same
+    # matcher and vocabulary (backend/shared/topics.py)
+    matcher = TopicMatcher(TOPIC_KEYWORDS)
+
     def __init__(self):
         # In a real scenario, this would initialize an LLM client
         pass
@@ -9,19 +13,8 @@ class TopicExtractor:
         """
         Extracts the main topic from the text.
         For this demo, we use a heuristic approach since we might not have API keys.
+        All keywords are matched in one pass; the result lists every matched
+        topic with its hit count, and confidence grows with the chosen topic's
+        share of the hits.
         """
-        text_lower = text.lower()
-        
-        topics = {
-            "streaming": ["streaming", "auto loader", "kafka", "real-time"],
-            "governance": ["governance", "unity catalog", "permissions", "access control"],
-            "performance": ["performance", "slow", "optimize", "latency", "tuning"],
-            "migration": ["migration", "legacy", "convert", "move"],
-            "infrastructure": ["terraform", "deployment", "setup", "configuration", "network"]
-        }
-        
-        for topic, keywords in topics.items():
-            if any(k in text_lower for k in keywords):
-                return {"topic": topic, "confidence": 0.85}
-                
-        return {"topic": "general", "confidence": 0.5}
+        return self.matcher.match(text)
@@ -1,62 +1,277 @@
+import argparse
 import json
 import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 from app.llm.sentiment_model import SentimentModel
 from app.llm.topic_extractor import TopicExtractor
-from app.llm.summarizer import Summarizer
+from app.llm.summarizer import Summarizer, SummaryStats
+from app.utils.dedup import DEDUP_MODE, DEDUP_MODES, DedupStats, group_texts
+from app.utils.columnar import PARQUET_SUFFIX, ParquetRecordWriter, is_parquet, iter_kept_row_groups, iter_parquet_records
+from app.utils.sentiment_cache import SENTIMENT_CACHE_PATH, SentimentCache
+from app.utils.jsonl import JSONL_SUFFIXES, RecordWriter, is_jsonl, iter_records
+from app.utils.watermark import WatermarkStore
 
 RAW_DATA_PATH = "data/raw/engagements_sample.json"
 PROCESSED_DATA_PATH = "data/processed/analytics_results.json"
+CHUNK_SIZE = 1000
 
-def main():
-    print("Starting analysis pipeline...")
-    
-    # Load raw data
-    if not os.path.exists(RAW_DATA_PATH):
-        print(f"Error: Raw data not found at {RAW_DATA_PATH}")
+# Per-process model instances, sentiment cache and dedup mode, created once by _init_worker
+_worker_models = None
+
+def _init_worker(sentiment_cache_path=SENTIMENT_CACHE_PATH, dedup=DEDUP_MODE, sentiment_model=SentimentModel):
+    global _worker_models
+    cache = None
+    if _worker_models is not None:
+        # Single-process runs call this once per score_engagements call: keep the
+        # open cache connection for the same file, close it for another one
+        previous = _worker_models[2]
+        if previous is not None and previous.path == sentiment_cache_path:
+            cache = previous
+        elif previous is not None:
+            previous.close()
+    if cache is None and sentiment_cache_path:
+        cache = SentimentCache(sentiment_cache_path)
+    _worker_models = (sentiment_model(), TopicExtractor(), cache, dedup)
+
+def _score_chunk(chunk):
+    """Scores a chunk in place; returns it with (rows, groups, scoring seconds) for DedupStats."""
+    if _worker_models is None:
+        _init_worker()
+    sentiment_model, topic_extractor, cache, dedup = _worker_models
+
+    # Combine notes and feedback for analysis
+    texts = [f"{eng['notes']} {eng['feedback']}" for eng in chunk]
+
+    # Score one text per duplicate group and share its result with the group
+    codes, representatives = group_texts(texts, dedup)
+    started = time.perf_counter()
+    scored = sentiment_model.analyze_many([texts[i] for i in representatives], cache)
+    elapsed = time.perf_counter() - started
+
+    for eng, full_text, code in zip(chunk, texts, codes):
+        # Enrich record; topics stay per text since they key on the masked names
+        eng["sentiment"] = dict(scored[code])
+        eng["topic"] = topic_extractor.extract(full_text)
+    return chunk, (len(chunk), len(representatives), elapsed)
+
+def _chunks(records, size):
+    records = iter(records)
+    while True:
+        chunk = list(islice(records, size))
+        if not chunk:
+            return
+        yield chunk
+
+def score_engagements(engagements, workers=1, chunk_size=CHUNK_SIZE, sentiment_cache_path=SENTIMENT_CACHE_PATH,
+                      dedup=DEDUP_MODE, dedup_stats=None, sentiment_model=SentimentModel):
+    """
+    Scores engagements (any iterable) and yields them enriched, in input order.
+    With workers > 1, chunks are scored in a process pool where each worker
+    holds its own model instances. At most 2 * workers chunks are in flight,
+    so a lazily read input is never pulled into memory all at once.
+    Sentiment results are memoized in the SQLite cache at sentiment_cache_path
+    (None disables it), which all workers and later runs share.
+    Within a chunk, texts that share a dedup key (see app/utils/dedup.py) are
+    scored once; pass a DedupStats as dedup_stats to collect the savings.
+    sentiment_model is the class (or any picklable factory) each worker calls
+    to build its model; it is passed to the workers, so it works with any
+    start method.
+    """
+    def unpack(result):
+        chunk, counts = result
+        if dedup_stats is not None:
+            dedup_stats.add(*counts)
+        return chunk
+
+    if workers <= 1:
+        _init_worker(sentiment_cache_path, dedup, sentiment_model)
+        for chunk in _chunks(engagements, chunk_size):
+            yield from unpack(_score_chunk(chunk))
         return
 
-    with open(RAW_DATA_PATH, "r") as f:
-        engagements = json.load(f)
-        
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(sentiment_cache_path, dedup, sentiment_model)) as pool:
+        in_flight = deque()
+        for chunk in _chunks(engagements, chunk_size):
+            in_flight.append(pool.submit(_score_chunk, chunk))
+            if len(in_flight) >= 2 * workers:
+                yield from unpack(in_flight.popleft().result())
+        while in_flight:
+            yield from unpack(in_flight.popleft().result())
+
+def read_input(path):
+    return iter_parquet_records(path) if is_parquet(path) else iter_records(path)
+
+def output_base(path):
+    for suffix in JSONL_SUFFIXES + (".json", PARQUET_SUFFIX):
+        if path.endswith(suffix):
+            return path[:-len(suffix)]
+    return path
+
+def _scoring_options(args):
+    return {
+        "workers": args.workers,
+        "chunk_size": args.chunk_size,
+        "sentiment_cache_path": args.sentiment_cache,
+        "dedup": args.dedup,
+        "dedup_stats": args.dedup_stats
+    }
+
+def load_existing_results(path):
+    """Previously processed engagements keyed by id, in their saved order."""
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r") as f:
+        existing = json.load(f)
+    return {str(eng["id"]): eng for eng in existing.get("engagements", [])}
+
+def run_batch(args, watermark, summarizer):
+    """Loads everything, merges new scores into the existing JSON results and rewrites them."""
+    engagements = list(read_input(args.input))
     print(f"Loaded {len(engagements)} engagements.")
-    
-    # Initialize models
-    sentiment_model = SentimentModel()
-    topic_extractor = TopicExtractor()
-    summarizer = Summarizer()
-    
-    processed_data = []
-    
-    # Process each engagement
-    for eng in engagements:
-        # Combine notes and feedback for analysis
-        full_text = f"{eng['notes']} {eng['feedback']}"
-        
-        # Run analysis
-        sentiment = sentiment_model.analyze(full_text)
-        topic = topic_extractor.extract(full_text)
-        
-        # Enrich record
-        eng["sentiment"] = sentiment
-        eng["topic"] = topic
-        
-        processed_data.append(eng)
-        
+
+    results = {} if args.full else load_existing_results(args.output)
+    if args.full or not results:
+        watermark.reset()
+
+    pending = list(watermark.changed(engagements))
+    print(f"{len(pending)} new or changed engagements to process ({len(engagements) - len(pending)} unchanged).")
+
+    # Process each new or changed engagement
+    for eng in score_engagements(pending, **_scoring_options(args)):
+        # Merge: replaces the previous version of an edited engagement in place
+        results[str(eng["id"])] = eng
+        watermark.advance(eng)
+
+    processed_data = list(results.values())
+
     # Generate weekly summary
     summary = summarizer.generate_weekly_summary(processed_data)
-    
-    # Save results
-    os.makedirs(os.path.dirname(PROCESSED_DATA_PATH), exist_ok=True)
-    
+
     output = {
         "engagements": processed_data,
         "weekly_summary": summary
     }
-    
-    with open(PROCESSED_DATA_PATH, "w") as f:
+
+    with open(args.output, "w") as f:
         json.dump(output, f, indent=4)
-        
-    print(f"Analysis complete. Results saved to {PROCESSED_DATA_PATH}")
+    return summary
+
+def run_streaming(args, watermark, summarizer):
+    """
+    Parses, scores and writes one record at a time, so memory stays flat.
+    Incremental runs append new or changed records to the JSON Lines output
+    (readers keep the last line per id); --full rewrites it. As in the other
+    modes, the summary covers every engagement in the output (counted from the
+    watermark's on-disk index) and goes to a .summary.json sidecar.
+    """
+    append = not args.full and os.path.exists(args.output)
+    if not append:
+        watermark.reset()
+
+    seen = 0
+
+    def counted(records):
+        nonlocal seen
+        for record in records:
+            seen += 1
+            yield record
+
+    pending = watermark.changed(counted(read_input(args.input)))
+    with RecordWriter(args.output, append=append) as writer:
+        for eng in score_engagements(pending, **_scoring_options(args)):
+            writer.write(eng)
+            watermark.advance(eng)
+
+    print(f"Streamed {seen} engagements; {writer.count} new or changed written ({seen - writer.count} unchanged).")
+
+    stats = SummaryStats()
+    stats.add_counts(*watermark.index.counts())
+    summary = summarizer.summarize(stats)
+    with open(f"{output_base(args.output)}.summary.json", "w") as f:
+        json.dump({"weekly_summary": summary, "engagements": stats.num_engagements}, f, indent=4)
+    return summary
+
+def run_columnar(args, watermark, summarizer):
+    """
+    Streams scored records into a flat Parquet file (see app/utils/columnar.py).
+    Incremental runs write the new or changed records first, then copy the
+    previous file's row groups minus the re-scored ids, and swap the files.
+    The summary covers every row and goes to a .summary.json sidecar.
+    """
+    incremental = not args.full and os.path.exists(args.output)
+    if not incremental:
+        watermark.reset()
+
+    stats = SummaryStats()
+    rescored = set()
+    tmp_path = f"{args.output}.tmp"
+
+    pending = watermark.changed(read_input(args.input))
+    with ParquetRecordWriter(tmp_path) as writer:
+        for eng in score_engagements(pending, **_scoring_options(args)):
+            writer.write(eng)
+            watermark.advance(eng)
+            stats.add(eng)
+            rescored.add(str(eng["id"]))
+
+        if incremental:
+            for table in iter_kept_row_groups(args.output, rescored):
+                writer.write_table(table)
+                stats.add_columns(table["sentiment_type"].to_pylist(), table["topic"].to_pylist())
+    os.replace(tmp_path, args.output)
+
+    print(f"Wrote {writer.count} engagements ({len(rescored)} new or changed).")
+
+    summary = summarizer.summarize(stats)
+    with open(f"{output_base(args.output)}.summary.json", "w") as f:
+        json.dump({"weekly_summary": summary, "engagements": stats.num_engagements}, f, indent=4)
+    return summary
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score engagements and write analytics results.")
+    parser.add_argument("--input", default=RAW_DATA_PATH, help="Raw engagements (.json, .jsonl, .jsonl.gz, .jsonl.zst, .parquet)")
+    parser.add_argument("--output", default=PROCESSED_DATA_PATH, help="Results (.json, JSON Lines to stream, or .parquet for columnar)")
+    parser.add_argument("--full", action="store_true", help="Ignore the watermark and reprocess every engagement")
+    parser.add_argument("--workers", type=int, default=1, help="Scoring processes (default: 1)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="Engagements per work unit")
+    parser.add_argument("--sentiment-cache", default=SENTIMENT_CACHE_PATH, help="SQLite sentiment cache shared across runs ('' to disable)")
+    parser.add_argument("--dedup", choices=DEDUP_MODES, default=DEDUP_MODE,
+                        help="Score duplicate texts once: 'template' masks names and numbers, 'exact' matches whole texts")
+    args = parser.parse_args(argv)
+    args.dedup_stats = DedupStats()
+
+    print("Starting analysis pipeline...")
+
+    # Load raw data
+    if not os.path.exists(args.input):
+        print(f"Error: Raw data not found at {args.input}")
+        return
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    # Streaming modes keep per-record hashes on disk rather than in the JSON watermark
+    streaming = is_parquet(args.output) or is_jsonl(args.output)
+    watermark = WatermarkStore(
+        f"{output_base(args.output)}.watermark.json",
+        index_path=f"{output_base(args.output)}.watermark.sqlite" if streaming else None
+    )
+    summarizer = Summarizer()
+
+    if is_parquet(args.output):
+        summary = run_columnar(args, watermark, summarizer)
+    elif is_jsonl(args.output):
+        summary = run_streaming(args, watermark, summarizer)
+    else:
+        summary = run_batch(args, watermark, summarizer)
+    watermark.save()
+    watermark.close()
+
+    if args.dedup != "off":
+        print(args.dedup_stats.describe())
+    print(f"Analysis complete. Results saved to {args.output}")
+    print(f"Watermark: {watermark.last_date} / {watermark.last_id}")
     print("\n=== Weekly Summary ===\n")
     print(summary)
 
@@ -0,0 +1,5 @@
+# The Parquet reader and writer shared with the API (backend/shared/columnar.py)
+from backend.shared.columnar import (
+    FLAT_COLUMNS, PARQUET_SUFFIX, ROW_GROUP_SIZE, ParquetRecordWriter, flat_schema, flatten_record,
+    is_parquet, iter_kept_row_groups, iter_parquet_records, nest_record
+)
@@ -1,24 +1,32 @@
+import argparse
 import json
-import random
 import os
-from datetime import datetime, timedelta
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
+import numpy as np
+from backend.shared.vocabulary import CUSTOMERS, TECHNOLOGIES
+from app.utils.columnar import is_parquet
+from app.utils.jsonl import is_jsonl, open_text
+
+# Optional: Parquet output needs pyarrow; JSON/JSON Lines output works without it
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
 
 # Constants
 OUTPUT_DIR = "data/raw"
 OUTPUT_FILE = "engagements_sample.json"
 NUM_RECORDS = 500
-
-CUSTOMERS = [
-    "FinTech Corp", "HealthPlus", "RetailGiant", "AutoMotive Inc", "EduTech Solutions",
-    "Global Logistics", "MediaStream", "GreenEnergy", "CyberSecure", "DataDriven Co"
-]
-
-TECHNOLOGIES = [
-    "Delta Lake", "Auto Loader", "PySpark", "Unity Catalog", "Databricks SQL",
-    "MLflow", "Structured Streaming", "Photon", "Serverless", "Terraform"
-]
+DAYS_BACK = 90
+CHUNK_SIZE = 100000
+FORMATS = ("json", "jsonl", "parquet")
 
 STATUSES = ["completed", "in-progress", "at-risk", "planned"]
+STATUS_WEIGHTS = [0.5, 0.3, 0.1, 0.1]
 
 # Templates for notes and feedback to make them look realistic
 NOTES_TEMPLATES = [
@@ -47,43 +55,183 @@ FEEDBACK_TEMPLATES = [
     "Looking forward to expanding {tech} usage."
 ]
 
-def generate_record(index):
-    customer = random.choice(CUSTOMERS)
-    tech_stack = random.sample(TECHNOLOGIES, k=random.randint(1, 4))
-    main_tech = tech_stack[0]
-    
-    status = random.choices(STATUSES, weights=[0.5, 0.3, 0.1, 0.1])[0]
-    
-    # Generate date within the last 3 months
-    days_ago = random.randint(0, 90)
-    date_obj = datetime.now() - timedelta(days=days_ago)
-    date_str = date_obj.strftime("%Y-%m-%d")
-    
-    notes = random.choice(NOTES_TEMPLATES).format(tech=main_tech)
-    feedback = random.choice(FEEDBACK_TEMPLATES).format(tech=main_tech)
-    
+# Every template pre-rendered for every technology, so a chunk's texts are one
+# fancy-indexing lookup instead of a format() call per record
+_NOTES = np.array([[t.format(tech=tech) for tech in TECHNOLOGIES] for t in NOTES_TEMPLATES], dtype=object)
+_FEEDBACK = np.array([[t.format(tech=tech) for tech in TECHNOLOGIES] for t in FEEDBACK_TEMPLATES], dtype=object)
+_TECHNOLOGIES = np.array(TECHNOLOGIES, dtype=object)
+_STATUSES = np.array(STATUSES, dtype=object)
+
+def customer_name(index):
+    """The first len(CUSTOMERS) customers keep their names; later ones are numbered variants."""
+    base = CUSTOMERS[index % len(CUSTOMERS)]
+    return base if index < len(CUSTOMERS) else f"{base} {index // len(CUSTOMERS)}"
+
+def zipf_weights(n, skew):
+    """Probability of rank 1..n proportional to 1 / rank**skew; skew 0 is uniform."""
+    weights = 1.0 / np.arange(1, n + 1) ** skew
+    return weights / weights.sum()
+
+def generate_columns(start, count, spec):
+    """
+    Generates records start+1 .. start+count as columns with numpy.
+    Each chunk has its own generator seeded by (seed, start), so the output
+    depends on the seed and chunk size but not on the number of workers.
+    """
+    rng = np.random.default_rng([spec["seed"], start])
+
+    ids = np.char.add("ENG-", np.char.zfill(np.arange(start + 1, start + count + 1).astype(str), 3))
+
+    customer_codes = rng.choice(spec["customers"], size=count, p=zipf_weights(spec["customers"], spec["customer_skew"]))
+    unique_codes, inverse = np.unique(customer_codes, return_inverse=True)
+    customers = np.array([customer_name(i) for i in unique_codes.tolist()], dtype=object)[inverse]
+
+    # Weighted sampling without replacement (Gumbel top-k): each row's
+    # technologies are the first k entries of a weighted random order
+    tech_keys = np.log(zipf_weights(len(TECHNOLOGIES), spec["tech_skew"])) + rng.gumbel(size=(count, len(TECHNOLOGIES)))
+    tech_order = np.argsort(-tech_keys, axis=1)
+    tech_counts = rng.integers(1, 5, size=count)
+    main_tech = tech_order[:, 0]
+    tech_values = _TECHNOLOGIES[tech_order[np.arange(len(TECHNOLOGIES)) < tech_counts[:, None]]]
+
+    days = rng.integers(0, spec["days"] + 1, size=count)
+    dates = (np.datetime64(spec["start_date"], "D") + days).astype(str)
+
     return {
-        "id": f"ENG-{index:03d}",
-        "customer": customer,
-        "notes": notes,
-        "feedback": feedback,
-        "technologies": tech_stack,
-        "status": status,
-        "date": date_str
+        "id": ids,
+        "customer": customers,
+        "notes": _NOTES[rng.integers(0, len(NOTES_TEMPLATES), size=count), main_tech],
+        "feedback": _FEEDBACK[rng.integers(0, len(FEEDBACK_TEMPLATES), size=count), main_tech],
+        "technologies": (tech_values, np.concatenate([[0], np.cumsum(tech_counts)])),
+        "status": _STATUSES[rng.choice(len(STATUSES), size=count, p=STATUS_WEIGHTS)],
+        "date": dates
+    }
+
+def parquet_schema():
+    return pa.schema([
+        ("id", pa.string()), ("customer", pa.string()), ("notes", pa.string()), ("feedback", pa.string()),
+        ("technologies", pa.list_(pa.string())), ("status", pa.string()), ("date", pa.string())
+    ])
+
+def render_chunk(start, count, spec, fmt):
+    """A chunk ready to write: a pyarrow Table for Parquet, otherwise newline-separated JSON objects."""
+    columns = generate_columns(start, count, spec)
+    tech_values, offsets = columns.pop("technologies")
+    if fmt == "parquet":
+        arrays = {name: pa.array(values.tolist(), type=pa.string()) for name, values in columns.items()}
+        arrays["technologies"] = pa.ListArray.from_arrays(pa.array(offsets, type=pa.int32()), pa.array(tech_values.tolist(), type=pa.string()))
+        return pa.table(arrays).select(parquet_schema().names)
+
+    technologies = np.split(tech_values, offsets[1:-1])
+    lines = [
+        json.dumps({
+            "id": id_, "customer": customer, "notes": notes, "feedback": feedback,
+            "technologies": techs.tolist(), "status": status, "date": date_
+        })
+        for id_, customer, notes, feedback, techs, status, date_ in zip(
+            columns["id"].tolist(), columns["customer"], columns["notes"], columns["feedback"],
+            technologies, columns["status"], columns["date"].tolist()
+        )
+    ]
+    return "\n".join(lines)
+
+def _rendered_chunks(count, spec, fmt, workers, chunk_size):
+    """Rendered chunks in order; with workers > 1 at most 2 * workers are in flight."""
+    bounds = [(start, min(chunk_size, count - start)) for start in range(0, count, chunk_size)]
+    if workers <= 1:
+        for start, size in bounds:
+            yield render_chunk(start, size, spec, fmt)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        in_flight = deque()
+        for start, size in bounds:
+            in_flight.append(pool.submit(render_chunk, start, size, spec, fmt))
+            if len(in_flight) >= 2 * workers:
+                yield in_flight.popleft().result()
+        while in_flight:
+            yield in_flight.popleft().result()
+
+def output_format(path, fmt=None):
+    if fmt:
+        return fmt
+    if is_parquet(path):
+        return "parquet"
+    return "jsonl" if is_jsonl(path) else "json"
+
+def write_dataset(path, count, spec, fmt=None, workers=1, chunk_size=CHUNK_SIZE):
+    """
+    Streams count synthetic records to path chunk by chunk, so memory stays
+    bounded by a few chunks whatever the count. JSON is written as an array
+    with one record per line; JSON Lines may be .gz/.zst compressed.
+    """
+    fmt = output_format(path, fmt)
+    chunks = _rendered_chunks(count, spec, fmt, workers, chunk_size)
+
+    if fmt == "parquet":
+        if pa is None:
+            raise ImportError("pyarrow is required for Parquet output: pip install pyarrow")
+        # Opened up front with the fixed schema, so --count 0 still leaves a valid, empty file
+        with pq.ParquetWriter(path, parquet_schema(), compression="zstd") as writer:
+            for table in chunks:
+                writer.write_table(table)
+        return
+
+    with open_text(path, "w") as f:
+        if fmt == "json":
+            f.write("[\n")
+        written = False
+        for chunk in chunks:
+            if written:
+                f.write(",\n" if fmt == "json" else "\n")
+            f.write(chunk.replace("\n", ",\n") if fmt == "json" else chunk)
+            written = True
+        if fmt == "json":
+            f.write("\n]\n" if written else "]\n")
+        elif written:
+            f.write("\n")
+
+def _parse_date(value):
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate synthetic engagement records.")
+    parser.add_argument("--count", type=int, default=NUM_RECORDS, help="Records to generate")
+    parser.add_argument("--output", default=os.path.join(OUTPUT_DIR, OUTPUT_FILE), help="Output path (.json, .jsonl[.gz|.zst] or .parquet)")
+    parser.add_argument("--format", choices=FORMATS, help="Output format (default: from the extension)")
+    parser.add_argument("--seed", type=int, help="Seed for reproducible output (default: random, printed)")
+    parser.add_argument("--start-date", type=_parse_date, help=f"First engagement date, YYYY-MM-DD (default: {DAYS_BACK} days before --end-date)")
+    parser.add_argument("--end-date", type=_parse_date, default=date.today(), help="Last engagement date, YYYY-MM-DD (default: today)")
+    parser.add_argument("--customers", type=int, default=len(CUSTOMERS), help="Distinct customers")
+    parser.add_argument("--customer-skew", type=float, default=0.0, help="Zipf exponent for customer frequency (0 = uniform)")
+    parser.add_argument("--tech-skew", type=float, default=0.0, help="Zipf exponent for technology frequency (0 = uniform)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Generating processes")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="Records per chunk")
+    args = parser.parse_args(argv)
+
+    if args.count < 0:
+        parser.error("--count must not be negative")
+    start_date = args.start_date or args.end_date - timedelta(days=DAYS_BACK)
+    if start_date > args.end_date:
+        parser.error("--start-date must not be after --end-date")
+    seed = args.seed if args.seed is not None else int(np.random.SeedSequence().entropy % 2**32)
+    spec = {
+        "seed": seed,
+        "customers": args.customers,
+        "customer_skew": args.customer_skew,
+        "tech_skew": args.tech_skew,
+        "start_date": start_date.isoformat(),
+        "days": (args.end_date - start_date).days
     }
 
-def main():
-    print(f"Generating {NUM_RECORDS} synthetic engagement records...")
-    
-    os.makedirs(OUTPUT_DIR, exist_ok=True)
-    
-    records = [generate_record(i + 1) for i in range(NUM_RECORDS)]
-    
-    output_path = os.path.join(OUTPUT_DIR, OUTPUT_FILE)
-    with open(output_path, "w") as f:
-        json.dump(records, f, indent=4)
-        
-    print(f"Successfully saved records to {output_path}")
+    print(f"Generating {args.count} synthetic engagement records (seed {seed})...")
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+
+    started = time.perf_counter()
+    write_dataset(args.output, args.count, spec, fmt=args.format, workers=args.workers, chunk_size=args.chunk_size)
+    elapsed = time.perf_counter() - started
+
+    print(f"Successfully saved records to {args.output} ({args.count / max(elapsed, 1e-9):,.0f} records/s)")
 
 if __name__ == "__main__":
     main()
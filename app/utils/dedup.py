@@ -0,0 +1,58 @@
+from backend.shared.dedup import DEDUP_MODES, exact_key, template_key
+
+# The same template key as backend/app/dedup.py (both come from backend/shared),
+# computed per text since the pipeline scores plain lists of records rather
+# than DataFrames
+
+DEDUP_MODE = "template"
+
+def dedup_key(text, mode=DEDUP_MODE):
+    return template_key(text) if mode == "template" else exact_key(text)
+
+def group_texts(texts, mode=DEDUP_MODE):
+    """
+    Returns (codes, representatives): codes[i] is the group of texts[i] and
+    representatives[g] the index of the first text in group g.
+    """
+    if mode not in DEDUP_MODES:
+        raise ValueError(f"Unknown dedup mode '{mode}'. Expected one of {DEDUP_MODES}.")
+    if mode == "off":
+        return list(range(len(texts))), list(range(len(texts)))
+
+    groups = {}
+    codes = []
+    representatives = []
+    for i, text in enumerate(texts):
+        key = dedup_key(text, mode)
+        code = groups.get(key)
+        if code is None:
+            code = groups[key] = len(representatives)
+            representatives.append(i)
+        codes.append(code)
+    return codes, representatives
+
+class DedupStats:
+    """Rows vs. scored representatives across chunks, and the scoring time they saved."""
+    def __init__(self):
+        self.rows = 0
+        self.groups = 0
+        self.seconds = 0.0
+        self.seconds_saved = 0.0
+
+    def add(self, rows, groups, seconds):
+        self.rows += rows
+        self.groups += groups
+        self.seconds += seconds
+        # Per-text cost observed on the representatives, times the rows they stood in for
+        if groups:
+            self.seconds_saved += seconds / groups * (rows - groups)
+
+    @property
+    def ratio(self):
+        return 1 - self.groups / self.rows if self.rows else 0.0
+
+    def describe(self):
+        return (
+            f"Dedup: scored {self.groups} of {self.rows} texts ({self.ratio:.0%} duplicates), "
+            f"~{self.seconds_saved:.2f}s of sentiment scoring saved."
+        )
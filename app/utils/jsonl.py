@@ -0,0 +1,2 @@
+# The JSON Lines reader and writer shared with the API (backend/shared/jsonl.py)
+from backend.shared.jsonl import JSONL_SUFFIXES, RecordWriter, is_jsonl, iter_records, load_latest_by_id, open_text
@@ -0,0 +1,11 @@
+import os
+from backend.shared.paths import DEFAULT_SENTIMENT_CACHE_PATH
+from backend.shared.sentiment_cache import SentimentCache, make_key, normalize_text
+
+# The same cache class as backend/app/sentiment_cache.py (both come from
+# backend/shared), so the pipeline and the API can point at one file and reuse
+# each other's results
+
+# The API's default file (backend/.cache/sentiment.sqlite), not one relative to
+# the working directory; SENTIMENT_CACHE_PATH overrides it as it does for the API
+SENTIMENT_CACHE_PATH = os.getenv("SENTIMENT_CACHE_PATH", DEFAULT_SENTIMENT_CACHE_PATH)
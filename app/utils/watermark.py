@@ -0,0 +1,161 @@
+import hashlib
+import json
+import os
+import sqlite3
+from itertools import islice
+
+# Fields added by the pipeline; excluded from content hashes so that
+# re-reading enriched output does not look like a change
+DERIVED_FIELDS = ("sentiment", "topic")
+
+def record_hash(record):
+    """Stable content hash of an engagement's source fields."""
+    source = {k: v for k, v in record.items() if k not in DERIVED_FIELDS}
+    payload = json.dumps(source, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class ProcessedIndex:
+    """
+    Content hash, sentiment and topic per processed engagement id, in a SQLite
+    file. Streaming runs keep this on disk instead of a hash dict, so memory
+    stays flat however many engagements have been processed; the stored labels
+    let them summarize every processed engagement, not just this run's.
+    """
+    def __init__(self, path, batch_size=500):
+        self.path = path
+        self.batch_size = batch_size
+        self._pending = []
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS processed ("
+            "id TEXT PRIMARY KEY, hash TEXT NOT NULL, sentiment_type TEXT NOT NULL, topic TEXT NOT NULL)"
+        )
+
+    def hashes(self, ids):
+        """Stored hashes for the given ids (missing ids are left out)."""
+        self.flush()
+        found = {}
+        ids = list(ids)
+        for start in range(0, len(ids), self.batch_size):
+            chunk = ids[start:start + self.batch_size]
+            found.update(self._conn.execute(
+                f"SELECT id, hash FROM processed WHERE id IN ({','.join('?' * len(chunk))})", chunk
+            ).fetchall())
+        return found
+
+    def put(self, record):
+        self._pending.append((
+            str(record.get("id")),
+            record_hash(record),
+            record.get("sentiment", {}).get("sentiment_type", "neutral"),
+            record.get("topic", {}).get("topic", "general")
+        ))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self._pending:
+            self._conn.executemany("INSERT OR REPLACE INTO processed VALUES (?, ?, ?, ?)", self._pending)
+            self._pending = []
+
+    def counts(self):
+        """(sentiment_type counts, topic counts) over every processed engagement."""
+        self.flush()
+        return tuple(
+            dict(self._conn.execute(f"SELECT {column}, COUNT(*) FROM processed GROUP BY {column}").fetchall())
+            for column in ("sentiment_type", "topic")
+        )
+
+    def clear(self):
+        self._pending = []
+        self._conn.execute("DELETE FROM processed")
+
+    def commit(self):
+        self.flush()
+        self._conn.commit()
+
+    def close(self):
+        self._conn.close()
+
+class WatermarkStore:
+    """
+    Remembers what has already been processed.
+
+    Keeps the newest (date, id) seen as a high-water mark, for sources that can
+    filter on it, and a content hash per engagement id so edited records are
+    picked up even when their date is older than the mark. The hashes live in
+    the JSON file, or with index_path in a ProcessedIndex for streaming runs.
+    """
+    def __init__(self, path, index_path=None):
+        self.path = path
+        self.last_date = None
+        self.last_id = None
+        self.hashes = {}
+        self.index = ProcessedIndex(index_path) if index_path else None
+        self.load()
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r") as f:
+            state = json.load(f)
+        self.last_date = state.get("last_date")
+        self.last_id = state.get("last_id")
+        if self.index is None:
+            self.hashes = state.get("hashes", {})
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        state = {"last_date": self.last_date, "last_id": self.last_id}
+        if self.index is None:
+            state["hashes"] = self.hashes
+        else:
+            self.index.commit()
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.path)
+
+    def reset(self):
+        self.last_date = None
+        self.last_id = None
+        self.hashes = {}
+        if self.index is not None:
+            self.index.clear()
+
+    def is_changed(self, record):
+        return self.hashes.get(str(record.get("id"))) != record_hash(record)
+
+    def changed(self, records):
+        """Yields records that are new or whose content changed since they were processed."""
+        if self.index is None:
+            for record in records:
+                if self.is_changed(record):
+                    yield record
+            return
+
+        # One indexed lookup per batch instead of per record
+        records = iter(records)
+        while True:
+            batch = list(islice(records, self.index.batch_size))
+            if not batch:
+                return
+            stored = self.index.hashes(str(record.get("id")) for record in batch)
+            for record in batch:
+                if stored.get(str(record.get("id"))) != record_hash(record):
+                    yield record
+
+    def advance(self, record):
+        """Marks a record as processed and moves the high-water mark forward."""
+        if self.index is None:
+            self.hashes[str(record.get("id"))] = record_hash(record)
+        else:
+            self.index.put(record)
+        mark = (str(record.get("date", "")), str(record.get("id", "")))
+        if self.last_date is None or mark > (self.last_date, self.last_id or ""):
+            self.last_date, self.last_id = mark
+
+    def close(self):
+        if self.index is not None:
+            self.index.close()
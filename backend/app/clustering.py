@@ -0,0 +1,97 @@
+import logging
+from typing import Iterable, List, Optional
+import numpy as np
+from app.config import settings
+
+# sklearn is imported where it is used, so importing this module (and
+# app.inference) does not pay for it until clustering actually runs
+
+logger = logging.getLogger(__name__)
+
+CLUSTERING_METHODS = ("auto", "agglomerative", "minibatch_kmeans")
+
+class StreamingKMeans:
+    """
+    Mini-batch k-means fitted chunk by chunk with partial_fit.
+
+    Only one batch of embeddings is resident at a time, so a 1M x 384
+    matrix (or a memmap of it) clusters in memory bounded by batch_size.
+    Batches that arrive before there are n_clusters rows to initialize the
+    centers from are held back and fitted together once there are.
+    """
+    def __init__(self, n_clusters: int, batch_size: Optional[int] = None, random_state: int = 0):
+        self.n_clusters = n_clusters
+        self.batch_size = batch_size or settings.CLUSTERING_BATCH_SIZE
+        from sklearn.cluster import MiniBatchKMeans
+        self.model = MiniBatchKMeans(
+            n_clusters=n_clusters,
+            batch_size=self.batch_size,
+            random_state=random_state,
+            n_init=3
+        )
+        self._pending: List[np.ndarray] = []
+
+    def _batches(self, embeddings: np.ndarray):
+        for start in range(0, len(embeddings), self.batch_size):
+            yield np.asarray(embeddings[start:start + self.batch_size], dtype=np.float32)
+
+    @property
+    def is_fitted(self) -> bool:
+        return hasattr(self.model, "cluster_centers_")
+
+    def partial_fit(self, batch: np.ndarray) -> "StreamingKMeans":
+        if self.is_fitted:
+            self.model.partial_fit(batch)
+            return self
+        # partial_fit needs at least n_clusters samples on the first call
+        self._pending.append(np.asarray(batch, dtype=np.float32))
+        if sum(len(b) for b in self._pending) >= self.n_clusters:
+            first = np.concatenate(self._pending)
+            self._pending = []
+            self.model.partial_fit(first)
+        return self
+
+    def fit_chunks(self, chunks: Iterable[np.ndarray]) -> "StreamingKMeans":
+        for chunk in chunks:
+            for batch in self._batches(chunk):
+                self.partial_fit(batch)
+        return self
+
+    def predict(self, embeddings: np.ndarray) -> np.ndarray:
+        labels = [self.model.predict(batch) for batch in self._batches(embeddings)]
+        return np.concatenate(labels) if labels else np.zeros(0, dtype=int)
+
+    def fit_predict(self, embeddings: np.ndarray) -> np.ndarray:
+        return self.fit_chunks([embeddings]).predict(embeddings)
+
+def resolve_method(n_samples: int, method: Optional[str] = None) -> str:
+    method = method or settings.CLUSTERING_METHOD
+    if method not in CLUSTERING_METHODS:
+        raise ValueError(f"Unknown clustering method '{method}'. Expected one of {CLUSTERING_METHODS}.")
+    if method == "auto":
+        return "agglomerative" if n_samples <= settings.CLUSTERING_AUTO_THRESHOLD else "minibatch_kmeans"
+    return method
+
+def cluster_embeddings(embeddings: np.ndarray, n_clusters: int, method: Optional[str] = None) -> np.ndarray:
+    """
+    Returns one cluster label per embedding row.
+
+    'agglomerative' is exact but quadratic; CLUSTERING_KNN_NEIGHBORS > 0 restricts
+    merges to a sparse k-nearest-neighbour graph. 'minibatch_kmeans' streams the
+    rows in fixed-size batches. 'auto' switches at CLUSTERING_AUTO_THRESHOLD rows.
+    """
+    n_samples = len(embeddings)
+    method = resolve_method(n_samples, method)
+    logger.info(f"Clustering {n_samples} embeddings into {n_clusters} clusters with {method}.")
+
+    if method == "minibatch_kmeans":
+        return StreamingKMeans(n_clusters).fit_predict(embeddings)
+
+    from sklearn.cluster import AgglomerativeClustering
+    from sklearn.neighbors import kneighbors_graph
+
+    connectivity = None
+    n_neighbors = settings.CLUSTERING_KNN_NEIGHBORS
+    if n_neighbors > 0 and n_samples > n_neighbors:
+        connectivity = kneighbors_graph(embeddings, n_neighbors=n_neighbors, include_self=False)
+    return AgglomerativeClustering(n_clusters=n_clusters, connectivity=connectivity).fit(embeddings).labels_
@@ -0,0 +1,2 @@
+# The Parquet reader shared with the pipeline (backend/shared/columnar.py)
+from shared.columnar import PARQUET_SUFFIX, is_parquet, iter_records, nest_record, read_columns
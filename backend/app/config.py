@@ -1,17 +1,79 @@
 import os
 from dotenv import load_dotenv
+from shared.paths import DEFAULT_SENTIMENT_CACHE_PATH
 
 load_dotenv()
 
 class Config:
     DATABRICKS_HOST = os.getenv("DATABRICKS_HOST")
     DATABRICKS_TOKEN = os.getenv("DATABRICKS_TOKEN")
+    DATABRICKS_HTTP_PATH = os.getenv("DATABRICKS_HTTP_PATH")
+    # Rows per Arrow record batch when streaming from the SQL Warehouse
+    DATABRICKS_FETCH_BATCH_SIZE = int(os.getenv("DATABRICKS_FETCH_BATCH_SIZE", "100000"))
+    # SQL Warehouse connection pool (sessions are limited per warehouse)
+    DATABRICKS_POOL_SIZE = int(os.getenv("DATABRICKS_POOL_SIZE", "4"))
+    DATABRICKS_POOL_IDLE_TIMEOUT = float(os.getenv("DATABRICKS_POOL_IDLE_TIMEOUT", "300"))
+    DATABRICKS_POOL_HEALTH_CHECK_AFTER = float(os.getenv("DATABRICKS_POOL_HEALTH_CHECK_AFTER", "30"))
+    DATABRICKS_POOL_CHECKOUT_TIMEOUT = float(os.getenv("DATABRICKS_POOL_CHECKOUT_TIMEOUT", "30"))
     HUGGINGFACE_API_KEY = os.getenv("HUGGINGFACE_API_KEY")
+    # Hugging Face Inference API (MODEL_MODE=huggingface_api): batching, concurrency and retries
+    HF_API_URL = os.getenv("HF_API_URL", "https://router.huggingface.co/hf-inference/models")
+    HF_API_BATCH_SIZE = int(os.getenv("HF_API_BATCH_SIZE", "32"))
+    HF_API_MAX_CONCURRENCY = int(os.getenv("HF_API_MAX_CONCURRENCY", "8"))
+    HF_API_MAX_RETRIES = int(os.getenv("HF_API_MAX_RETRIES", "3"))
+    HF_API_BACKOFF = float(os.getenv("HF_API_BACKOFF", "0.5"))
+    HF_API_TIMEOUT = float(os.getenv("HF_API_TIMEOUT", "30"))
     # Modes: 'auto' (try local, fail to api), 'local', 'huggingface_api'
     MODEL_MODE = os.getenv("MODEL_MODE", "auto")
+    # When models load: 'eager' (before serving), 'background' (warm-up thread
+    # at startup) or 'lazy' (heavy imports and loads on first use)
+    MODEL_STARTUP = os.getenv("MODEL_STARTUP", "lazy")
+    # Runtime for the local sentiment/embedding models on CPU nodes:
+    # 'torch' (full precision), 'quantized' (dynamic int8) or 'onnx' (ONNX Runtime)
+    INFERENCE_BACKEND = os.getenv("INFERENCE_BACKEND", "torch")
+    # Number of texts scored per sentiment pipeline forward pass
+    SENTIMENT_BATCH_SIZE = int(os.getenv("SENTIMENT_BATCH_SIZE", "32"))
+    # Collapse duplicate texts before inference: 'template' (names/numbers masked), 'exact' or 'off'
+    DEDUP_MODE = os.getenv("DEDUP_MODE", "template")
+    # Engagements per window in stream_analyze_generator
+    STREAM_CHUNK_SIZE = int(os.getenv("STREAM_CHUNK_SIZE", "50"))
+    
+    # Local seq2seq generation: decoding limits, batch size and result cache
+    GENERATION_MAX_INPUT_TOKENS = int(os.getenv("GENERATION_MAX_INPUT_TOKENS", "512"))
+    GENERATION_MAX_NEW_TOKENS = int(os.getenv("GENERATION_MAX_NEW_TOKENS", "100"))
+    GENERATION_NUM_BEAMS = int(os.getenv("GENERATION_NUM_BEAMS", "1"))
+    GENERATION_BATCH_SIZE = int(os.getenv("GENERATION_BATCH_SIZE", "8"))
+    GENERATION_CACHE_MAX_ENTRIES = int(os.getenv("GENERATION_CACHE_MAX_ENTRIES", "256"))
+    # Seconds a cached generation stays valid; 0 keeps entries until evicted
+    GENERATION_CACHE_TTL = float(os.getenv("GENERATION_CACHE_TTL", "3600"))
+    
+    # Clustering: 'auto', 'agglomerative' or 'minibatch_kmeans'
+    CLUSTERING_METHOD = os.getenv("CLUSTERING_METHOD", "auto")
+    # 'auto' uses agglomerative up to this many rows, mini-batch k-means above it
+    CLUSTERING_AUTO_THRESHOLD = int(os.getenv("CLUSTERING_AUTO_THRESHOLD", "5000"))
+    CLUSTERING_BATCH_SIZE = int(os.getenv("CLUSTERING_BATCH_SIZE", "4096"))
+    # >0 restricts agglomerative merges to a k-nearest-neighbour graph
+    CLUSTERING_KNN_NEIGHBORS = int(os.getenv("CLUSTERING_KNN_NEIGHBORS", "0"))
+
+    # Execution layer: thread pool for I/O, process (or thread) pool for pandas/model work
+    IO_WORKERS = int(os.getenv("IO_WORKERS", "8"))
+    CPU_WORKERS = int(os.getenv("CPU_WORKERS", str(min(4, os.cpu_count() or 1))))
+    CPU_EXECUTOR = os.getenv("CPU_EXECUTOR", "process")
+    # Start method for the process pool; never fork, which would copy the
+    # uvicorn worker's threads and locks (e.g. a held model or pool lock)
+    CPU_START_METHOD = os.getenv("CPU_START_METHOD", "spawn")
     
     # Paths
     BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-    SAMPLE_DATA_PATH = os.path.join(BASE_DIR, "..", "sample_data", "engagements_sample.json")
+    # .json array or JSON Lines (.jsonl, .jsonl.gz, .jsonl.zst)
+    SAMPLE_DATA_PATH = os.getenv("SAMPLE_DATA_PATH", os.path.join(BASE_DIR, "..", "sample_data", "engagements_sample.json"))
+
+    # Embedding cache (memory-mapped vectors + LRU index)
+    EMBEDDING_CACHE_DIR = os.getenv("EMBEDDING_CACHE_DIR", os.path.join(BASE_DIR, "..", ".cache", "embeddings"))
+    EMBEDDING_CACHE_MAX_ENTRIES = int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "100000"))
+
+    # Sentiment results by model + normalized text hash: in-memory LRU over SQLite ("" = memory only)
+    SENTIMENT_CACHE_PATH = os.getenv("SENTIMENT_CACHE_PATH", DEFAULT_SENTIMENT_CACHE_PATH)
+    SENTIMENT_CACHE_MAX_MEMORY_ENTRIES = int(os.getenv("SENTIMENT_CACHE_MAX_MEMORY_ENTRIES", "50000"))
 
 settings = Config()
@@ -0,0 +1,100 @@
+import os
+import time
+import logging
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+def file_signature(path: str) -> Tuple[str, int, int]:
+    """Cheap change detector for a source file: (path, mtime_ns, size)."""
+    stat = os.stat(path)
+    return (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+
+class AggregateCache:
+    """
+    Holds one precomputed aggregate and the signature of the source it was built from.
+
+    `signature` must be cheap (a stat call, a Delta table version lookup); `build`
+    does the expensive work. The first request builds synchronously. After that a
+    changed signature triggers a single background rebuild while callers keep
+    getting the previous value, which is swapped in atomically once ready.
+
+    A failed background rebuild is remembered with the signature it was for:
+    the same signature is not retried until retry_interval seconds have passed,
+    so a broken source does not start a new failing rebuild on every request.
+    A new signature is tried right away.
+    """
+    def __init__(self, build: Callable[[], Any], signature: Callable[[], Hashable], retry_interval: float = 60.0):
+        self._build = build
+        self._signature = signature
+        self.retry_interval = retry_interval
+        self._lock = threading.Lock()
+        self._entry: Optional[Tuple[Any, Hashable, float]] = None
+        self._rebuilding = False
+        # (signature, failed_at) of the last failed background rebuild
+        self._failure: Optional[Tuple[Hashable, float]] = None
+        self.failures = 0
+        self.hits = 0
+        self.stale_hits = 0
+        self.builds = 0
+
+    def _rebuild(self, signature: Hashable) -> Tuple[Any, Hashable, float]:
+        value = self._build()
+        entry = (value, signature, time.time())
+        self._entry = entry
+        self.builds += 1
+        return entry
+
+    def _rebuild_in_background(self, signature: Hashable):
+        try:
+            self._rebuild(signature)
+            self._failure = None
+        except Exception as e:
+            logger.error(f"Background aggregate rebuild failed: {e}; retrying in {self.retry_interval:.0f}s or on the next change")
+            self._failure = (signature, time.time())
+            self.failures += 1
+        finally:
+            self._rebuilding = False
+
+    def _backing_off(self, signature: Hashable) -> bool:
+        failure = self._failure
+        return (
+            failure is not None
+            and failure[0] == signature
+            and time.time() - failure[1] < self.retry_interval
+        )
+
+    def get(self) -> Tuple[Any, Dict[str, Any]]:
+        """Returns (value, meta) where meta has status, age_seconds and hits."""
+        signature = self._signature()
+        entry = self._entry
+        status = "hit"
+
+        if entry is None:
+            with self._lock:
+                entry = self._entry
+                if entry is None:
+                    entry = self._rebuild(signature)
+                    status = "miss"
+        elif entry[1] != signature:
+            status = "stale"
+            with self._lock:
+                if not self._rebuilding and not self._backing_off(signature):
+                    self._rebuilding = True
+                    threading.Thread(target=self._rebuild_in_background, args=(signature,), daemon=True).start()
+
+        if status == "hit":
+            self.hits += 1
+        elif status == "stale":
+            self.stale_hits += 1
+
+        value, _, built_at = entry
+        return value, {
+            "status": status,
+            "age_seconds": time.time() - built_at,
+            "hits": self.hits
+        }
+
+    def invalidate(self):
+        self._entry = None
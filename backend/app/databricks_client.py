@@ -1,11 +1,18 @@
-import json
 import os
 import logging
-from typing import List, Dict
+import threading
+from datetime import date, timedelta
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import pandas as pd
 from app.config import settings
+from app.db_pool import ConnectionPool
+from app.jsonl import iter_records
 
 logger = logging.getLogger(__name__)
 
+ENGAGEMENTS_TABLE = "engagements"
+
 class DatabricksClient:
     """
     Client for Databricks workspace integration.
@@ -23,61 +30,150 @@ class DatabricksClient:
     def __init__(self):
         self.host = settings.DATABRICKS_HOST
         self.token = settings.DATABRICKS_TOKEN
+        self.http_path = settings.DATABRICKS_HTTP_PATH
+        self._pool: Optional[ConnectionPool] = None
+        self._pool_lock = threading.Lock()
+
+    def _connect(self):
+        from databricks import sql
+
+        logger.info(f"Connecting to Databricks SQL Warehouse at {self.host}...")
+        return sql.connect(server_hostname=self.host.replace("https://", ""),
+                           http_path=self.http_path,
+                           access_token=self.token)
+
+    def _get_pool(self) -> ConnectionPool:
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = ConnectionPool(
+                        connect=self._connect,
+                        size=settings.DATABRICKS_POOL_SIZE,
+                        idle_timeout=settings.DATABRICKS_POOL_IDLE_TIMEOUT,
+                        health_check_after=settings.DATABRICKS_POOL_HEALTH_CHECK_AFTER,
+                        checkout_timeout=settings.DATABRICKS_POOL_CHECKOUT_TIMEOUT
+                    )
+        return self._pool
+
+    def pool_stats(self) -> Dict[str, Any]:
+        return self._pool.stats() if self._pool else {"size": settings.DATABRICKS_POOL_SIZE, "checkouts": 0}
+
+    def close(self):
+        if self._pool:
+            self._pool.close()
+
+    def _engagements_query(self, since_days: Optional[int], after: Optional[Tuple[str, str]] = None) -> Tuple[str, Dict[str, Any]]:
+        """
+        SELECT over the engagements table with since_days pushed down as a date predicate.
+        `after` is a (date, id) watermark; only rows strictly past it are returned, in watermark order.
+        """
+        query = f"SELECT * FROM {ENGAGEMENTS_TABLE}"
+        predicates = []
+        params: Dict[str, Any] = {}
+        if since_days is not None:
+            predicates.append("date >= date_sub(current_date(), :since_days)")
+            params["since_days"] = int(since_days)
+        if after is not None:
+            predicates.append("(date > :wm_date OR (date = :wm_date AND id > :wm_id))")
+            params["wm_date"], params["wm_id"] = str(after[0]), str(after[1])
+        if predicates:
+            query += " WHERE " + " AND ".join(predicates)
+        if after is not None:
+            query += " ORDER BY date, id"
+        return query, params
+
+    def _iter_arrow_batches(self, query: str, params: Dict[str, Any], batch_size: int) -> Iterator[Any]:
+        """Yields pyarrow Tables straight from the cursor of a pooled connection."""
+        with self._get_pool().connection() as connection:
+            with connection.cursor() as cursor:
+                cursor.execute(query, params or None)
+                while True:
+                    batch = cursor.fetchmany_arrow(batch_size)
+                    if batch.num_rows == 0:
+                        break
+                    yield batch
+
+    def iter_engagement_batches(self, since_days: Optional[int] = 7, batch_size: Optional[int] = None,
+                                after: Optional[Tuple[str, str]] = None) -> Iterator[pd.DataFrame]:
+        """
+        Yields engagements as columnar DataFrames, one per Arrow record batch.
+        Rows never pass through per-row Python dicts. since_days=None fetches the full history.
+        Falls back to local sample data (with the same date and watermark filters)
+        only if credentials are missing or the query fails, e.g. because the table
+        does not exist. A window with no engagements yields nothing.
+        """
+        batch_size = batch_size or settings.DATABRICKS_FETCH_BATCH_SIZE
+        yielded = False
 
-    def fetch_recent_engagements(self, since_days: int = 7) -> List[Dict]:
+        if not self.host or not self.token:
+            logger.info("No Databricks credentials found. Using local sample data.")
+        elif not self.http_path:
+            logger.warning("DATABRICKS_HTTP_PATH not set. Cannot connect to SQL Warehouse. Using sample data.")
+        else:
+            query, params = self._engagements_query(since_days, after)
+            rows = 0
+            try:
+                for batch in self._iter_arrow_batches(query, params, batch_size):
+                    yielded = True
+                    rows += batch.num_rows
+                    yield batch.to_pandas()
+                # The query ran: an empty result is a quiet window (or nothing
+                # past the watermark), not a reason to serve sample data
+                logger.info(f"Successfully fetched {rows} engagements from Databricks.")
+                return
+            except ImportError:
+                logger.error("databricks-sql-connector not installed. Using sample data.")
+            except Exception as e:
+                if yielded:
+                    raise
+                logger.error(f"Failed to fetch from Databricks (is the {ENGAGEMENTS_TABLE} table missing?): {e}. Using sample data.")
+
+        records = self._iter_local_sample()
+        if since_days is not None:
+            # Same window as the SQL predicate: date >= current_date() - since_days
+            cutoff = (date.today() - timedelta(days=int(since_days))).isoformat()
+            records = (r for r in records if str(r.get("date", ""))[:10] >= cutoff)
+        if after is not None:
+            records = (r for r in records if (str(r.get("date")), str(r.get("id"))) > (str(after[0]), str(after[1])))
+        while True:
+            batch = list(islice(records, batch_size))
+            if not batch:
+                break
+            yield pd.DataFrame(batch)
+
+    def fetch_engagements_df(self, since_days: Optional[int] = 7) -> pd.DataFrame:
+        """Fetches engagements into a single columnar DataFrame."""
+        frames = list(self.iter_engagement_batches(since_days))
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, ignore_index=True)
+
+    def fetch_engagements_after(self, last_date: str, last_id: str) -> pd.DataFrame:
+        """Incremental fetch: only engagements past the (last_date, last_id) watermark."""
+        frames = list(self.iter_engagement_batches(since_days=None, after=(last_date, last_id)))
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, ignore_index=True)
+
+    def fetch_recent_engagements(self, since_days: Optional[int] = 7) -> List[Dict]:
         """
         Fetches recent engagements. 
         Tries to fetch from Databricks 'engagements' table.
         Falls back to local sample data if connection fails or table missing.
         """
-        if not self.host or not self.token:
-            logger.info("No Databricks credentials found. Using local sample data.")
-            return self._load_local_sample()
-            
-        try:
-            from databricks import sql
-            http_path = os.getenv("DATABRICKS_HTTP_PATH")
-            
-            if not http_path:
-                logger.warning("DATABRICKS_HTTP_PATH not set. Cannot connect to SQL Warehouse. Using sample data.")
-                return self._load_local_sample()
-
-            logger.info(f"Connecting to Databricks SQL Warehouse at {self.host}...")
-            with sql.connect(server_hostname=self.host.replace("https://", ""),
-                             http_path=http_path,
-                             access_token=self.token) as connection:
-                
-                with connection.cursor() as cursor:
-                    # Query columns matching our schema
-                    cursor.execute("SELECT * FROM engagements LIMIT 100")
-                    # Convert to dict
-                    columns = [desc[0] for desc in cursor.description]
-                    rows = cursor.fetchall()
-                    data = [dict(zip(columns, row)) for row in rows]
-                    
-                    if not data:
-                         logger.warning("Engagements table is empty or missing. Using sample data.")
-                         return self._load_local_sample()
-                         
-                    logger.info(f"Successfully fetched {len(data)} engagements from Databricks.")
-                    return data
-                    
-        except ImportError:
-            logger.error("databricks-sql-connector not installed. Using sample data.")
-            return self._load_local_sample()
-        except Exception as e:
-            logger.error(f"Failed to fetch from Databricks: {e}. Using sample data.")
-            return self._load_local_sample()
+        return self.fetch_engagements_df(since_days).to_dict('records')
 
-    def _load_local_sample(self) -> List[Dict]:
+    def _iter_local_sample(self) -> Iterator[Dict]:
         path = settings.SAMPLE_DATA_PATH
         if not os.path.exists(path):
             logger.error(f"Sample data not found at {path}")
-            return []
+            return iter([])
             
-        with open(path, 'r') as f:
-            data = json.load(f)
-        return data
+        # .json arrays or (optionally compressed) JSON Lines, the latter read lazily
+        return iter_records(path)
+
+    def _load_local_sample(self) -> List[Dict]:
+        return list(self._iter_local_sample())
 
     def commit_notebook_cell(self, notebook_path: str, markdown: str):
         if not self.host or not self.token:
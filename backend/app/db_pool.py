@@ -0,0 +1,183 @@
+import time
+import logging
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Deque, Dict, Iterator, Tuple
+
+logger = logging.getLogger(__name__)
+
+class PoolTimeout(Exception):
+    pass
+
+class PoolClosed(Exception):
+    pass
+
+class ConnectionPool:
+    """
+    Bounded pool of DB-API connections.
+
+    Connections are created lazily up to `size`. Every checkout and return
+    closes the connections that have sat idle for longer than `idle_timeout`,
+    so a quiet pool does not hold sessions the server may already have dropped.
+    On checkout, a connection idle for longer than `health_check_after` is probed
+    with `health_check_query` first; a failed probe counts as a stale session and
+    is transparently reconnected. A connection whose caller raised is discarded
+    rather than returned to the pool. After close(), connections still checked
+    out are closed when they come back, and new checkouts raise PoolClosed.
+    """
+    def __init__(self, connect: Callable[[], Any], size: int = 4, idle_timeout: float = 300.0,
+                 health_check_after: float = 30.0, checkout_timeout: float = 30.0,
+                 health_check_query: str = "SELECT 1"):
+        self._connect = connect
+        self.size = size
+        self.idle_timeout = idle_timeout
+        self.health_check_after = health_check_after
+        self.checkout_timeout = checkout_timeout
+        self.health_check_query = health_check_query
+
+        self._idle: Deque[Tuple[Any, float]] = deque()
+        self._open = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+        self.checkouts = 0
+        self.created = 0
+        self.reconnects = 0
+        self.discarded = 0
+        self.expired = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+
+    def _close(self, conn: Any):
+        try:
+            conn.close()
+        except Exception as e:
+            logger.debug(f"Error closing pooled connection: {e}")
+
+    def _take_expired(self) -> list:
+        """Removes idle connections past idle_timeout; call with _cond held and close them after."""
+        expired = []
+        cutoff = time.monotonic() - self.idle_timeout
+        # Returns append on the right, so the longest idle are on the left
+        while self._idle and self._idle[0][1] < cutoff:
+            expired.append(self._idle.popleft()[0])
+        self._open -= len(expired)
+        self.expired += len(expired)
+        return expired
+
+    def _is_healthy(self, conn: Any) -> bool:
+        try:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(self.health_check_query)
+                cursor.fetchall()
+            finally:
+                cursor.close()
+            return True
+        except Exception as e:
+            logger.info(f"Pooled connection failed health check: {e}")
+            return False
+
+    def _new_connection(self) -> Any:
+        try:
+            conn = self._connect()
+        except Exception:
+            with self._cond:
+                self._open -= 1
+                self._cond.notify()
+            raise
+        self.created += 1
+        return conn
+
+    def _checkout(self) -> Any:
+        start = time.monotonic()
+        deadline = start + self.checkout_timeout
+        expired = []
+        try:
+            with self._cond:
+                expired = self._take_expired()
+                while not self._closed and not self._idle and self._open >= self.size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0 or not self._cond.wait(remaining):
+                        if not self._closed and not self._idle and self._open >= self.size:
+                            raise PoolTimeout(f"No pooled connection available after {self.checkout_timeout}s")
+                if self._closed:
+                    raise PoolClosed("Connection pool is closed")
+                idle = self._idle.pop() if self._idle else None
+                if idle is None:
+                    self._open += 1
+                waited = time.monotonic() - start
+                self.checkouts += 1
+                self.wait_time_total += waited
+                self.wait_time_max = max(self.wait_time_max, waited)
+        finally:
+            for stale in expired:
+                self._close(stale)
+
+        if idle is None:
+            return self._new_connection()
+
+        # Expired connections were reaped above, so this one is recent enough to reuse
+        conn, last_used = idle
+        idle_for = time.monotonic() - last_used
+        if idle_for > self.health_check_after and not self._is_healthy(conn):
+            self._close(conn)
+            self.reconnects += 1
+            return self._new_connection()
+        return conn
+
+    def _release(self, conn: Any, broken: bool = False):
+        with self._cond:
+            expired = self._take_expired()
+            if broken or self._closed:
+                self._open -= 1
+                if broken:
+                    self.discarded += 1
+                expired.append(conn)
+            else:
+                self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+        for stale in expired:
+            self._close(stale)
+
+    @contextmanager
+    def connection(self) -> Iterator[Any]:
+        conn = self._checkout()
+        # Only a failed query leaves the session in doubt. GeneratorExit (a
+        # caller's generator closed early) and the like return it to the pool.
+        broken = False
+        try:
+            yield conn
+        except Exception:
+            broken = True
+            raise
+        finally:
+            self._release(conn, broken=broken)
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._open -= len(idle)
+            self._cond.notify_all()
+        for conn, _ in idle:
+            self._close(conn)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            in_use = self._open - len(self._idle)
+            idle = len(self._idle)
+        return {
+            "size": self.size,
+            "in_use": in_use,
+            "idle": idle,
+            "checkouts": self.checkouts,
+            "created": self.created,
+            "reconnects": self.reconnects,
+            "discarded": self.discarded,
+            "expired": self.expired,
+            "wait_ms_avg": round(1000 * self.wait_time_total / self.checkouts, 3) if self.checkouts else 0.0,
+            "wait_ms_max": round(1000 * self.wait_time_max, 3)
+        }
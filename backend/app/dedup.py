@@ -0,0 +1,53 @@
+from dataclasses import dataclass
+from typing import Dict
+import numpy as np
+import pandas as pd
+from shared.dedup import DEDUP_MODES, ENTITY_PATTERN, NUMBER_PATTERN, WHITESPACE_PATTERN, template_key
+
+@dataclass
+class DedupGroups:
+    """Row -> group mapping: codes[i] is row i's group, representatives[g] the row scored for group g."""
+    codes: np.ndarray
+    representatives: np.ndarray
+
+    @property
+    def rows(self) -> int:
+        return len(self.codes)
+
+    @property
+    def groups(self) -> int:
+        return len(self.representatives)
+
+    def fan_out(self, values) -> np.ndarray:
+        """Expands one value per group back to one value per row."""
+        return np.asarray(values)[self.codes]
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "rows": self.rows,
+            "groups": self.groups,
+            "dedup_ratio": round(1 - self.groups / self.rows, 4) if self.rows else 0.0
+        }
+
+def group_texts(texts: pd.Series, mode: str = "template") -> DedupGroups:
+    """
+    Groups a text column by normalized template with vectorized .str operations
+    and pd.factorize (a single hash pass). The first row of each group is its
+    representative. Keys match shared.dedup.template_key for every text.
+    """
+    if mode not in DEDUP_MODES:
+        raise ValueError(f"Unknown dedup mode '{mode}'. Expected one of {DEDUP_MODES}.")
+    if mode == "off":
+        n = len(texts)
+        return DedupGroups(codes=np.arange(n), representatives=np.arange(n))
+
+    keys = texts.fillna("").astype(str)
+    if mode == "template":
+        keys = keys.str.replace(ENTITY_PATTERN, "<e>", regex=True).str.replace(NUMBER_PATTERN, "<n>", regex=True).str.lower()
+    keys = keys.str.replace(WHITESPACE_PATTERN, " ", regex=True).str.strip()
+
+    codes, uniques = pd.factorize(keys, sort=False)
+    # factorize numbers groups in order of first appearance, so the first
+    # occurrence of each code is that group's representative
+    _, first_rows = np.unique(codes, return_index=True)
+    return DedupGroups(codes=codes, representatives=first_rows)
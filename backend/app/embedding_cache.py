@@ -0,0 +1,256 @@
+import os
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from typing import List, Dict, Any, Optional
+import numpy as np
+from app.config import settings
+from app.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+class EmbeddingCache:
+    """
+    On-disk, content-addressed cache for sentence embeddings.
+
+    Vectors live in a memory-mapped float32 matrix (<model>.f32) with a fixed
+    number of slots; <model>.index.sqlite maps text hashes to slots and their
+    last use. When every slot is taken the least recently used entry is
+    evicted and its slot reused, so the matrix never grows past
+    max_entries * dim * 4 bytes.
+
+    Both files are shared by every process using the same cache_dir. Slots are
+    looked up, copied out, allocated and written inside SQLite write
+    transactions, so one worker never reads a slot while another overwrites
+    it. hits, misses and evictions count this process's calls; entries is the
+    shared total.
+    """
+    def __init__(self, cache_dir: str, max_entries: int):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._model_name: Optional[str] = None
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_pid: Optional[int] = None
+        self._dim: Optional[int] = None
+        self._generation: Optional[int] = None
+        self._matrix: Optional[np.memmap] = None
+
+    @staticmethod
+    def make_key(model_name: str, text: str) -> str:
+        return hashlib.sha256(f"{model_name}\0{text}".encode("utf-8")).hexdigest()
+
+    def _paths(self, model_name: str):
+        slug = model_name.replace("/", "__")
+        base = os.path.join(self.cache_dir, slug)
+        return f"{base}.f32", f"{base}.index.sqlite"
+
+    def _db(self, model_name: str) -> sqlite3.Connection:
+        if self._conn is not None and self._model_name == model_name and self._conn_pid == os.getpid():
+            return self._conn
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        _, index_path = self._paths(model_name)
+        conn = sqlite3.connect(index_path, timeout=30, isolation_level=None, check_same_thread=False)
+        for attempt in range(50):
+            # Switching journal mode ignores the busy timeout, and workers
+            # starting together all try it on a fresh file
+            try:
+                conn.execute("PRAGMA journal_mode=WAL")
+                break
+            except sqlite3.OperationalError:
+                if attempt == 49:
+                    raise
+                time.sleep(0.1)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS slots ("
+            "key TEXT PRIMARY KEY, slot INTEGER NOT NULL UNIQUE, last_used REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS slots_last_used ON slots (last_used)")
+        self._conn, self._conn_pid, self._model_name = conn, os.getpid(), model_name
+        self._dim = self._generation = self._matrix = None
+        return conn
+
+    def _meta(self, conn: sqlite3.Connection) -> Dict[str, int]:
+        return dict(conn.execute("SELECT name, value FROM meta").fetchall())
+
+    def _attach(self, conn: sqlite3.Connection) -> Optional[int]:
+        """
+        Maps the matrix described by meta, remapping if another process has
+        rebuilt it. Returns the shared dim, or None when there is no usable
+        matrix yet. Call inside a write transaction.
+        """
+        meta = self._meta(conn)
+        if "dim" not in meta:
+            return None
+        if meta.get("max_entries") != self.max_entries:
+            logger.info(f"Embedding cache size changed for {self._model_name}. Rebuilding.")
+            return None
+
+        matrix_path, _ = self._paths(self._model_name)
+        if self._generation != meta["generation"] or self._matrix is None:
+            if not os.path.exists(matrix_path):
+                return None
+            self._matrix = np.memmap(matrix_path, dtype=np.float32, mode='r+', shape=(self.max_entries, meta["dim"]))
+            self._dim, self._generation = meta["dim"], meta["generation"]
+        return self._dim
+
+    def _create(self, conn: sqlite3.Connection, dim: int):
+        """Starts an empty matrix of the given dim. Call inside a write transaction."""
+        matrix_path, _ = self._paths(self._model_name)
+        generation = self._meta(conn).get("generation", 0) + 1
+        # Build beside the live file and swap it in, so processes still
+        # mapping the old matrix keep valid (if stale) pages until they remap
+        tmp_path = f"{matrix_path}.{os.getpid()}.tmp"
+        matrix = np.memmap(tmp_path, dtype=np.float32, mode='w+', shape=(self.max_entries, dim))
+        matrix.flush()
+        del matrix
+        os.replace(tmp_path, matrix_path)
+
+        conn.execute("DELETE FROM slots")
+        conn.executemany(
+            "INSERT OR REPLACE INTO meta (name, value) VALUES (?, ?)",
+            [("dim", dim), ("max_entries", self.max_entries), ("generation", generation)]
+        )
+        self._matrix = np.memmap(matrix_path, dtype=np.float32, mode='r+', shape=(self.max_entries, dim))
+        self._dim, self._generation = dim, generation
+
+    def _lookup(self, conn: sqlite3.Connection, keys: List[str]) -> Dict[str, int]:
+        found: Dict[str, int] = {}
+        unique = list(dict.fromkeys(keys))
+        # Stay well under SQLite's bound-parameter limit
+        for start in range(0, len(unique), 500):
+            chunk = unique[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            found.update(conn.execute(
+                f"SELECT key, slot FROM slots WHERE key IN ({placeholders})", chunk
+            ).fetchall())
+        return found
+
+    def _store(self, conn: sqlite3.Connection, fresh: Dict[str, np.ndarray]):
+        """Writes fresh vectors into free or evicted slots. Call inside a write transaction."""
+        now = time.time()
+        # Keys another worker stored while we were encoding keep their slots;
+        # touch them first so the evictions below cannot pick them
+        present = self._lookup(conn, list(fresh))
+        conn.executemany("UPDATE slots SET last_used = ? WHERE key = ?", [(now, key) for key in present])
+        used = conn.execute("SELECT COUNT(*) FROM slots").fetchone()[0]
+        for key, vector in fresh.items():
+            if key in present:
+                slot = present[key]
+            elif used < self.max_entries:
+                slot = used
+                used += 1
+                conn.execute("INSERT INTO slots (key, slot, last_used) VALUES (?, ?, ?)", (key, slot, now))
+            else:
+                old_key, slot = conn.execute(
+                    "SELECT key, slot FROM slots ORDER BY last_used LIMIT 1"
+                ).fetchone()
+                conn.execute("DELETE FROM slots WHERE key = ?", (old_key,))
+                conn.execute("INSERT INTO slots (key, slot, last_used) VALUES (?, ?, ?)", (key, slot, now))
+                self.evictions += 1
+            self._matrix[slot] = vector
+        self._matrix.flush()
+
+    def encode(self, model, model_name: str, texts: List[str]) -> np.ndarray:
+        """
+        Returns embeddings for texts, only calling model.encode for texts
+        that are not cached yet. Rows keep the order of texts.
+        """
+        if not texts:
+            return np.zeros((0, self._dim or 0), dtype=np.float32)
+
+        keys = [self.make_key(model_name, t) for t in texts]
+        result: Optional[np.ndarray] = None
+
+        with self._lock:
+            conn = self._db(model_name)
+
+            # Copy hits out under the write lock: no other process can evict
+            # and overwrite their slots until the transaction ends
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                dim = self._attach(conn)
+                slots = self._lookup(conn, keys) if dim else {}
+                if slots:
+                    result = np.empty((len(texts), dim), dtype=np.float32)
+                    for i, key in enumerate(keys):
+                        if key in slots:
+                            result[i] = self._matrix[slots[key]]
+                    conn.executemany(
+                        "UPDATE slots SET last_used = ? WHERE key = ?",
+                        [(time.time(), key) for key in slots]
+                    )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+            missing: Dict[str, str] = {}
+            for key, text in zip(keys, texts):
+                if key not in slots:
+                    missing.setdefault(key, text)
+            hit_count = sum(1 for key in keys if key in slots)
+            self.hits += hit_count
+
+            if not missing:
+                return result
+
+            # Encode outside the SQLite lock so other workers keep going
+            vectors = np.asarray(model.encode(list(missing.values())), dtype=np.float32)
+            metrics.inc("model_calls_total", model="embedding")
+            metrics.inc("model_inputs_total", len(missing), model="embedding")
+
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                dim = self._attach(conn)
+                if dim != vectors.shape[1]:
+                    if dim is not None:
+                        # Same model name, different output size: cached rows are stale
+                        logger.info(f"Embedding size changed for {model_name}. Rebuilding.")
+                    self._create(conn, vectors.shape[1])
+                    if slots:
+                        # Hits copied above came from the stale matrix
+                        self.hits -= hit_count
+                        missing = dict(zip(keys, texts))
+                        vectors = np.asarray(model.encode(list(missing.values())), dtype=np.float32)
+                        result = None
+                fresh = dict(zip(missing.keys(), vectors))
+                self._store(conn, fresh)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+            if result is None:
+                result = np.empty((len(texts), vectors.shape[1]), dtype=np.float32)
+            for i, key in enumerate(keys):
+                if key in fresh:
+                    result[i] = fresh[key]
+                    self.misses += 1
+            return result
+
+    def stats(self) -> Dict[str, Any]:
+        entries = 0
+        with self._lock:
+            if self._conn is not None and self._conn_pid == os.getpid():
+                entries = self._conn.execute("SELECT COUNT(*) FROM slots").fetchone()[0]
+        total = self.hits + self.misses
+        return {
+            "model": self._model_name,
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0
+        }
+
+embedding_cache = EmbeddingCache(settings.EMBEDDING_CACHE_DIR, settings.EMBEDDING_CACHE_MAX_ENTRIES)
@@ -0,0 +1,270 @@
+import base64
+import bisect
+import hashlib
+import json
+import logging
+import threading
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Fields with an equality index; date has a range index (the sort key itself)
+INDEXED_FIELDS = ("customer", "status", "topic")
+
+# Above this share of changed records a full re-sort beats per-record updates
+REBUILD_RATIO = 0.25
+
+SortKey = Tuple[str, str]
+
+class InvalidCursor(ValueError):
+    pass
+
+def encode_cursor(key: SortKey) -> str:
+    return base64.urlsafe_b64encode(json.dumps(list(key)).encode("utf-8")).decode("ascii")
+
+def decode_cursor(cursor: str) -> SortKey:
+    try:
+        date, record_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return (str(date), str(record_id))
+    except Exception:
+        raise InvalidCursor(f"Invalid cursor: {cursor!r}")
+
+def _content_hash(record: Dict) -> str:
+    payload = json.dumps(record, sort_keys=True, default=str)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+def _field_value(record: Dict, field: str) -> Optional[str]:
+    value = record.get(field)
+    if isinstance(value, dict):
+        # Pipeline output nests the label, e.g. {"topic": "streaming", "confidence": 0.9}
+        value = value.get(field)
+    return None if value is None else str(value).lower()
+
+class EngagementIndex:
+    """
+    In-memory secondary indexes over engagements for keyset pagination.
+
+    Every record has a sort key (date, id). The primary index is the sorted
+    list of all keys; each of customer/status/topic maps a value to the sorted
+    keys of its records. A page is located with a bisect on the cursor (or
+    date bound) and read forward, so it costs O(log N + page_size) for a
+    single filter. With several filters the smallest matching list is walked
+    and the others are checked per record: a page costs up to the length of
+    that list within the date range, which approaches O(N) when each filter
+    alone matches most records but their combination matches few. Narrow such
+    queries with a date range.
+
+    sync() diffs a fresh load against the stored content hashes and only
+    moves the records that were added, changed or removed. It also keeps the
+    ids in load order, which slice() serves to page-number clients.
+    """
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._records: Dict[str, Dict] = {}
+        self._keys: Dict[str, SortKey] = {}
+        self._hashes: Dict[str, str] = {}
+        self._order: List[SortKey] = []
+        self._file_order: List[str] = []
+        self._by_field: Dict[str, Dict[str, List[SortKey]]] = {field: {} for field in INDEXED_FIELDS}
+        self.builds = 0
+        self.last_sync: Dict[str, int] = {"added": 0, "updated": 0, "removed": 0}
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    @staticmethod
+    def _key(record: Dict) -> SortKey:
+        return (str(record.get("date", "")), str(record.get("id")))
+
+    def _insert(self, record_id: str, record: Dict):
+        key = self._key(record)
+        self._records[record_id] = record
+        self._keys[record_id] = key
+        bisect.insort(self._order, key)
+        for field in INDEXED_FIELDS:
+            value = _field_value(record, field)
+            if value is not None:
+                bisect.insort(self._by_field[field].setdefault(value, []), key)
+
+    def _remove(self, record_id: str):
+        record = self._records.pop(record_id)
+        key = self._keys.pop(record_id)
+        self._hashes.pop(record_id, None)
+        _discard(self._order, key)
+        for field in INDEXED_FIELDS:
+            value = _field_value(record, field)
+            keys = self._by_field[field].get(value)
+            if keys is not None:
+                _discard(keys, key)
+                if not keys:
+                    del self._by_field[field][value]
+
+    def _rebuild(self, records: Dict[str, Dict], hashes: Dict[str, str]):
+        self._records = records
+        self._hashes = hashes
+        self._keys = {record_id: self._key(record) for record_id, record in records.items()}
+        self._order = sorted(self._keys.values())
+        by_field: Dict[str, Dict[str, List[SortKey]]] = {field: {} for field in INDEXED_FIELDS}
+        for record_id, record in records.items():
+            for field in INDEXED_FIELDS:
+                value = _field_value(record, field)
+                if value is not None:
+                    by_field[field].setdefault(value, []).append(self._keys[record_id])
+        for values in by_field.values():
+            for keys in values.values():
+                keys.sort()
+        self._by_field = by_field
+        self.builds += 1
+
+    def sync(self, records: Iterable[Dict]) -> Dict[str, int]:
+        """Brings the index in line with `records`; returns added/updated/removed counts."""
+        fresh: Dict[str, Dict] = {}
+        hashes: Dict[str, str] = {}
+        for record in records:
+            record_id = str(record.get("id"))
+            fresh[record_id] = record
+            hashes[record_id] = _content_hash(record)
+
+        with self._lock:
+            added = [i for i in fresh if i not in self._hashes]
+            updated = [i for i in fresh if i in self._hashes and self._hashes[i] != hashes[i]]
+            removed = [i for i in self._hashes if i not in fresh]
+            changes = len(added) + len(updated) + len(removed)
+
+            if not self._order or changes > REBUILD_RATIO * max(len(fresh), 1):
+                self._rebuild(fresh, hashes)
+            else:
+                for record_id in removed + updated:
+                    self._remove(record_id)
+                for record_id in updated + added:
+                    self._insert(record_id, fresh[record_id])
+                    self._hashes[record_id] = hashes[record_id]
+
+            self._file_order = list(fresh)
+            self.last_sync = {"added": len(added), "updated": len(updated), "removed": len(removed)}
+            logger.info(f"Engagement index synced: {self.last_sync}")
+            return self.last_sync
+
+    def page(
+        self,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        filters: Optional[Dict[str, Optional[str]]] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        descending: bool = True,
+        offset: int = 0
+    ) -> Tuple[List[Dict], Optional[str]]:
+        """
+        Returns (records, next_cursor). next_cursor is None on the last page.
+        `offset` skips matching records first; it exists for page-number clients
+        and costs O(offset) where a cursor costs nothing.
+        """
+        filters = {f: str(v).lower() for f, v in (filters or {}).items() if v is not None}
+        unknown = set(filters) - set(INDEXED_FIELDS)
+        if unknown:
+            raise ValueError(f"Cannot filter on {sorted(unknown)}; indexed fields are {list(INDEXED_FIELDS)}")
+
+        with self._lock:
+            if filters:
+                candidates = [self._by_field[f].get(v, []) for f, v in filters.items()]
+                keys = min(candidates, key=len)
+            else:
+                keys = self._order
+
+            # Keys sort by (date, id); a bare date bounds the range on either side.
+            # date_to is inclusive of the whole day, including datetime strings
+            # such as "2024-01-31T10:00" that sort after the bare date.
+            lo = bisect.bisect_left(keys, (date_from,)) if date_from else 0
+            hi = bisect.bisect_left(keys, (date_to + "\uffff",)) if date_to else len(keys)
+            if cursor:
+                after = decode_cursor(cursor)
+                if descending:
+                    hi = min(hi, bisect.bisect_left(keys, after))
+                else:
+                    lo = max(lo, bisect.bisect_right(keys, after))
+
+            positions = range(hi - 1, lo - 1, -1) if descending else range(lo, hi)
+            page: List[Dict] = []
+            last_key: Optional[SortKey] = None
+            has_more = False
+            for pos in positions:
+                key = keys[pos]
+                record = self._records[key[1]]
+                if any(_field_value(record, f) != v for f, v in filters.items()):
+                    continue
+                if offset:
+                    offset -= 1
+                    continue
+                if len(page) == limit:
+                    has_more = True
+                    break
+                page.append(record)
+                last_key = key
+
+        next_cursor = encode_cursor(last_key) if has_more and last_key else None
+        return page, next_cursor
+
+    def slice(
+        self,
+        offset: int = 0,
+        limit: int = 20,
+        filters: Optional[Dict[str, Optional[str]]] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None
+    ) -> Tuple[List[Dict], Optional[str]]:
+        """
+        Matching records in load order, skipping `offset` of them, as
+        (records, None). This is the order page-number clients always got;
+        it walks the records from the start, so it costs O(offset + limit)
+        unfiltered and up to O(N) with filters.
+        """
+        filters = {f: str(v).lower() for f, v in (filters or {}).items() if v is not None}
+        upper = date_to + "\uffff" if date_to else None
+        page: List[Dict] = []
+        with self._lock:
+            for record_id in self._file_order:
+                record = self._records[record_id]
+                if filters and any(_field_value(record, f) != v for f, v in filters.items()):
+                    continue
+                if date_from or upper:
+                    date = self._keys[record_id][0]
+                    if (date_from and date < date_from) or (upper and date >= upper):
+                        continue
+                if offset:
+                    offset -= 1
+                    continue
+                page.append(record)
+                if len(page) == limit:
+                    break
+        return page, None
+
+def _discard(keys: List[SortKey], key: SortKey):
+    pos = bisect.bisect_left(keys, key)
+    if pos < len(keys) and keys[pos] == key:
+        del keys[pos]
+
+class IndexedSource:
+    """
+    Keeps an EngagementIndex in step with a data source.
+
+    Before each query the cheap `signature` is compared with the one the index
+    was last synced at; on a change `load` is re-read and the index synced
+    incrementally. Concurrent callers wait for one sync rather than each
+    running their own.
+    """
+    def __init__(self, load: Callable[[], Iterable[Dict]], signature: Callable[[], Hashable]):
+        self._load = load
+        self._signature = signature
+        self._synced_at: Any = None
+        self._sync_lock = threading.Lock()
+        self.index = EngagementIndex()
+
+    def current(self) -> EngagementIndex:
+        signature = self._signature()
+        if signature != self._synced_at:
+            with self._sync_lock:
+                if signature != self._synced_at:
+                    self.index.sync(self._load())
+                    self._synced_at = signature
+        return self.index
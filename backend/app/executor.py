@@ -0,0 +1,78 @@
+import asyncio
+import functools
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
+from typing import Any, Callable, Optional
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+class ExecutionLayer:
+    """
+    Keeps blocking work off the event loop.
+
+    run_io sends file/network calls to a bounded thread pool. run_cpu sends
+    pandas/model work to a process pool (CPU_EXECUTOR=process) so it does not
+    hold the GIL of the uvicorn worker; functions and arguments must therefore
+    be picklable, i.e. module-level. Pools are created on first use.
+
+    Process workers are started with spawn (or forkserver), not fork, so they
+    never inherit a lock held by another thread of the server. They import
+    modules fresh: anything a submitted function depends on, such as a data
+    path, has to be passed as an argument rather than patched onto a module.
+    """
+    def __init__(self, io_workers: int, cpu_workers: int, cpu_executor: str = "process", start_method: str = "spawn"):
+        if start_method not in ("spawn", "forkserver"):
+            raise ValueError(f"Unsupported start method '{start_method}'. Expected 'spawn' or 'forkserver'.")
+        self.io_workers = io_workers
+        self.cpu_workers = cpu_workers
+        self.cpu_executor = cpu_executor
+        self.start_method = start_method
+        self._io_pool: Optional[ThreadPoolExecutor] = None
+        self._cpu_pool: Optional[Executor] = None
+        self._lock = threading.Lock()
+
+    def _get_io_pool(self) -> ThreadPoolExecutor:
+        if self._io_pool is None:
+            with self._lock:
+                if self._io_pool is None:
+                    self._io_pool = ThreadPoolExecutor(max_workers=self.io_workers, thread_name_prefix="io")
+        return self._io_pool
+
+    def _get_cpu_pool(self) -> Executor:
+        if self._cpu_pool is None:
+            with self._lock:
+                if self._cpu_pool is None:
+                    if self.cpu_executor == "process":
+                        self._cpu_pool = ProcessPoolExecutor(
+                            max_workers=self.cpu_workers,
+                            mp_context=multiprocessing.get_context(self.start_method)
+                        )
+                    else:
+                        self._cpu_pool = ThreadPoolExecutor(max_workers=self.cpu_workers, thread_name_prefix="cpu")
+                    logger.info(f"Started {self.cpu_executor} pool with {self.cpu_workers} workers.")
+        return self._cpu_pool
+
+    async def run_io(self, fn: Callable, *args, **kwargs) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_io_pool(), functools.partial(fn, *args, **kwargs))
+
+    async def run_cpu(self, fn: Callable, *args, **kwargs) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_cpu_pool(), functools.partial(fn, *args, **kwargs))
+
+    def call_cpu(self, fn: Callable, *args, **kwargs) -> Any:
+        """Blocking variant of run_cpu for code already running in an I/O thread."""
+        return self._get_cpu_pool().submit(fn, *args, **kwargs).result()
+
+    def shutdown(self):
+        with self._lock:
+            for pool in (self._io_pool, self._cpu_pool):
+                if pool is not None:
+                    pool.shutdown(wait=False, cancel_futures=True)
+            self._io_pool = None
+            self._cpu_pool = None
+
+executor = ExecutionLayer(settings.IO_WORKERS, settings.CPU_WORKERS, settings.CPU_EXECUTOR, settings.CPU_START_METHOD)
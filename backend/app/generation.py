@@ -0,0 +1,142 @@
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+from app.config import settings
+from app.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+class GenerationCache:
+    """
+    LRU cache of generated texts with a time-to-live.
+
+    Keys are prompt hashes that also cover the model and decoding limits, so
+    changing either never serves an answer produced under other settings.
+    """
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+
+    @staticmethod
+    def make_key(model_name: str, decoding: Dict[str, Any], prompt: str) -> str:
+        limits = ",".join(f"{k}={decoding[k]}" for k in sorted(decoding))
+        return hashlib.sha256(f"{model_name}\0{limits}\0{prompt}".encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            text, stored_at = entry
+            if self.ttl_seconds > 0 and time.time() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                self.expired += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return text
+
+    def put(self, key: str, text: str):
+        with self._lock:
+            self._entries[key] = (text, time.time())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+def decoding_limits() -> Dict[str, Any]:
+    """Decoding settings from Config. Greedy/beam only, so results are deterministic and cacheable."""
+    return {
+        "max_input_tokens": settings.GENERATION_MAX_INPUT_TOKENS,
+        "max_new_tokens": settings.GENERATION_MAX_NEW_TOKENS,
+        "num_beams": settings.GENERATION_NUM_BEAMS
+    }
+
+class GenerationService:
+    """
+    Runs a local seq2seq model over prompts in padded batches of
+    GENERATION_BATCH_SIZE, answering repeated prompts from the cache.
+    Duplicate prompts within one call are generated once.
+    """
+    def __init__(self, tokenizer, model, model_name: str, cache: GenerationCache, batch_size: Optional[int] = None):
+        self.tokenizer = tokenizer
+        self.model = model
+        self.model_name = model_name
+        self.cache = cache
+        self.batch_size = max(1, batch_size or settings.GENERATION_BATCH_SIZE)
+
+    def _run(self, prompts: List[str], decoding: Dict[str, Any]) -> List[str]:
+        inputs = self.tokenizer(
+            prompts,
+            return_tensors="pt",
+            padding=True,
+            truncation=True,
+            max_length=decoding["max_input_tokens"]
+        )
+        outputs = self.model.generate(
+            **inputs,
+            max_new_tokens=decoding["max_new_tokens"],
+            num_beams=decoding["num_beams"],
+            do_sample=False
+        )
+        return self.tokenizer.batch_decode(outputs, skip_special_tokens=True)
+
+    def generate_batch(self, prompts: List[str]) -> List[str]:
+        decoding = decoding_limits()
+        keys = [GenerationCache.make_key(self.model_name, decoding, p) for p in prompts]
+
+        results: Dict[str, str] = {}
+        pending: "OrderedDict[str, str]" = OrderedDict()
+        for key, prompt in zip(keys, prompts):
+            if key in results or key in pending:
+                continue
+            cached = self.cache.get(key)
+            if cached is not None:
+                results[key] = cached
+            else:
+                pending[key] = prompt
+
+        pending_items = list(pending.items())
+        for start in range(0, len(pending_items), self.batch_size):
+            batch = pending_items[start:start + self.batch_size]
+            started = time.perf_counter()
+            texts = self._run([prompt for _, prompt in batch], decoding)
+            metrics.inc("model_calls_total", model="generation")
+            metrics.inc("model_inputs_total", len(batch), model="generation")
+            logger.info(f"Generated {len(batch)} prompts in {time.perf_counter() - started:.2f}s")
+            for (key, _), text in zip(batch, texts):
+                self.cache.put(key, text)
+                results[key] = text
+
+        return [results[key] for key in keys]
+
+    def generate(self, prompt: str) -> str:
+        return self.generate_batch([prompt])[0]
+
+generation_cache = GenerationCache(
+    max_entries=settings.GENERATION_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.GENERATION_CACHE_TTL
+)
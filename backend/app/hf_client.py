@@ -0,0 +1,219 @@
+import time
+import random
+import asyncio
+import logging
+import threading
+from collections import deque
+from typing import Any, Dict, List, Optional
+import numpy as np
+import httpx
+from app.config import settings
+from app.generation import GenerationCache, GenerationService
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+class HFAPIError(RuntimeError):
+    pass
+
+class HFInferenceClient:
+    """
+    Hugging Face Inference API client for sentiment, embeddings and generation.
+
+    Inputs are split into batches of `batch_size` and sent concurrently over one
+    pooled httpx.AsyncClient, with at most `max_concurrency` requests in flight.
+    Throttling (429), model loading (503) and transport errors are retried with
+    exponential backoff, honouring Retry-After. Latency is recorded per call.
+
+    The client owns a background event loop, so the synchronous engine code can
+    call sentiment()/embed()/generate() from any thread while connections are
+    reused across calls. Coroutine versions (asentiment etc.) run on that loop.
+    """
+    def __init__(
+        self,
+        api_key: Optional[str],
+        base_url: Optional[str] = None,
+        max_concurrency: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        max_retries: Optional[int] = None,
+        backoff: Optional[float] = None,
+        timeout: Optional[float] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        self.api_key = api_key
+        self.base_url = (base_url or settings.HF_API_URL).rstrip("/")
+        self.max_concurrency = max_concurrency or settings.HF_API_MAX_CONCURRENCY
+        self.batch_size = max(1, batch_size or settings.HF_API_BATCH_SIZE)
+        self.max_retries = settings.HF_API_MAX_RETRIES if max_retries is None else max_retries
+        self.backoff = settings.HF_API_BACKOFF if backoff is None else backoff
+        self.timeout = timeout or settings.HF_API_TIMEOUT
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, Dict[str, Any]] = {}
+
+    # Event loop and connection pool
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._loop.run_forever, name="hf-api", daemon=True)
+                self._thread.start()
+        return self._loop
+
+    def _submit(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop()).result()
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            headers = {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+            self._client = httpx.AsyncClient(
+                headers=headers,
+                timeout=self.timeout,
+                transport=self._transport,
+                limits=httpx.Limits(max_connections=self.max_concurrency, max_keepalive_connections=self.max_concurrency)
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._client
+
+    def close(self):
+        if self._loop is None:
+            return
+        if self._client is not None:
+            self._submit(self._client.aclose())
+            self._client = None
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+        self._loop.close()
+        self._loop = None
+
+    # Metrics
+
+    def _record(self, task: str, started: float, items: int, retries: int, failed: bool):
+        m = self._metrics.setdefault(task, {
+            "calls": 0, "items": 0, "retries": 0, "errors": 0, "latency_ms": deque(maxlen=1000)
+        })
+        m["calls"] += 1
+        m["items"] += items
+        m["retries"] += retries
+        m["errors"] += int(failed)
+        m["latency_ms"].append((time.perf_counter() - started) * 1000)
+
+    def stats(self) -> Dict[str, Any]:
+        out = {}
+        for task, m in self._metrics.items():
+            latency = np.array(m["latency_ms"]) if m["latency_ms"] else np.zeros(1)
+            out[task] = {
+                "calls": m["calls"],
+                "items": m["items"],
+                "retries": m["retries"],
+                "errors": m["errors"],
+                "p50_ms": round(float(np.percentile(latency, 50)), 2),
+                "p95_ms": round(float(np.percentile(latency, 95)), 2),
+                "max_ms": round(float(latency.max()), 2)
+            }
+        return out
+
+    # Requests
+
+    def _retry_delay(self, attempt: int, response: Optional[httpx.Response]) -> float:
+        if response is not None:
+            retry_after = response.headers.get("Retry-After")
+            if retry_after:
+                try:
+                    return float(retry_after)
+                except ValueError:
+                    pass
+        return self.backoff * (2 ** attempt) * (1 + random.random() * 0.1)
+
+    async def _post(self, task: str, url: str, payload: Dict[str, Any], items: int) -> Any:
+        client = self._get_client()
+        started = time.perf_counter()
+        async with self._semaphore:
+            for attempt in range(self.max_retries + 1):
+                response = None
+                try:
+                    response = await client.post(url, json=payload)
+                    if response.status_code not in RETRY_STATUSES:
+                        response.raise_for_status()
+                        self._record(task, started, items, attempt, failed=False)
+                        return response.json()
+                    error = f"HTTP {response.status_code}"
+                except httpx.TransportError as e:
+                    error = f"{type(e).__name__}: {e}"
+                except httpx.HTTPStatusError as e:
+                    self._record(task, started, items, attempt, failed=True)
+                    raise HFAPIError(f"{task} request failed: {e}") from e
+
+                if attempt < self.max_retries:
+                    delay = self._retry_delay(attempt, response)
+                    logger.warning(f"HF API {task} attempt {attempt + 1} failed ({error}); retrying in {delay:.2f}s")
+                    await asyncio.sleep(delay)
+
+        self._record(task, started, items, self.max_retries, failed=True)
+        raise HFAPIError(f"{task} request failed after {self.max_retries + 1} attempts: {error}")
+
+    async def _batched(self, task: str, url: str, inputs: List[str], parameters: Optional[Dict] = None) -> List[Any]:
+        batches = [inputs[i:i + self.batch_size] for i in range(0, len(inputs), self.batch_size)]
+        payloads = [{"inputs": batch, **({"parameters": parameters} if parameters else {})} for batch in batches]
+        results = await asyncio.gather(*[
+            self._post(task, url, payload, len(batch)) for payload, batch in zip(payloads, batches)
+        ])
+        return [row for rows in results for row in rows]
+
+    async def asentiment(self, texts: List[str], model: str) -> List[Dict[str, Any]]:
+        """Top {label, score} per text, in the shape of a transformers pipeline."""
+        rows = await self._batched("sentiment", f"{self.base_url}/{model}", texts)
+        # Classification returns every label per text; keep the most likely one
+        return [max(row, key=lambda r: r["score"]) if isinstance(row, list) else row for row in rows]
+
+    async def aembed(self, texts: List[str], model: str) -> np.ndarray:
+        rows = await self._batched("embedding", f"{self.base_url}/{model}/pipeline/feature-extraction", texts)
+        return np.asarray(rows, dtype=np.float32)
+
+    async def agenerate(self, prompts: List[str], model: str, max_new_tokens: int) -> List[str]:
+        rows = await self._batched("generation", f"{self.base_url}/{model}", prompts, {"max_new_tokens": max_new_tokens})
+        return [(row[0] if isinstance(row, list) else row)["generated_text"] for row in rows]
+
+    def sentiment(self, texts: List[str], model: str) -> List[Dict[str, Any]]:
+        return self._submit(self.asentiment(texts, model))
+
+    def embed(self, texts: List[str], model: str) -> np.ndarray:
+        return self._submit(self.aembed(texts, model))
+
+    def generate(self, prompts: List[str], model: str, max_new_tokens: int) -> List[str]:
+        return self._submit(self.agenerate(prompts, model, max_new_tokens))
+
+class RemoteSentimentPipeline:
+    """Stands in for a transformers sentiment pipeline: called with a text or list of texts."""
+    def __init__(self, client: HFInferenceClient, model: str):
+        self.client = client
+        self.model = model
+
+    def __call__(self, texts, **kwargs) -> List[Dict[str, Any]]:
+        return self.client.sentiment([texts] if isinstance(texts, str) else list(texts), self.model)
+
+class RemoteEmbedder:
+    """Stands in for a SentenceTransformer, so the embedding cache works unchanged."""
+    def __init__(self, client: HFInferenceClient, model: str):
+        self.client = client
+        self.model = model
+
+    def encode(self, texts: List[str], **kwargs) -> np.ndarray:
+        return self.client.embed(list(texts), self.model)
+
+class RemoteGenerationService(GenerationService):
+    """GenerationService (batching, prompt-hash cache) over the Inference API."""
+    def __init__(self, client: HFInferenceClient, model_name: str, cache: GenerationCache):
+        super().__init__(tokenizer=None, model=None, model_name=f"hf-api:{model_name}", cache=cache,
+                         batch_size=client.batch_size)
+        self.client = client
+        self.remote_model = model_name
+
+    def _run(self, prompts: List[str], decoding: Dict[str, Any]) -> List[str]:
+        return self.client.generate(prompts, self.remote_model, decoding["max_new_tokens"])
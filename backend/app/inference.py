@@ -1,70 +1,248 @@
-import os
 import json
+import time
 import logging
+import threading
+from collections import Counter
+from itertools import islice
 import numpy as np
 import pandas as pd
-from typing import List, Dict, Any, Generator
+from typing import List, Dict, Any, Generator, Iterable, Optional
+from plotly.utils import PlotlyJSONEncoder
 from app.config import settings
 from app.schemas import AnalysisReport
-from app.utils import plot_top_topics, plot_skills_gap, plot_sentiment_time_series
+from app.embedding_cache import embedding_cache
+from app.generation import GenerationService, generation_cache
+from app.sentiment_cache import sentiment_cache
+from app.hf_client import HFInferenceClient, RemoteEmbedder, RemoteGenerationService, RemoteSentimentPipeline
+from app.clustering import cluster_embeddings, StreamingKMeans
+from app.topics import topic_matcher
+from app.dedup import DedupGroups, group_texts
+from app.model_registry import model_registry
+from app.metrics import metrics
+from app.model_backends import embedding_cache_id, load_embedding_model, load_sentiment_pipeline, validate_backend
+from app.utils import (
+    plot_top_topics, plot_skills_gap, plot_sentiment_time_series,
+    plot_top_topics_from_stats, plot_skills_gap_from_counts, plot_sentiment_series
+)
 
-# ML Imports
-try:
-    from textblob import TextBlob
-    from sklearn.cluster import AgglomerativeClustering
-    from sklearn.feature_extraction.text import TfidfVectorizer
-    import torch
-    from transformers import pipeline, AutoTokenizer, AutoModelForSeq2SeqLM
-    from sentence_transformers import SentenceTransformer
-except ImportError as e:
-    print(f"Warning: ML dependencies missing: {e}")
+# ML libraries (torch, transformers, sentence_transformers, textblob) are
+# imported inside the loaders below, so importing this module stays cheap and
+# MODEL_STARTUP decides when the cost is paid
 
 logger = logging.getLogger(__name__)
 
+SENTIMENT_MODEL_NAME = 'distilbert-base-uncased-finetuned-sst-2-english'
+EMBEDDING_MODEL_NAME = 'all-MiniLM-L6-v2'
+GENERATION_MODEL_NAME = 'google/flan-t5-small'
+# Hub id of the embedding model for the Inference API
+REMOTE_EMBEDDING_MODEL_NAME = f'sentence-transformers/{EMBEDDING_MODEL_NAME}'
+REMOTE_BACKEND = 'huggingface_api'
+
+MODEL_STARTUP_POLICIES = ("eager", "lazy", "background")
+
+RECOMMENDED_FIXES = (
+    "Review Unity Catalog permissions for Governance issues.",
+    "Optimize shuffle partitions for Performance issues.",
+    "Use Auto Loader for Streaming ingestion."
+)
+
+TUNING_PARAMS = ("spark.sql.shuffle.partitions", "spark.databricks.delta.optimizeWrite.enabled")
+
+def _event(name: str, data: Any) -> str:
+    # Plotly figure dicts hold numpy arrays, which the stdlib encoder rejects
+    return json.dumps({"event": name, "data": data}, cls=PlotlyJSONEncoder)
+
+def _textblob_sentiment(text: str) -> Dict[str, Any]:
+    from textblob import TextBlob
+    score = TextBlob(text).sentiment.polarity
+    stype = "positive" if score > 0.1 else "negative" if score < -0.1 else "neutral"
+    return {"sentiment_type": stype, "sentiment_score": score}
+
 class InferenceEngine:
     def __init__(self):
         self.mode = settings.MODEL_MODE
         self.hf_api_key = settings.HUGGINGFACE_API_KEY
+        self.inference_backend = validate_backend(settings.INFERENCE_BACKEND)
         self.models_loaded = False
         self.sentiment_pipeline = None
         self.embedding_model = None
         self.summarizer_model = None
         self.summarizer_tokenizer = None
-        
+        self.generator: Optional[GenerationService] = None
+        self.remote: Optional[HFInferenceClient] = None
+        self.embedding_backend = self.inference_backend
+        # Dedup ratio and estimated inference time saved by the last analysis
+        self.last_dedup: Dict[str, Any] = {}
+        self._load_lock = threading.Lock()
+        self._warmup_thread: Optional[threading.Thread] = None
+        # The policy start() applied; None until it runs
+        self.startup_policy: Optional[str] = None
+        # Per-model readiness for /health: state is pending, loading, ready,
+        # fallback (failed, a cheaper path is used) or skipped
+        self.model_status: Dict[str, Dict[str, Any]] = {
+            name: {"state": "pending", "model": model, "backend": backend, "load_seconds": None, "error": None}
+            for name, model, backend in (
+                ("sentiment", SENTIMENT_MODEL_NAME, self.inference_backend),
+                ("embedding", EMBEDDING_MODEL_NAME, self.inference_backend),
+                ("generation", GENERATION_MODEL_NAME, "torch")
+            )
+        }
+
+    def _timed_load(self, name: str, loader) -> bool:
+        status = self.model_status[name]
+        status["state"] = "loading"
+        status["error"] = None
+        started = time.perf_counter()
+        try:
+            loader()
+            status["state"] = "ready"
+            return True
+        except Exception as e:
+            status["state"] = "fallback"
+            status["error"] = str(e)
+            raise
+        finally:
+            status["load_seconds"] = round(time.perf_counter() - started, 3)
+            logger.info(f"{name} model {status['state']} after {status['load_seconds']}s")
+
+    def _remote_client(self) -> HFInferenceClient:
+        if not self.hf_api_key:
+            raise ValueError("HUGGINGFACE_API_KEY is required in huggingface_api mode")
+        if self.remote is None:
+            self.remote = HFInferenceClient(self.hf_api_key)
+        return self.remote
+
+    def _load_sentiment(self):
+        if self.mode == REMOTE_BACKEND:
+            self.model_status["sentiment"]["backend"] = REMOTE_BACKEND
+            self.sentiment_pipeline = RemoteSentimentPipeline(self._remote_client(), SENTIMENT_MODEL_NAME)
+            return
+        backend = self.inference_backend
+        self.sentiment_pipeline = model_registry.get(
+            ("sentiment", SENTIMENT_MODEL_NAME, backend),
+            lambda: load_sentiment_pipeline(SENTIMENT_MODEL_NAME, backend)
+        )
+
+    def _load_embedding(self):
+        if self.mode == REMOTE_BACKEND:
+            self.model_status["embedding"]["backend"] = self.embedding_backend = REMOTE_BACKEND
+            self.embedding_model = RemoteEmbedder(self._remote_client(), REMOTE_EMBEDDING_MODEL_NAME)
+            return
+        backend = self.inference_backend
+        self.embedding_model = model_registry.get(
+            ("embedding", EMBEDDING_MODEL_NAME, backend),
+            lambda: load_embedding_model(EMBEDDING_MODEL_NAME, backend)
+        )
+
+    def _load_remote_generation(self):
+        self.model_status["generation"]["backend"] = REMOTE_BACKEND
+        self.generator = RemoteGenerationService(self._remote_client(), GENERATION_MODEL_NAME, generation_cache)
+
+    def _load_generation(self):
+        def load():
+            from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
+            return (
+                AutoTokenizer.from_pretrained(GENERATION_MODEL_NAME),
+                AutoModelForSeq2SeqLM.from_pretrained(GENERATION_MODEL_NAME).eval()
+            )
+
+        self.summarizer_tokenizer, self.summarizer_model = model_registry.get(
+            ("generation", GENERATION_MODEL_NAME, "torch"), load
+        )
+        self.generator = GenerationService(
+            self.summarizer_tokenizer, self.summarizer_model, GENERATION_MODEL_NAME, generation_cache
+        )
+
     def load_models(self):
         if self.models_loaded:
             return
 
-        logger.info(f"Loading models in {self.mode} mode...")
-        
-        # 1. Sentiment
-        try:
-            # Try lightweight local first
-            self.sentiment_pipeline = pipeline("sentiment-analysis", model="distilbert-base-uncased-finetuned-sst-2-english")
-        except Exception as e:
-            logger.warning(f"Failed to load sentiment model, falling back to TextBlob: {e}")
-            self.sentiment_pipeline = None # Fallback to TextBlob
+        # A background warm-up may already be loading; wait for it instead of loading twice
+        with self._load_lock:
+            if self.models_loaded:
+                return
 
-        # 2. Embeddings (Local is usually fine for MiniLM)
-        try:
-            self.embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
-        except Exception as e:
-            logger.error(f"Failed to load embedding model: {e}")
-            self.embedding_model = None
+            logger.info(f"Loading models in {self.mode} mode...")
+            
+            # 1. Sentiment
+            try:
+                # Try lightweight local first
+                self._timed_load("sentiment", self._load_sentiment)
+            except Exception as e:
+                logger.warning(f"Failed to load sentiment model, falling back to TextBlob: {e}")
+                self.sentiment_pipeline = None # Fallback to TextBlob
 
-        # 3. Summarization / Generation
-        if self.mode == 'local' or self.mode == 'auto':
+            # 2. Embeddings (Local is usually fine for MiniLM)
             try:
-                model_name = "google/flan-t5-small"
-                self.summarizer_tokenizer = AutoTokenizer.from_pretrained(model_name)
-                self.summarizer_model = AutoModelForSeq2SeqLM.from_pretrained(model_name)
+                self._timed_load("embedding", self._load_embedding)
             except Exception as e:
-                logger.warning(f"Failed to load local generation model: {e}. Switching to API/Fallback.")
-                if self.mode == 'auto' and self.hf_api_key:
-                    self.mode = 'huggingface_api'
-        
-        self.models_loaded = True
-        logger.info("Models loaded.")
+                logger.error(f"Failed to load embedding model: {e}")
+                self.embedding_model = None
+
+            # 3. Summarization / Generation
+            if self.mode == 'local' or self.mode == 'auto':
+                try:
+                    self._timed_load("generation", self._load_generation)
+                except Exception as e:
+                    logger.warning(f"Failed to load local generation model: {e}. Switching to API/Fallback.")
+                    if self.mode == 'auto' and self.hf_api_key:
+                        self.mode = REMOTE_BACKEND
+                        self._timed_load("generation", self._load_remote_generation)
+            elif self.mode == REMOTE_BACKEND:
+                try:
+                    self._timed_load("generation", self._load_remote_generation)
+                except Exception as e:
+                    logger.warning(f"Remote generation unavailable, using fallback summaries: {e}")
+            else:
+                self.model_status["generation"]["state"] = "skipped"
+            
+            self.models_loaded = True
+            logger.info("Models loaded.")
+
+    def start(self, policy: Optional[str] = None):
+        """
+        Applies the MODEL_STARTUP policy at application startup:
+        'eager' loads every model before returning, 'background' loads them in a
+        daemon thread (requests that need a model wait for it), 'lazy' defers
+        imports and loading to the first request that needs them.
+        """
+        policy = policy or settings.MODEL_STARTUP
+        if policy not in MODEL_STARTUP_POLICIES:
+            raise ValueError(f"Unknown MODEL_STARTUP {policy!r}; expected one of {MODEL_STARTUP_POLICIES}")
+        self.startup_policy = policy
+
+        if policy == "eager":
+            self.load_models()
+        elif policy == "background" and self._warmup_thread is None:
+            self._warmup_thread = threading.Thread(target=self._warm_up, name="model-warmup", daemon=True)
+            self._warmup_thread.start()
+
+    def _warm_up(self):
+        try:
+            self.load_models()
+        except Exception as e:
+            logger.error(f"Model warm-up failed: {e}")
+
+    def close(self):
+        if self.remote is not None:
+            self.remote.close()
+
+    def readiness(self) -> Dict[str, Any]:
+        return {
+            "policy": self.startup_policy,
+            "loaded": self.models_loaded,
+            "models": {name: dict(status) for name, status in self.model_status.items()},
+            "registry": model_registry.stats(),
+            "last_dedup": self.last_dedup,
+            "remote": self.remote.stats() if self.remote is not None else {}
+        }
+
+    def _format_sentiment(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        score = result['score'] if result['label'] == 'POSITIVE' else -result['score']
+        return {
+            "sentiment_type": result['label'].lower(),
+            "sentiment_score": score
+        }
 
     def _get_sentiment(self, text: str) -> Dict[str, Any]:
         if not text:
@@ -74,117 +252,311 @@ class InferenceEngine:
             try:
                 # Truncate to 512 tokens approx
                 result = self.sentiment_pipeline(text[:2000])[0]
-                score = result['score'] if result['label'] == 'POSITIVE' else -result['score']
-                return {
-                    "sentiment_type": result['label'].lower(),
-                    "sentiment_score": score
-                }
+                return self._format_sentiment(result)
             except Exception:
                 pass
         
         # Fallback
-        blob = TextBlob(text)
-        score = blob.sentiment.polarity
-        stype = "positive" if score > 0.1 else "negative" if score < -0.1 else "neutral"
-        return {"sentiment_type": stype, "sentiment_score": score}
+        metrics.inc("sentiment_fallbacks_total")
+        return _textblob_sentiment(text)
 
-    def _generate_text(self, prompt: str) -> str:
-        # Local
-        if self.summarizer_model:
-            inputs = self.summarizer_tokenizer(prompt, return_tensors="pt", max_length=512, truncation=True)
-            outputs = self.summarizer_model.generate(**inputs, max_new_tokens=100)
-            return self.summarizer_tokenizer.decode(outputs[0], skip_special_tokens=True)
-        
-        # API (Mock implementation for now if no key)
-        if self.mode == 'huggingface_api' and self.hf_api_key:
-            # Call HF API (omitted for brevity, assume requests)
-            pass
+    def _sentiment_model_id(self) -> str:
+        # Identity for the sentiment cache; results from different models never mix
+        if not self.sentiment_pipeline:
+            return "textblob"
+        return f"{SENTIMENT_MODEL_NAME}:{self.model_status['sentiment']['backend']}"
+
+    def _get_sentiments(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """
+        Scores texts in padded batches of SENTIMENT_BATCH_SIZE.
+        Texts already in the sentiment cache, or repeated within the call, are
+        scored once. Rows from a batch that fails are rescored one by one through
+        _get_sentiment, so only those rows can end up on the TextBlob fallback
+        (and are not cached under the pipeline's identity).
+        """
+        model_id = self._sentiment_model_id()
+        cached = sentiment_cache.get_many(model_id, texts)
+        pending = [text for text in dict.fromkeys(texts) if text and text not in cached]
+        scored: Dict[str, Dict[str, Any]] = {}
+
+        if self.sentiment_pipeline:
+            batch_size = max(1, settings.SENTIMENT_BATCH_SIZE)
+            for start in range(0, len(pending), batch_size):
+                batch = pending[start:start + batch_size]
+                try:
+                    outputs = self.sentiment_pipeline(
+                        [text[:2000] for text in batch],
+                        batch_size=batch_size,
+                        padding=True,
+                        truncation=True
+                    )
+                except Exception as e:
+                    logger.warning(f"Sentiment batch of {len(batch)} failed, scoring rows individually: {e}")
+                    continue
+                metrics.inc("model_calls_total", model="sentiment")
+                metrics.inc("model_inputs_total", len(batch), model="sentiment")
+                for text, result in zip(batch, outputs):
+                    scored[text] = self._format_sentiment(result)
+        else:
+            scored = {text: _textblob_sentiment(text) for text in pending}
+            metrics.inc("sentiment_fallbacks_total", len(scored))
+        sentiment_cache.put_many(model_id, scored)
+
+        resolved = {**cached, **scored}
+        return [resolved[text] if text in resolved else self._get_sentiment(text) for text in texts]
+
+    def _generate_texts(self, prompts: List[str]) -> List[str]:
+        # Local model or Inference API, batched and cached by prompt hash
+        if self.generator:
+            try:
+                return self.generator.generate_batch(prompts)
+            except Exception as e:
+                logger.warning(f"Generation failed, using fallback: {e}")
             
         # Fallback heuristic
-        return "Analysis generated (Fallback): Check logs for details."
+        metrics.inc("generation_fallbacks_total", len(prompts))
+        return ["Analysis generated (Fallback): Check logs for details."] * len(prompts)
 
-    def analyze_engagements(self, engagements: List[Dict]) -> AnalysisReport:
-        self.load_models()
-        
+    def _generate_text(self, prompt: str) -> str:
+        return self._generate_texts([prompt])[0]
+
+    def _prepare_frame(self, engagements: List[Dict]) -> pd.DataFrame:
         df = pd.DataFrame(engagements)
         if 'notes' not in df.columns:
             df['notes'] = ""
-        
-        # 1. Sentiment Analysis
-        sentiments = [self._get_sentiment(f"{row.get('notes', '')} {row.get('feedback', '')}") for _, row in df.iterrows()]
-        df['sentiment_score'] = [s['sentiment_score'] for s in sentiments]
-        df['sentiment_type'] = [s['sentiment_type'] for s in sentiments]
-        
-        # 2. Topic Extraction & Clustering
-        # Simple heuristic topic extraction first
-        topics = []
-        for _, row in df.iterrows():
-            text = (row.get('notes', '') + " " + row.get('feedback', '')).lower()
-            if "streaming" in text or "kafka" in text: topic = "Streaming"
-            elif "governance" in text or "unity" in text: topic = "Governance"
-            elif "performance" in text or "slow" in text: topic = "Performance"
-            elif "migration" in text: topic = "Migration"
-            else: topic = "General"
-            topics.append(topic)
-        df['topic'] = topics
-        
+        # Text used by sentiment, topics and embeddings, built once per frame
+        feedback = df['feedback'].fillna('').astype(str) if 'feedback' in df.columns else ''
+        df['text'] = df['notes'].fillna('').astype(str) + " " + feedback
+        return df
+
+    def _dedup(self, df: pd.DataFrame) -> DedupGroups:
+        return group_texts(df['text'], settings.DEDUP_MODE)
+
+    def _score_sentiment(self, df: pd.DataFrame, groups: Optional[DedupGroups] = None):
+        # Scored once per duplicate group, then fanned back out to every row
+        if groups is None:
+            groups = self._dedup(df)
+        texts = df['text'].to_numpy()[groups.representatives].tolist()
+        sentiments = self._get_sentiments(texts)
+        df['sentiment_score'] = groups.fan_out([s['sentiment_score'] for s in sentiments])
+        df['sentiment_type'] = groups.fan_out([s['sentiment_type'] for s in sentiments])
+
+    def _assign_topics(self, df: pd.DataFrame):
+        # Vectorized over the keyword vocabulary shared with the dashboard routes
+        df['topic'] = topic_matcher.assign(df['text'])
+
+    def _embed(self, df: pd.DataFrame, groups: Optional[DedupGroups] = None) -> np.ndarray:
+        if groups is None:
+            groups = self._dedup(df)
+        texts = df['text'].to_numpy()[groups.representatives].tolist()
+        model_id = embedding_cache_id(EMBEDDING_MODEL_NAME, self.embedding_backend)
+        return groups.fan_out(embedding_cache.encode(self.embedding_model, model_id, texts))
+
+    def _assign_clusters(self, df: pd.DataFrame, groups: Optional[DedupGroups] = None,
+                         timings: Optional[Dict[str, float]] = None):
         # Clustering if we have embeddings
-        clusters = []
         if self.embedding_model and not df.empty:
-            texts = (df['notes'] + " " + df.get('feedback', '')).tolist()
-            embeddings = self.embedding_model.encode(texts)
-            if len(df) > 2:
-                clustering = AgglomerativeClustering(n_clusters=min(5, len(df))).fit(embeddings)
-                df['cluster'] = clustering.labels_
-            else:
-                df['cluster'] = 0
+            with metrics.stage("embeddings", timings):
+                embeddings = self._embed(df, groups)
+            with metrics.stage("clustering", timings):
+                if len(df) > 2:
+                    df['cluster'] = cluster_embeddings(embeddings, n_clusters=min(5, len(df)))
+                else:
+                    df['cluster'] = 0
         else:
             df['cluster'] = 0
 
-        # 3. Generate Summary
-        summary_prompt = f"Summarize these issues: {df['notes'].head(5).tolist()}"
+    def _record_dedup(self, groups: DedupGroups, inference_seconds: float):
+        # Per-row inference cost observed on the representatives, times the rows they stood in for
+        saved = inference_seconds / groups.groups * (groups.rows - groups.groups) if groups.groups else 0.0
+        self.last_dedup = {
+            **groups.stats(),
+            "mode": settings.DEDUP_MODE,
+            "inference_seconds": round(inference_seconds, 3),
+            "estimated_seconds_saved": round(saved, 3)
+        }
+        logger.info(
+            f"Dedup {settings.DEDUP_MODE}: {groups.rows} rows -> {groups.groups} groups "
+            f"({self.last_dedup['dedup_ratio']:.0%}), ~{saved:.2f}s of inference saved"
+        )
+
+    def _summarize(self, notes: List[str], fallback: str) -> str:
+        summary_prompt = f"Summarize these issues: {notes}"
         summary = self._generate_text(summary_prompt)
         if summary == "Analysis generated (Fallback): Check logs for details.":
-             # Better fallback
-             summary = f"Analyzed {len(df)} engagements. Top topic: {df['topic'].mode()[0] if not df.empty else 'None'}. Average sentiment: {df['sentiment_score'].mean():.2f}."
+            # Better fallback
+            summary = fallback
+        return summary
 
-        # 4. Generate Plots
-        plots = {
-            "top_topics": plot_top_topics(df),
-            "skills_gap": plot_skills_gap(df),
-            "sentiment_trend": plot_sentiment_time_series(df)
-        }
+    def analyze_engagements(self, engagements: List[Dict]) -> AnalysisReport:
+        self.load_models()
+        # Seconds per stage, returned in the report and recorded in /metrics
+        timings: Dict[str, float] = {}
+        started = time.perf_counter()
         
-        # 5. Recommendations
-        fixes = [
-            "Review Unity Catalog permissions for Governance issues.",
-            "Optimize shuffle partitions for Performance issues.",
-            "Use Auto Loader for Streaming ingestion."
-        ]
+        with metrics.stage("prepare", timings):
+            df = self._prepare_frame(engagements)
+        with metrics.stage("dedup", timings):
+            groups = self._dedup(df)
+        
+        # 1. Sentiment Analysis
+        with metrics.stage("sentiment", timings):
+            self._score_sentiment(df, groups)
         
-        tuning = ["spark.sql.shuffle.partitions", "spark.databricks.delta.optimizeWrite.enabled"]
+        # 2. Topic Extraction (per row: the masked names decide the topic) & Clustering
+        with metrics.stage("topics", timings):
+            self._assign_topics(df)
+        self._assign_clusters(df, groups, timings)
+        self._record_dedup(groups, timings["sentiment"] + timings.get("embeddings", 0.0))
 
+        # 3. Generate Summary
+        with metrics.stage("summary", timings):
+            summary = self._summarize(
+                df['notes'].iloc[groups.representatives].head(5).tolist(),
+                fallback=f"Analyzed {len(df)} engagements. Top topic: {df['topic'].mode()[0] if not df.empty else 'None'}. Average sentiment: {df['sentiment_score'].mean():.2f}."
+            )
+
+        # 4. Generate Plots
+        with metrics.stage("plots", timings):
+            plots = {
+                "top_topics": plot_top_topics(df),
+                "skills_gap": plot_skills_gap(df),
+                "sentiment_trend": plot_sentiment_time_series(df)
+            }
+        timings["total"] = round(time.perf_counter() - started, 4)
+        metrics.inc("analysis_rows_total", len(df), entry="batch")
+        
+        # 5. Recommendations
         return AnalysisReport(
             summary=summary,
-            clusters=[{"id": int(c), "size": int(len(df[df['cluster'] == c]))} for c in df['cluster'].unique()] if not df.empty else [],
-            fixes=fixes,
-            tuning_params=tuning,
+            clusters=[{"id": int(c), "size": int(n)} for c, n in df['cluster'].value_counts(sort=False).items()],
+            fixes=list(RECOMMENDED_FIXES),
+            tuning_params=list(TUNING_PARAMS),
             plotly_data=plots,
-            notebook_markdown=f"# Analysis Report\n\n{summary}"
+            notebook_markdown=f"# Analysis Report\n\n{summary}",
+            timings=timings
         )
 
-    def stream_analyze_generator(self, engagements: List[Dict]) -> Generator[str, None, None]:
+    def stream_analyze_generator(self, engagements: Iterable[Dict], chunk_size: Optional[int] = None) -> Generator[str, None, None]:
+        """
+        Analyzes engagements in windows of chunk_size and yields a 'chunk_ready' event
+        per window with running sentiment/topic counts and an interim summary.
+        Only the current window is held as a DataFrame; everything carried across
+        windows is a bounded aggregate, so the final report is built from those.
+        """
+        chunk_size = chunk_size or settings.STREAM_CHUNK_SIZE
+
         # Yield steps
-        yield json.dumps({"event": "status", "data": "Loading models..."})
+        yield _event("status", "Loading models...")
         self.load_models()
         
-        yield json.dumps({"event": "status", "data": "Analyzing sentiment..."})
-        # ... (In real app, chunk processing)
+        yield _event("status", "Analyzing engagements...")
+        # Summed over chunks; time spent by the consumer between events is not counted
+        timings: Dict[str, float] = {}
+        stats = StreamStats()
+        clusterer = StreamingKMeans(n_clusters=5) if self.embedding_model else None
+        
+        records = iter(engagements)
+        chunk_index = 0
+        while True:
+            chunk = list(islice(records, chunk_size))
+            if not chunk:
+                break
+            
+            with metrics.stage("prepare", timings):
+                df = self._prepare_frame(chunk)
+            with metrics.stage("dedup", timings):
+                groups = self._dedup(df)
+            with metrics.stage("sentiment", timings):
+                self._score_sentiment(df, groups)
+            with metrics.stage("topics", timings):
+                self._assign_topics(df)
+            if clusterer is not None:
+                with metrics.stage("embeddings", timings):
+                    embeddings = self._embed(df, groups)
+                with metrics.stage("clustering", timings):
+                    clusterer.partial_fit(embeddings)
+                    df['cluster'] = clusterer.predict(embeddings) if clusterer.is_fitted else 0
+            else:
+                df['cluster'] = 0
+            stats.update(df)
+            metrics.inc("analysis_rows_total", len(df), entry="stream")
+            
+            chunk_index += 1
+            yield _event("chunk_ready", {
+                "chunk": chunk_index,
+                "processed": stats.count,
+                "sentiment_counts": dict(stats.sentiment_counts),
+                "topic_counts": dict(stats.topic_counts),
+                "interim_summary": stats.describe()
+            })
+        
+        with metrics.stage("summary", timings):
+            summary = self._summarize(stats.first_notes, fallback=stats.describe())
+        yield _event("summary_ready", summary)
         
-        report = self.analyze_engagements(engagements)
+        with metrics.stage("plots", timings):
+            plots = stats.plots()
+        yield _event("plots_ready", plots)
         
-        yield json.dumps({"event": "summary_ready", "data": report.summary})
-        yield json.dumps({"event": "plots_ready", "data": report.plotly_data})
-        yield json.dumps({"event": "final_report", "data": report.model_dump()})
+        report = AnalysisReport(
+            summary=summary,
+            clusters=[{"id": int(c), "size": int(n)} for c, n in stats.cluster_counts.items()],
+            fixes=list(RECOMMENDED_FIXES),
+            tuning_params=list(TUNING_PARAMS),
+            plotly_data=plots,
+            notebook_markdown=f"# Analysis Report\n\n{summary}",
+            timings=timings
+        )
+        yield _event("final_report", report.model_dump())
+
+class StreamStats:
+    """Running aggregates for stream_analyze_generator; size depends on topics and dates, not rows"""
+    def __init__(self):
+        self.count = 0
+        self.sentiment_total = 0.0
+        self.sentiment_counts: Counter = Counter()
+        self.topic_counts: Counter = Counter()
+        self.topic_sentiment: Dict[str, float] = {}
+        self.daily_sentiment: Dict[pd.Timestamp, List[float]] = {}  # date -> [score total, rows]
+        self.cluster_counts: Counter = Counter()
+        self.first_notes: List[str] = []
+
+    def update(self, df: pd.DataFrame):
+        self.count += len(df)
+        self.sentiment_total += float(df['sentiment_score'].sum())
+        self.sentiment_counts.update(df['sentiment_type'].tolist())
+        self.topic_counts.update(df['topic'].tolist())
+        self.cluster_counts.update(int(c) for c in df['cluster'])
+        for topic, total in df.groupby('topic')['sentiment_score'].sum().items():
+            self.topic_sentiment[topic] = self.topic_sentiment.get(topic, 0.0) + float(total)
+        if 'date' in df.columns:
+            dates = pd.to_datetime(df['date'])
+            for date, group in df.groupby(dates)['sentiment_score']:
+                acc = self.daily_sentiment.setdefault(date, [0.0, 0])
+                acc[0] += float(group.sum())
+                acc[1] += len(group)
+        if len(self.first_notes) < 5:
+            self.first_notes.extend(df['notes'].head(5 - len(self.first_notes)).tolist())
+
+    def describe(self) -> str:
+        if not self.count:
+            return "No engagements analyzed."
+        top_topic = self.topic_counts.most_common(1)[0][0]
+        return f"Analyzed {self.count} engagements. Top topic: {top_topic}. Average sentiment: {self.sentiment_total / self.count:.2f}."
+
+    def plots(self) -> Dict[str, Any]:
+        topic_frame = pd.DataFrame([
+            {'Topic': t, 'Count': n, 'sentiment_score': self.topic_sentiment[t] / n}
+            for t, n in self.topic_counts.most_common()
+        ])
+        daily_frame = pd.DataFrame(
+            [{'date': d, 'sentiment_score': total / n} for d, (total, n) in sorted(self.daily_sentiment.items())]
+        )
+        return {
+            "top_topics": plot_top_topics_from_stats(topic_frame),
+            "skills_gap": plot_skills_gap_from_counts(dict(self.topic_counts)),
+            "sentiment_trend": plot_sentiment_series(daily_frame)
+        }
 
 engine = InferenceEngine()
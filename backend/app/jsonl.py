@@ -0,0 +1,2 @@
+# The JSON Lines reader shared with the pipeline (backend/shared/jsonl.py)
+from shared.jsonl import JSONL_SUFFIXES, is_jsonl, iter_records, load_latest_by_id, open_text
@@ -1,12 +1,30 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from app.routes import analyze
 from app.config import settings
+from app.embedding_cache import embedding_cache
+from app.executor import executor
+from app.databricks_client import db_client
+from app.inference import engine
+from app.generation import generation_cache
+from app.metrics import PROMETHEUS_CONTENT_TYPE, metrics
+from app.sentiment_cache import sentiment_cache
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    engine.start(settings.MODEL_STARTUP)
+    yield
+    executor.shutdown()
+    db_client.close()
+    engine.close()
+    sentiment_cache.close()
 
 app = FastAPI(
     title="Databricks Engagement Intelligence API",
     description="API for analyzing customer engagements using local LLMs",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS
@@ -16,6 +34,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Cache", "X-Cache-Age", "X-Cache-Hits", "X-Next-Cursor"],
 )
 
 app.include_router(analyze.router, prefix="/api", tags=["Analysis"])
@@ -26,4 +45,22 @@ async def root():
 
 @app.get("/health")
 async def health():
-    return {"status": "ok", "mode": settings.MODEL_MODE}
+    return {
+        "status": "ok",
+        "mode": settings.MODEL_MODE,
+        "models": engine.readiness(),
+        "embedding_cache": embedding_cache.stats(),
+        "generation_cache": generation_cache.stats(),
+        "sentiment_cache": sentiment_cache.stats(),
+        "databricks_pool": db_client.pool_stats()
+    }
+
+@app.get("/metrics")
+async def prometheus_metrics():
+    """Analysis stage timings, model and cache counters and memory, in Prometheus text format"""
+    caches = {
+        "sentiment": sentiment_cache.stats(),
+        "embedding": embedding_cache.stats(),
+        "generation": generation_cache.stats()
+    }
+    return Response(content=metrics.render(caches), media_type=PROMETHEUS_CONTENT_TYPE)
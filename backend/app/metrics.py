@@ -0,0 +1,147 @@
+import os
+import time
+import resource
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Upper bounds (seconds) of the stage duration histogram buckets
+STAGE_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+COUNTERS = {
+    "analysis_rows_total": "Engagements analyzed, by entry point",
+    "model_calls_total": "Batched calls into a model, by model",
+    "model_inputs_total": "Texts sent to a model, by model",
+    "sentiment_fallbacks_total": "Texts scored with TextBlob instead of the sentiment model",
+    "generation_fallbacks_total": "Prompts answered with the fallback text instead of a model"
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+def rss_bytes() -> int:
+    """Current resident set size of this process; 0 where /proc is unavailable."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels) + "}"
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+class _Histogram:
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+class Metrics:
+    """
+    In-process counters and per-stage duration histograms for the analysis
+    engine, rendered in the Prometheus text format by /metrics.
+
+    Values live in the process that records them. Under gunicorn every worker
+    keeps its own, so scrape workers individually (or aggregate by instance).
+    """
+    def __init__(self, buckets: Tuple[float, ...] = STAGE_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        self._stages: Dict[str, _Histogram] = {}
+
+    def inc(self, name: str, value: float = 1, **labels: str):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def counter(self, name: str, **labels: str) -> float:
+        return self._counters.get(name, {}).get(tuple(sorted(labels.items())), 0)
+
+    def observe_stage(self, stage: str, seconds: float):
+        with self._lock:
+            hist = self._stages.get(stage)
+            if hist is None:
+                hist = self._stages[stage] = _Histogram(self.buckets)
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    hist.counts[i] += 1
+            hist.sum += seconds
+            hist.count += 1
+
+    @contextmanager
+    def stage(self, name: str, timings: Optional[Dict[str, float]] = None) -> Iterator[None]:
+        """
+        Times the block into the stage histogram. With a timings dict, the
+        seconds are also added to timings[name] (summed if the stage repeats,
+        e.g. once per streamed chunk).
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            self.observe_stage(name, elapsed)
+            if timings is not None:
+                timings[name] = round(timings.get(name, 0.0) + elapsed, 4)
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._stages.clear()
+
+    def render(self, caches: Optional[Dict[str, Dict[str, Any]]] = None) -> str:
+        """
+        Prometheus exposition text. caches maps a cache name to its stats()
+        dict; their cumulative hits and misses are exported as counters.
+        """
+        lines: List[str] = []
+
+        with self._lock:
+            counters = {name: dict(series) for name, series in self._counters.items()}
+            stages = {name: (list(h.counts), h.sum, h.count) for name, h in self._stages.items()}
+
+        for name in sorted(set(COUNTERS) | set(counters)):
+            lines.append(f"# HELP {name} {COUNTERS.get(name, name)}")
+            lines.append(f"# TYPE {name} counter")
+            for labels, value in sorted(counters.get(name, {}).items()):
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+        lines.append("# HELP analysis_stage_seconds Time spent in each analysis stage")
+        lines.append("# TYPE analysis_stage_seconds histogram")
+        for stage, (counts, total, count) in sorted(stages.items()):
+            for bound, n in zip(self.buckets, counts):
+                lines.append(f"analysis_stage_seconds_bucket{_format_labels((('le', _format_value(bound)), ('stage', stage)))} {n}")
+            lines.append(f"analysis_stage_seconds_bucket{_format_labels((('le', '+Inf'), ('stage', stage)))} {count}")
+            lines.append(f"analysis_stage_seconds_sum{_format_labels((('stage', stage),))} {_format_value(round(total, 6))}")
+            lines.append(f"analysis_stage_seconds_count{_format_labels((('stage', stage),))} {count}")
+
+        if caches:
+            for kind in ("hits", "misses"):
+                lines.append(f"# HELP cache_{kind}_total Cache {kind}, by cache")
+                lines.append(f"# TYPE cache_{kind}_total counter")
+                for cache, stats in sorted(caches.items()):
+                    # The sentiment cache counts its SQLite tier separately
+                    value = stats.get(kind, 0) + (stats.get("disk_hits", 0) if kind == "hits" else 0)
+                    lines.append(f"cache_{kind}_total{_format_labels((('cache', cache),))} {_format_value(value)}")
+
+        lines.append("# HELP process_resident_memory_bytes Resident set size")
+        lines.append("# TYPE process_resident_memory_bytes gauge")
+        lines.append(f"process_resident_memory_bytes {rss_bytes()}")
+        lines.append("# HELP process_peak_resident_memory_bytes Peak resident set size")
+        lines.append("# TYPE process_peak_resident_memory_bytes gauge")
+        # ru_maxrss is in KiB on Linux
+        lines.append(f"process_peak_resident_memory_bytes {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024}")
+        return "\n".join(lines) + "\n"
+
+metrics = Metrics()
@@ -0,0 +1,93 @@
+import logging
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# 'torch': full-precision PyTorch (default)
+# 'quantized': PyTorch with dynamic int8 quantization of every Linear layer
+# 'onnx': ONNX Runtime exports (needs optimum[onnxruntime] and onnxruntime)
+INFERENCE_BACKENDS = ("torch", "quantized", "onnx")
+
+# Minimum agreement with the full-precision models before a backend is trusted
+PARITY_MIN_LABEL_AGREEMENT = 0.98
+PARITY_MIN_COSINE = 0.99
+
+def validate_backend(backend: str) -> str:
+    if backend not in INFERENCE_BACKENDS:
+        raise ValueError(f"Unknown INFERENCE_BACKEND '{backend}'. Expected one of {INFERENCE_BACKENDS}.")
+    return backend
+
+def embedding_cache_id(model_name: str, backend: str) -> str:
+    """Cache namespace for embeddings; other backends produce slightly different vectors."""
+    return model_name if backend == "torch" else f"{model_name}+{backend}"
+
+def _quantize(module):
+    import torch
+    return torch.quantization.quantize_dynamic(module, {torch.nn.Linear}, dtype=torch.qint8)
+
+def load_sentiment_pipeline(model_name: str, backend: str):
+    """A transformers text-classification pipeline running on the chosen backend."""
+    from transformers import pipeline
+    validate_backend(backend)
+
+    if backend == "torch":
+        return pipeline("sentiment-analysis", model=model_name)
+
+    if backend == "quantized":
+        from transformers import AutoModelForSequenceClassification, AutoTokenizer
+        model = _quantize(AutoModelForSequenceClassification.from_pretrained(model_name).eval())
+        return pipeline("sentiment-analysis", model=model, tokenizer=AutoTokenizer.from_pretrained(model_name))
+
+    from optimum.onnxruntime import ORTModelForSequenceClassification
+    from transformers import AutoTokenizer
+    model = ORTModelForSequenceClassification.from_pretrained(model_name, export=True)
+    return pipeline("sentiment-analysis", model=model, tokenizer=AutoTokenizer.from_pretrained(model_name))
+
+def load_embedding_model(model_name: str, backend: str):
+    """A SentenceTransformer on the chosen backend; encode() is unchanged for callers."""
+    from sentence_transformers import SentenceTransformer
+    validate_backend(backend)
+
+    if backend == "onnx":
+        # sentence-transformers >= 3.2 exports to and runs on ONNX Runtime itself
+        return SentenceTransformer(model_name, backend="onnx")
+
+    model = SentenceTransformer(model_name)
+    if backend == "quantized":
+        model = _quantize(model.eval())
+    return model
+
+def parity_report(
+    baseline_sentiments: Sequence[Dict[str, Any]],
+    candidate_sentiments: Sequence[Dict[str, Any]],
+    baseline_embeddings: np.ndarray,
+    candidate_embeddings: np.ndarray
+) -> Dict[str, Any]:
+    """
+    Compares a backend's outputs with the full-precision ones on the same texts:
+    sentiment label agreement, largest score drift and per-row embedding cosine.
+    """
+    labels: List[bool] = [
+        b["sentiment_type"] == c["sentiment_type"] for b, c in zip(baseline_sentiments, candidate_sentiments)
+    ]
+    score_drift = [
+        abs(b["sentiment_score"] - c["sentiment_score"]) for b, c in zip(baseline_sentiments, candidate_sentiments)
+    ]
+
+    a = np.asarray(baseline_embeddings, dtype=np.float32)
+    b = np.asarray(candidate_embeddings, dtype=np.float32)
+    norms = np.linalg.norm(a, axis=1) * np.linalg.norm(b, axis=1)
+    cosine = np.sum(a * b, axis=1) / np.maximum(norms, 1e-12) if len(a) else np.ones(1)
+
+    agreement = sum(labels) / len(labels) if labels else 1.0
+    report = {
+        "rows": len(labels),
+        "label_agreement": round(agreement, 4),
+        "max_score_drift": round(max(score_drift, default=0.0), 4),
+        "min_cosine": round(float(cosine.min()), 4),
+        "mean_cosine": round(float(cosine.mean()), 4)
+    }
+    report["passed"] = agreement >= PARITY_MIN_LABEL_AGREEMENT and report["min_cosine"] >= PARITY_MIN_COSINE
+    return report
@@ -0,0 +1,119 @@
+import gc
+import os
+import time
+import logging
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional
+from app.metrics import rss_bytes
+
+logger = logging.getLogger(__name__)
+
+def model_footprint(obj: Any) -> int:
+    """
+    Bytes held in parameters and buffers of the torch modules inside obj
+    (a module, a transformers pipeline or a tuple of them); 0 if there are none.
+    """
+    if isinstance(obj, (tuple, list)):
+        return sum(model_footprint(o) for o in obj)
+    module = getattr(obj, "model", obj)
+    if not hasattr(module, "parameters"):
+        return 0
+    tensors = list(module.parameters())
+    if hasattr(module, "buffers"):
+        tensors += list(module.buffers())
+    return sum(t.numel() * t.element_size() for t in tensors)
+
+class _Entry:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+        self.loaded = False
+        self.load_seconds: Optional[float] = None
+        self.footprint_bytes = 0
+        self.rss_delta_bytes = 0
+        self.loaded_in_pid: Optional[int] = None
+
+class ModelRegistry:
+    """
+    Process-wide, single-flight model store.
+
+    get(key, loader) runs loader at most once per key per process: concurrent
+    callers for the same key wait on that key's lock and receive the same
+    object, while different models load in parallel. A failed load is remembered
+    and re-raised, so a broken model is not retried on every request.
+
+    Loaded objects are treated as read-only. When the app is preloaded in a
+    parent process that then forks its workers (gunicorn --preload, see
+    gunicorn.conf.py), freeze() moves everything to the permanent GC
+    generation so the collector does not write to the pages holding the
+    weights, and workers share them copy-on-write.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[Hashable, _Entry] = {}
+
+    def _entry(self, key: Hashable) -> _Entry:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = _Entry()
+            return entry
+
+    def get(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        entry = self._entry(key)
+        if not entry.loaded:
+            with entry.lock:
+                if not entry.loaded:
+                    self._load(key, entry, loader)
+        if entry.error is not None:
+            raise entry.error
+        return entry.value
+
+    def _load(self, key: Hashable, entry: _Entry, loader: Callable[[], Any]):
+        rss_before = rss_bytes()
+        started = time.perf_counter()
+        try:
+            entry.value = loader()
+            entry.footprint_bytes = model_footprint(entry.value)
+        except Exception as e:
+            entry.error = e
+            logger.warning(f"Model {key} failed to load: {e}")
+        finally:
+            entry.load_seconds = round(time.perf_counter() - started, 3)
+            entry.rss_delta_bytes = max(0, rss_bytes() - rss_before)
+            entry.loaded_in_pid = os.getpid()
+            entry.loaded = True
+        if entry.error is None:
+            logger.info(f"Model {key} loaded in {entry.load_seconds}s ({entry.footprint_bytes / 2**20:.1f} MiB of weights)")
+
+    def freeze(self):
+        """Call in the parent after preloading, right before workers are forked."""
+        gc.collect()
+        gc.freeze()
+        logger.info(f"Froze {len(self._entries)} preloaded models for copy-on-write sharing")
+
+    def reset(self, key: Optional[Hashable] = None):
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        pid = os.getpid()
+        out = {}
+        for key, entry in list(self._entries.items()):
+            name = "/".join(str(k) for k in key) if isinstance(key, tuple) else str(key)
+            out[name] = {
+                "loaded": entry.loaded and entry.error is None,
+                "error": str(entry.error) if entry.error is not None else None,
+                "load_seconds": entry.load_seconds,
+                "footprint_mb": round(entry.footprint_bytes / 2**20, 1),
+                "rss_delta_mb": round(entry.rss_delta_bytes / 2**20, 1),
+                # Loaded by a parent process and inherited through fork
+                "shared": entry.loaded_in_pid is not None and entry.loaded_in_pid != pid
+            }
+        return out
+
+model_registry = ModelRegistry()
@@ -1,29 +1,71 @@
 from fastapi import APIRouter, HTTPException, Query
-from fastapi.responses import StreamingResponse
-from typing import List, Optional
+from fastapi.responses import StreamingResponse, Response
+from typing import Optional
 import json
 import os
 import pandas as pd
-from datetime import datetime, timedelta
+from app.dashboard_cache import AggregateCache, file_signature
+from app.engagement_index import IndexedSource, InvalidCursor
+from app.executor import executor
+from app.topics import topic_matcher
+from app.jsonl import is_jsonl, iter_records, load_latest_by_id
+from app import columnar
 
 router = APIRouter()
 
-def load_processed_data():
-    """Load processed analytics data"""
-    data_path = os.path.join(os.path.dirname(__file__), "..", "..", "sample_data", "engagements_sample.json")
+SAMPLE_DATA_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "sample_data", "engagements_sample.json")
+PROCESSED_DATA_PATH = "../data/processed/analytics_results.json"
+# Streamed pipeline output (JSON Lines) and its summary sidecar
+PROCESSED_JSONL_PATHS = [PROCESSED_DATA_PATH + "l", PROCESSED_DATA_PATH + "l.gz", PROCESSED_DATA_PATH + "l.zst"]
+PROCESSED_SUMMARY_PATH = "../data/processed/analytics_results.summary.json"
+# Columnar pipeline output; preferred because the dashboard can read single columns
+PROCESSED_PARQUET_PATH = "../data/processed/analytics_results.parquet"
+
+# The only columns the dashboard aggregates need
+DASHBOARD_COLUMNS = ['sentiment_type', 'sentiment_score', 'topic', 'status', 'date']
+DETAIL_VIEW_SIZE = 20
+
+def resolve_data_path():
+    """Processed analytics results if present, otherwise the raw sample"""
+    for path in [PROCESSED_PARQUET_PATH, PROCESSED_DATA_PATH] + PROCESSED_JSONL_PATHS:
+        if os.path.exists(path):
+            return path
+    if not os.path.exists(SAMPLE_DATA_PATH):
+        raise FileNotFoundError(f"Sample data not found at {SAMPLE_DATA_PATH}")
+    return SAMPLE_DATA_PATH
+
+def load_summary_sidecar(summary_path=None):
+    """Weekly summary written next to streamed or columnar results"""
+    summary_path = summary_path or PROCESSED_SUMMARY_PATH
+    summary = 'No summary available'
+    if os.path.exists(summary_path):
+        with open(summary_path, 'r') as f:
+            summary = json.load(f).get('weekly_summary', summary)
+    return summary
+
+def load_processed_data(data_path=None, summary_path=None):
+    """Load processed analytics data (from resolve_data_path() unless a path is given)"""
+    data_path = data_path or resolve_data_path()
+    
+    if columnar.is_parquet(data_path):
+        return {
+            'engagements': list(columnar.iter_records(data_path)),
+            'weekly_summary': load_summary_sidecar(summary_path)
+        }
+    
+    if is_jsonl(data_path):
+        return {
+            'engagements': list(load_latest_by_id(data_path).values()),
+            'weekly_summary': load_summary_sidecar(summary_path)
+        }
     
     # Check if processed data exists
-    processed_path = "../data/processed/analytics_results.json"
-    if os.path.exists(processed_path):
-        with open(processed_path, 'r') as f:
+    if os.path.abspath(data_path) != os.path.abspath(SAMPLE_DATA_PATH):
+        with open(data_path, 'r') as f:
             return json.load(f)
     
     # Otherwise load and process raw sample
-    if not os.path.exists(data_path):
-        raise FileNotFoundError(f"Sample data not found at {data_path}")
-    
-    with open(data_path, 'r') as f:
-        raw_engagements = json.load(f)
+    raw_engagements = list(iter_records(data_path))
     
     # Quick processing to add missing fields
     for eng in raw_engagements:
@@ -38,82 +80,151 @@ def load_processed_data():
                 eng['sentiment'] = {'sentiment_type': 'neutral', 'sentiment_score': 0.5}
         
         if 'topic' not in eng:
-            # Simple topic extraction
-            notes = eng.get('notes', '').lower()
-            if 'streaming' in notes:
-                eng['topic'] = {'topic': 'streaming', 'confidence': 0.8}
-            elif 'unity' in notes or 'governance' in notes:
-                eng['topic'] = {'topic': 'governance', 'confidence': 0.8}
-            elif 'performance' in notes:
-                eng['topic'] = {'topic': 'performance', 'confidence': 0.8}
-            else:
-                eng['topic'] = {'topic': 'general', 'confidence': 0.6}
+            eng['topic'] = topic_matcher.match(f"{eng.get('notes', '')} {eng.get('feedback', '')}")
     
     return {
         'engagements': raw_engagements,
         'weekly_summary': 'Analysis of customer engagements showing trends and insights.'
     }
 
-@router.get("/dashboard/data")
-async def get_dashboard_data():
-    """Get all dashboard data including engagements and analytics"""
-    try:
-        data = load_processed_data()
-        
+def build_dashboard_data(data_path=None, summary_path=None):
+    """Compute dashboard KPIs, distributions and the daily sentiment timeline"""
+    data_path = data_path or resolve_data_path()
+    
+    if columnar.is_parquet(data_path):
+        # Column projection: sentiment/topic are already flat, notes are never read
+        df = columnar.read_columns(data_path, DASHBOARD_COLUMNS)
+        engagements = list(columnar.iter_records(data_path, limit=DETAIL_VIEW_SIZE))
+        summary = load_summary_sidecar(summary_path)
+    else:
+        data = load_processed_data(data_path, summary_path)
         engagements = data['engagements']
+        summary = data.get('weekly_summary', 'No summary available')
         df = pd.DataFrame(engagements)
         
         # Flatten nested fields
         df['sentiment_type'] = df['sentiment'].apply(lambda x: x.get('sentiment_type') if isinstance(x, dict) else 'neutral')
         df['sentiment_score'] = df['sentiment'].apply(lambda x: x.get('sentiment_score') if isinstance(x, dict) else 0.5)
         df['topic'] = df['topic'].apply(lambda x: x.get('topic') if isinstance(x, dict) else 'general')
-        
-        # Calculate KPIs
-        total_engagements = len(df)
-        avg_sentiment = float(df['sentiment_score'].mean())
-        positive_count = int(len(df[df['sentiment_type'] == 'positive']))
-        at_risk_count = int(len(df[df['status'] == 'at-risk']))
-        
-        # Sentiment distribution
-        sentiment_counts = df['sentiment_type'].value_counts().to_dict()
-        
-        # Top topics
-        topic_counts = df['topic'].value_counts().head(10).to_dict()
-        
-        # Sentiment over time
-        df['date'] = pd.to_datetime(df['date'])
-        df = df.sort_values('date')
-        sentiment_by_date = df.groupby('date')['sentiment_score'].mean().reset_index()
-        sentiment_timeline = [
-            {'date': str(row['date'].date()), 'sentiment': float(row['sentiment_score'])}
-            for _, row in sentiment_by_date.iterrows()
-        ]
-        
-        return {
-            'kpis': {
-                'total_engagements': total_engagements,
-                'avg_sentiment': round(avg_sentiment, 2),
-                'positive_count': positive_count,
-                'at_risk_count': at_risk_count
-            },
-            'sentiment_distribution': sentiment_counts,
-            'top_topics': topic_counts,
-            'sentiment_timeline': sentiment_timeline,
-            'engagements': engagements[:20],  # Return subset for detail view
-            'summary': data.get('weekly_summary', 'No summary available')
-        }
+    
+    # Calculate KPIs
+    total_engagements = len(df)
+    avg_sentiment = float(df['sentiment_score'].mean())
+    positive_count = int(len(df[df['sentiment_type'] == 'positive']))
+    at_risk_count = int(len(df[df['status'] == 'at-risk']))
+    
+    # Sentiment distribution
+    sentiment_counts = df['sentiment_type'].value_counts().to_dict()
+    
+    # Top topics
+    topic_counts = df['topic'].value_counts().head(10).to_dict()
+    
+    # Sentiment over time
+    df['date'] = pd.to_datetime(df['date'])
+    df = df.sort_values('date')
+    sentiment_by_date = df.groupby('date')['sentiment_score'].mean().reset_index()
+    sentiment_timeline = [
+        {'date': str(row['date'].date()), 'sentiment': float(row['sentiment_score'])}
+        for _, row in sentiment_by_date.iterrows()
+    ]
+    
+    return {
+        'kpis': {
+            'total_engagements': total_engagements,
+            'avg_sentiment': round(avg_sentiment, 2),
+            'positive_count': positive_count,
+            'at_risk_count': at_risk_count
+        },
+        'sentiment_distribution': sentiment_counts,
+        'top_topics': topic_counts,
+        'sentiment_timeline': sentiment_timeline,
+        'engagements': engagements[:DETAIL_VIEW_SIZE],  # Return subset for detail view
+        'summary': summary
+    }
+
+def dashboard_signature():
+    return file_signature(resolve_data_path())
+
+def _serialize_dashboard_data(data_path, summary_path):
+    return json.dumps(build_dashboard_data(data_path, summary_path)).encode("utf-8")
+
+def _build_dashboard_payload():
+    # Called from an I/O thread by the cache; the pandas work runs in the CPU pool.
+    # Paths are resolved here and passed along: spawned workers import this
+    # module fresh and would not see paths overridden at runtime.
+    return executor.call_cpu(_serialize_dashboard_data, resolve_data_path(), PROCESSED_SUMMARY_PATH)
+
+dashboard_cache = AggregateCache(build=_build_dashboard_payload, signature=dashboard_signature)
+
+@router.get("/dashboard/data")
+async def get_dashboard_data():
+    """Get all dashboard data including engagements and analytics"""
+    try:
+        payload, meta = await executor.run_io(dashboard_cache.get)
+        return Response(
+            content=payload,
+            media_type="application/json",
+            headers={
+                "X-Cache": meta["status"],
+                "X-Cache-Age": f"{meta['age_seconds']:.3f}",
+                "X-Cache-Hits": str(meta["hits"])
+            }
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+engagement_source = IndexedSource(
+    load=lambda: load_processed_data()['engagements'],
+    signature=dashboard_signature
+)
+
+def _recent_page(**query):
+    return engagement_source.current().page(**query)
+
+def _legacy_page(**query):
+    return engagement_source.current().slice(**query)
+
 @router.get("/engagements/recent")
-async def get_recent_engagements(page: int = 1, page_size: int = 20):
-    """Get recent engagements with pagination"""
+async def get_recent_engagements(
+    response: Response,
+    page_size: int = Query(20, ge=1, le=500),
+    cursor: Optional[str] = None,
+    customer: Optional[str] = None,
+    status: Optional[str] = None,
+    topic: Optional[str] = None,
+    date_from: Optional[str] = Query(None, description="YYYY-MM-DD, inclusive"),
+    date_to: Optional[str] = Query(None, description="YYYY-MM-DD, inclusive"),
+    order: Optional[str] = Query(None, pattern="^(asc|desc)$", description="desc by default; file order for page= requests"),
+    page: Optional[int] = Query(None, ge=1, description="Page number; prefer the cursor from X-Next-Cursor")
+):
+    """Get engagements newest first (file order for page= requests), optionally filtered, with keyset pagination"""
+    filters = {'customer': customer, 'status': status, 'topic': topic}
     try:
-        data = load_processed_data()
-        engagements = data['engagements']
-        start = (page - 1) * page_size
-        end = start + page_size
-        return engagements[start:end]
+        if page and not cursor and order is None:
+            # Legacy page-number clients got records in file order; keep that for them
+            engagements, next_cursor = await executor.run_io(
+                _legacy_page,
+                offset=(page - 1) * page_size,
+                limit=page_size,
+                filters=filters,
+                date_from=date_from,
+                date_to=date_to
+            )
+        else:
+            engagements, next_cursor = await executor.run_io(
+                _recent_page,
+                limit=page_size,
+                cursor=cursor,
+                filters=filters,
+                date_from=date_from,
+                date_to=date_to,
+                descending=order != "asc",
+                offset=(page - 1) * page_size if page and not cursor else 0
+            )
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
-
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return engagements
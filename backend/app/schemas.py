@@ -38,6 +38,8 @@ class AnalysisReport(BaseModel):
     tuning_params: List[str]
     plotly_data: Dict[str, Any] # Map of plot_id -> figure dict
     notebook_markdown: str
+    # Seconds per stage (prepare, dedup, sentiment, topics, embeddings, clustering, summary, plots, total)
+    timings: Dict[str, float] = {}
 
 class NotebookCommitRequest(BaseModel):
     notebook_path: str
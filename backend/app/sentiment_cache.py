@@ -0,0 +1,7 @@
+from app.config import settings
+from shared.sentiment_cache import SentimentCache, make_key, normalize_text
+
+sentiment_cache = SentimentCache(
+    path=settings.SENTIMENT_CACHE_PATH or None,
+    max_memory_entries=settings.SENTIMENT_CACHE_MAX_MEMORY_ENTRIES
+)
@@ -0,0 +1,28 @@
+import re
+from typing import List, Tuple
+import numpy as np
+import pandas as pd
+from shared.topics import DEFAULT_TOPIC, TOPIC_KEYWORDS, KeywordAutomaton, TopicMatcher as _KeywordTopicMatcher
+
+class TopicMatcher(_KeywordTopicMatcher):
+    """The shared keyword matcher plus a vectorized path for DataFrame columns."""
+    def __init__(self, topic_keywords: List[Tuple[str, List[str]]] = TOPIC_KEYWORDS, default: str = DEFAULT_TOPIC):
+        super().__init__(topic_keywords, default)
+        # One alternation per topic for the vectorized path; substring semantics as in the automaton
+        self._patterns = [
+            "|".join(re.escape(k.lower()) for k in sorted(keywords, key=len, reverse=True) if k)
+            for _, keywords in topic_keywords
+        ]
+
+    def assign(self, texts: pd.Series) -> pd.Series:
+        """
+        Topic per text for a whole column: one vectorized regex scan per topic,
+        then np.select picks the highest-priority hit. Same topics as match().
+        """
+        lowered = texts.fillna("").astype(str).str.lower()
+        masks = [lowered.str.contains(pattern, regex=True).to_numpy(dtype=bool) for pattern in self._patterns]
+        if not masks:
+            return pd.Series(self.default, index=texts.index)
+        return pd.Series(np.select(masks, self.priority, default=self.default), index=texts.index)
+
+topic_matcher = TopicMatcher(TOPIC_KEYWORDS)
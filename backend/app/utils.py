@@ -29,16 +29,23 @@ COMMON_LAYOUT = dict(
     showlegend=True
 )
 
-def plot_top_topics(df: pd.DataFrame) -> Dict[str, Any]:
-    if df.empty:
-        return {}
-        
+def topic_stats(df: pd.DataFrame) -> pd.DataFrame:
+    """Per-topic engagement count and average sentiment, most frequent first"""
     topic_counts = df['topic'].value_counts().reset_index()
     topic_counts.columns = ['Topic', 'Count']
     
     # Calculate average sentiment per topic
     topic_sentiment = df.groupby('topic')['sentiment_score'].mean().reset_index()
-    topic_counts = topic_counts.merge(topic_sentiment, left_on='Topic', right_on='topic')
+    return topic_counts.merge(topic_sentiment, left_on='Topic', right_on='topic')
+
+def plot_top_topics(df: pd.DataFrame) -> Dict[str, Any]:
+    if df.empty:
+        return {}
+    return plot_top_topics_from_stats(topic_stats(df))
+
+def plot_top_topics_from_stats(topic_counts: pd.DataFrame) -> Dict[str, Any]:
+    if topic_counts.empty:
+        return {}
     
     fig = px.bar(
         topic_counts,
@@ -62,15 +69,17 @@ def plot_top_topics(df: pd.DataFrame) -> Dict[str, Any]:
 def plot_skills_gap(df: pd.DataFrame) -> Dict[str, Any]:
     if df.empty:
         return {}
+    return plot_skills_gap_from_counts(df['topic'].value_counts(sort=False).to_dict())
+
+def plot_skills_gap_from_counts(topic_demand: Dict[str, int]) -> Dict[str, Any]:
+    if not topic_demand:
+        return {}
         
     # Mock demand vs capacity logic for demo
     # In reality, this would come from a skills database
     
-    tech_stack = df['topic'].unique()
-    
     data = []
-    for tech in tech_stack:
-        demand = len(df[df['topic'] == tech])
+    for tech, demand in topic_demand.items():
         # Mock capacity: random but consistent for same tech
         capacity = max(1, demand + (hash(tech) % 5 - 2)) 
         gap = demand - capacity
@@ -117,6 +126,12 @@ def plot_sentiment_time_series(df: pd.DataFrame) -> Dict[str, Any]:
         
     df['date'] = pd.to_datetime(df['date'])
     daily_sentiment = df.groupby('date')['sentiment_score'].mean().reset_index()
+    return plot_sentiment_series(daily_sentiment)
+
+def plot_sentiment_series(daily_sentiment: pd.DataFrame) -> Dict[str, Any]:
+    """Line chart from a frame of per-date mean sentiment ('date', 'sentiment_score')"""
+    if daily_sentiment.empty:
+        return {}
     
     fig = px.line(
         daily_sentiment,
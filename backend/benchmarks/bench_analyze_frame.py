@@ -0,0 +1,86 @@
+"""
+Microbenchmark for the DataFrame stages of InferenceEngine.analyze_engagements.
+
+Builds N engagements from the sample data and times the per-frame work that
+does not depend on model weights: text construction, dedup grouping, topic
+assignment and cluster sizes. Each stage is run vectorized (the engine's code path) and
+row by row (the iterrows/boolean-mask form it replaced) for comparison.
+Exits non-zero if the vectorized stages together exceed --budget-s.
+
+    cd backend
+    python -m benchmarks.bench_analyze_frame --rows 100000
+"""
+import argparse
+import json
+import sys
+import time
+import numpy as np
+from app.config import settings
+from app.inference import InferenceEngine
+from app.jsonl import iter_records
+from app.topics import topic_matcher
+
+def _engagements(rows: int) -> list:
+    sample = list(iter_records(settings.SAMPLE_DATA_PATH))
+    return [dict(sample[i % len(sample)], id=str(i)) for i in range(rows)]
+
+def _timed(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def run(rows: int, repeat: int, rowwise: bool) -> dict:
+    engine = InferenceEngine()
+    engagements = _engagements(rows)
+    df = engine._prepare_frame(engagements)
+    df['cluster'] = np.random.default_rng(0).integers(0, 5, size=len(df))
+
+    vectorized = {
+        "prepare_frame_s": _timed(lambda: engine._prepare_frame(engagements), repeat),
+        "dedup_s": _timed(lambda: engine._dedup(df), repeat),
+        "assign_topics_s": _timed(lambda: engine._assign_topics(df), repeat),
+        "cluster_sizes_s": _timed(lambda: df['cluster'].value_counts(sort=False), repeat)
+    }
+    result = {
+        "rows": rows,
+        "vectorized": {k: round(v, 4) for k, v in vectorized.items()},
+        "vectorized_total_s": round(sum(vectorized.values()), 4),
+        "dedup": engine._dedup(df).stats()
+    }
+
+    if rowwise:
+        def texts_rowwise():
+            return [f"{row.get('notes', '')} {row.get('feedback', '')}" for _, row in df.iterrows()]
+
+        def topics_rowwise():
+            return [topic_matcher.match(f"{row.get('notes', '')} {row.get('feedback', '')}")['topic'] for _, row in df.iterrows()]
+
+        def clusters_rowwise():
+            return [len(df[df['cluster'] == c]) for c in df['cluster'].unique()]
+
+        result["rowwise"] = {
+            "texts_s": round(_timed(texts_rowwise, 1), 4),
+            "assign_topics_s": round(_timed(topics_rowwise, 1), 4),
+            "cluster_sizes_s": round(_timed(clusters_rowwise, 1), 4)
+        }
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=3, help="Best of N for the vectorized stages")
+    parser.add_argument("--budget-s", type=float, default=2.0, help="Fail above this vectorized total")
+    parser.add_argument("--skip-rowwise", action="store_true", help="Skip the slow row-by-row reference")
+    args = parser.parse_args()
+
+    result = run(args.rows, args.repeat, rowwise=not args.skip_rowwise)
+    print(json.dumps(result, indent=2))
+    if result["vectorized_total_s"] > args.budget_s:
+        print(f"Vectorized stages took {result['vectorized_total_s']}s, over the {args.budget_s}s budget", file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Concurrency benchmark for the dashboard API.
+
+Fires requests from N parallel clients and reports latency percentiles.
+By default the app runs in-process through httpx's ASGI transport, which
+shares one event loop with the clients, so any handler that blocks the loop
+shows up directly in p99. Pass --url to benchmark a running uvicorn server.
+
+    cd backend
+    python -m benchmarks.bench_concurrency --clients 100 --requests 20
+    python -m benchmarks.bench_concurrency --url http://localhost:8000
+"""
+import argparse
+import asyncio
+import json
+import time
+import numpy as np
+import httpx
+
+ENDPOINTS = ["/api/dashboard/data", "/api/engagements/recent?page=1&page_size=20"]
+
+async def _client(client: httpx.AsyncClient, n_requests: int, latencies: list, errors: list):
+    for i in range(n_requests):
+        path = ENDPOINTS[i % len(ENDPOINTS)]
+        start = time.perf_counter()
+        try:
+            resp = await client.get(path)
+            resp.raise_for_status()
+        except Exception as e:
+            errors.append(str(e))
+            continue
+        latencies.append((time.perf_counter() - start) * 1000)
+
+async def run(clients: int, n_requests: int, url: str = None) -> dict:
+    if url:
+        transport = None
+        base_url = url
+    else:
+        from app.main import app
+        transport = httpx.ASGITransport(app=app)
+        base_url = "http://bench"
+
+    latencies: list = []
+    errors: list = []
+    limits = httpx.Limits(max_connections=clients)
+    async with httpx.AsyncClient(transport=transport, base_url=base_url, limits=limits, timeout=60) as client:
+        # Warm caches and pools so the run measures steady state
+        for path in ENDPOINTS:
+            await client.get(path)
+
+        start = time.perf_counter()
+        await asyncio.gather(*[_client(client, n_requests, latencies, errors) for _ in range(clients)])
+        elapsed = time.perf_counter() - start
+
+    lat = np.array(latencies) if latencies else np.zeros(1)
+    return {
+        "clients": clients,
+        "requests": len(latencies),
+        "errors": len(errors),
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(float(np.percentile(lat, 50)), 2),
+        "p95_ms": round(float(np.percentile(lat, 95)), 2),
+        "p99_ms": round(float(np.percentile(lat, 99)), 2),
+        "max_ms": round(float(lat.max()), 2)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=100, help="Parallel clients")
+    parser.add_argument("--requests", type=int, default=20, help="Requests per client")
+    parser.add_argument("--url", default=None, help="Base URL of a running server (default: in-process)")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args.clients, args.requests, args.url))
+    print(json.dumps(result, indent=2))
+
+if __name__ == "__main__":
+    main()
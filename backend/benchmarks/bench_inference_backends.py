@@ -0,0 +1,122 @@
+"""
+Latency, memory and accuracy parity of the local inference backends.
+
+Each backend (see INFERENCE_BACKEND) runs in its own spawned process so peak
+RSS is measured in isolation. The sentiment pipeline and embedding model score
+the same texts from the sample data; every backend's outputs are then compared
+with the full-precision 'torch' run (label agreement, score drift, embedding
+cosine). Exits non-zero when a backend misses the parity thresholds.
+
+    cd backend
+    python -m benchmarks.bench_inference_backends --rows 500
+    python -m benchmarks.bench_inference_backends --backends torch,onnx --batch-size 64
+"""
+import argparse
+import json
+import multiprocessing
+import resource
+import sys
+import time
+import numpy as np
+from app.config import settings
+from app.jsonl import iter_records
+from app.model_backends import INFERENCE_BACKENDS, load_embedding_model, load_sentiment_pipeline, parity_report
+from app.inference import EMBEDDING_MODEL_NAME, SENTIMENT_MODEL_NAME
+
+def _texts(rows: int) -> list:
+    records = list(iter_records(settings.SAMPLE_DATA_PATH))
+    texts = [f"{r.get('notes', '')} {r.get('feedback', '')}" for r in records]
+    return [texts[i % len(texts)] for i in range(rows)]
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is in KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def _percentiles(latencies: list) -> dict:
+    lat = np.array(latencies) * 1000
+    return {
+        "p50_ms": round(float(np.percentile(lat, 50)), 2),
+        "p95_ms": round(float(np.percentile(lat, 95)), 2),
+        "p99_ms": round(float(np.percentile(lat, 99)), 2)
+    }
+
+def _run_backend(backend: str, texts: list, batch_size: int, queue):
+    try:
+        rss_start = _peak_rss_mb()
+        start = time.perf_counter()
+        sentiment = load_sentiment_pipeline(SENTIMENT_MODEL_NAME, backend)
+        embedder = load_embedding_model(EMBEDDING_MODEL_NAME, backend)
+        load_s = time.perf_counter() - start
+
+        sentiments, sentiment_lat = [], []
+        embeddings, embedding_lat = [], []
+        for i in range(0, len(texts), batch_size):
+            batch = texts[i:i + batch_size]
+            t = time.perf_counter()
+            outputs = sentiment(batch, batch_size=batch_size, padding=True, truncation=True)
+            sentiment_lat.append(time.perf_counter() - t)
+            sentiments.extend(
+                {"sentiment_type": o["label"].lower(), "sentiment_score": o["score"] if o["label"] == "POSITIVE" else -o["score"]}
+                for o in outputs
+            )
+
+            t = time.perf_counter()
+            embeddings.append(np.asarray(embedder.encode(batch, batch_size=batch_size), dtype=np.float32))
+            embedding_lat.append(time.perf_counter() - t)
+
+        queue.put({
+            "backend": backend,
+            "load_s": round(load_s, 2),
+            "peak_rss_mb": round(_peak_rss_mb(), 1),
+            "rss_growth_mb": round(_peak_rss_mb() - rss_start, 1),
+            "sentiment": _percentiles(sentiment_lat),
+            "embedding": _percentiles(embedding_lat),
+            "rows_per_s": round(len(texts) / (sum(sentiment_lat) + sum(embedding_lat)), 1),
+            "_sentiments": sentiments,
+            "_embeddings": np.concatenate(embeddings).tolist()
+        })
+    except Exception as e:
+        queue.put({"backend": backend, "error": f"{type(e).__name__}: {e}"})
+
+def run(backends: list, rows: int, batch_size: int) -> list:
+    texts = _texts(rows)
+    ctx = multiprocessing.get_context("spawn")
+    results = []
+    for backend in backends:
+        queue = ctx.Queue()
+        proc = ctx.Process(target=_run_backend, args=(backend, texts, batch_size, queue))
+        proc.start()
+        results.append(queue.get())
+        proc.join()
+
+    reference = None
+    for result in results:
+        if "error" in result:
+            continue
+        outputs = (result.pop("_sentiments"), np.array(result.pop("_embeddings"), dtype=np.float32))
+        if result["backend"] == "torch":
+            reference = outputs
+        elif reference is not None:
+            result["parity"] = parity_report(reference[0], outputs[0], reference[1], outputs[1])
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", default=",".join(INFERENCE_BACKENDS), help="Comma-separated; 'torch' is the parity reference")
+    parser.add_argument("--rows", type=int, default=256, help="Texts to score (sample data is repeated)")
+    parser.add_argument("--batch-size", type=int, default=settings.SENTIMENT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    backends = [b.strip() for b in args.backends.split(",") if b.strip()]
+    if "torch" in backends:
+        # The reference runs first so every candidate is compared against it
+        backends.remove("torch")
+        backends.insert(0, "torch")
+
+    results = run(backends, args.rows, args.batch_size)
+    print(json.dumps(results, indent=2))
+    if any(not r.get("parity", {"passed": True})["passed"] for r in results):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
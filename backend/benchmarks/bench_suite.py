@@ -0,0 +1,355 @@
+"""
+End-to-end benchmark suite: pipeline, inference stages and API endpoints
+across dataset sizes, compared against a saved baseline.
+
+For every --sizes N a seeded dataset is generated with the pipeline's data
+generator (app/utils/data_generator.py) and three parts are measured:
+
+  pipeline  app.main_pipeline end to end, as a subprocess of the repo root:
+            wall time, records/s and the subprocess's peak RSS
+  engine    InferenceEngine.analyze_engagements: the per-stage timings of
+            its report (prepare, dedup, sentiment, topics, embeddings,
+            clustering, summary, plots), then a second call on warm caches
+  api       /api/dashboard/data and /api/engagements/recent served from the
+            pipeline's Parquet output: cold first request, then p50/p95/p99
+            and throughput of --requests requests from --clients clients
+
+The engine and API parts of each size run in a fresh forked process (the
+parent never imports the app) with empty sentiment and embedding caches, so
+peak RSS and timings are per size and repeatable. Results are written as
+JSON; with a baseline present, every timing, throughput and memory figure is
+compared and the run exits non-zero on a regression beyond --tolerance.
+
+    cd backend
+    python -m benchmarks.bench_suite --sizes 1000 10000 --save-baseline
+    python -m benchmarks.bench_suite --sizes 1000 10000
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import platform
+import queue as queue_module
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Dict, List
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO_ROOT = os.path.dirname(BACKEND_DIR)
+RESULTS_PATH = os.path.join(BACKEND_DIR, "benchmarks", "results", "latest.json")
+BASELINE_PATH = os.path.join(BACKEND_DIR, "benchmarks", "baseline.json")
+
+ENDPOINTS = {
+    "dashboard_data": "/api/dashboard/data",
+    "engagements_recent": "/api/engagements/recent?page_size=20"
+}
+
+# Metric direction by suffix, and the smallest change worth reporting, so
+# sub-millisecond jitter on tiny datasets is not flagged as a regression
+LOWER_IS_BETTER = {"_s": 0.005, "_ms": 5.0, "_mb": 16.0}
+HIGHER_IS_BETTER = ("_per_s", "_rps")
+
+def _percentiles(latencies: List[float]) -> Dict[str, float]:
+    lat = np.array(latencies) * 1000 if latencies else np.zeros(1)
+    return {
+        "p50_ms": round(float(np.percentile(lat, 50)), 2),
+        "p95_ms": round(float(np.percentile(lat, 95)), 2),
+        "p99_ms": round(float(np.percentile(lat, 99)), 2)
+    }
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is in KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def _run_measured(cmd: List[str], log_path: str) -> Dict[str, float]:
+    """Runs cmd in the repo root; wall time and that process's own peak RSS (wait4)."""
+    with open(log_path, "w") as log:
+        start = time.perf_counter()
+        proc = subprocess.Popen(cmd, cwd=REPO_ROOT, stdout=log, stderr=subprocess.STDOUT)
+        _, status, usage = os.wait4(proc.pid, 0)
+        elapsed = time.perf_counter() - start
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    if proc.returncode != 0:
+        raise RuntimeError(f"{' '.join(cmd)} exited with {proc.returncode}; see {log_path}")
+    return {"elapsed_s": elapsed, "peak_rss_mb": usage.ru_maxrss / 1024}
+
+def generate_dataset(size: int, seed: int, workdir: str) -> str:
+    path = os.path.join(workdir, f"engagements_{size}.jsonl")
+    _run_measured(
+        [sys.executable, "-m", "app.utils.data_generator", "--count", str(size), "--seed", str(seed),
+         "--start-date", "2024-01-01", "--end-date", "2024-06-30", "--output", path],
+        os.path.join(workdir, f"generate_{size}.log")
+    )
+    return path
+
+def bench_pipeline(size: int, raw_path: str, workdir: str, workers: int) -> Dict:
+    output = os.path.join(workdir, f"results_{size}.parquet")
+    measured = _run_measured(
+        [sys.executable, "-m", "app.main_pipeline", "--input", raw_path, "--output", output,
+         "--full", "--workers", str(workers), "--sentiment-cache", ""],
+        os.path.join(workdir, f"pipeline_{size}.log")
+    )
+    return {
+        "elapsed_s": round(measured["elapsed_s"], 3),
+        "records_per_s": round(size / measured["elapsed_s"], 1),
+        "peak_rss_mb": round(measured["peak_rss_mb"], 1),
+        "_output": output
+    }
+
+def _timed(timings: Dict[str, float], name: str, fn):
+    start = time.perf_counter()
+    result = fn()
+    timings[f"{name}_s"] = round(time.perf_counter() - start, 4)
+    return result
+
+def bench_engine(engagements: List[Dict]) -> Dict:
+    """Stage timings come from AnalysisReport.timings; a second call measures the warm caches."""
+    from app.inference import InferenceEngine
+
+    engine = InferenceEngine()
+    load: Dict[str, float] = {}
+    _timed(load, "load_models", engine.load_models)
+
+    cold = engine.analyze_engagements(engagements)
+    warm: Dict[str, float] = {}
+    _timed(warm, "analyze_warm", lambda: engine.analyze_engagements(engagements))
+    return {
+        "stages": {**load, **{f"{stage}_s": seconds for stage, seconds in cold.timings.items()}},
+        **warm,
+        "rows_per_s": round(len(engagements) / max(cold.timings["total"], 1e-9), 1),
+        "dedup": engine.last_dedup,
+        "models": {name: status["state"] for name, status in engine.model_status.items()}
+    }
+
+async def _bench_endpoint(client, path: str, clients: int, n_requests: int) -> Dict:
+    start = time.perf_counter()
+    resp = await client.get(path)
+    resp.raise_for_status()
+    cold_ms = (time.perf_counter() - start) * 1000
+
+    latencies: List[float] = []
+
+    async def worker(count: int):
+        for _ in range(count):
+            t = time.perf_counter()
+            r = await client.get(path)
+            r.raise_for_status()
+            latencies.append(time.perf_counter() - t)
+
+    per_client = [n_requests // clients + (1 if i < n_requests % clients else 0) for i in range(clients)]
+    start = time.perf_counter()
+    await asyncio.gather(*[worker(n) for n in per_client if n])
+    elapsed = time.perf_counter() - start
+    return {
+        "cold_ms": round(cold_ms, 2),
+        **_percentiles(latencies),
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0
+    }
+
+def bench_api(results_path: str, workdir: str, clients: int, n_requests: int) -> Dict:
+    """Serves the pipeline output in-process through httpx's ASGI transport."""
+    import logging
+    import httpx
+    from app.executor import executor
+    from app.main import app
+    from app.routes import analyze
+
+    missing = os.path.join(workdir, "missing")
+    analyze.PROCESSED_PARQUET_PATH = results_path
+    analyze.PROCESSED_SUMMARY_PATH = results_path.replace(".parquet", ".summary.json")
+    analyze.PROCESSED_DATA_PATH = missing
+    analyze.PROCESSED_JSONL_PATHS = [missing]
+    # One INFO line per request would dominate the output
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        limits = httpx.Limits(max_connections=clients)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", limits=limits, timeout=300) as client:
+            return {name: await _bench_endpoint(client, path, clients, n_requests) for name, path in ENDPOINTS.items()}
+
+    try:
+        return asyncio.run(run())
+    finally:
+        # The CPU pool's workers must exit before this process can
+        executor.shutdown()
+
+def _run_in_process(size: int, raw_path: str, results_path: str, workdir: str, args: Dict, queue):
+    try:
+        from app.jsonl import iter_records
+        engagements = list(iter_records(raw_path))[:args["engine_max_rows"]]
+        result = {"engine": bench_engine(engagements)}
+        result["engine"]["rows"] = len(engagements)
+        if results_path:
+            result["api"] = bench_api(results_path, workdir, args["clients"], args["requests"])
+        result["peak_rss_mb"] = round(_peak_rss_mb(), 1)
+        queue.put(result)
+    except Exception as e:
+        queue.put({"error": f"{type(e).__name__}: {e}"})
+
+def _wait_for_child(proc, queue, size: int, timeout: float) -> Dict:
+    """
+    The child's result, polling so that a child that dies without reporting
+    (killed, crashed in native code) or runs past timeout seconds fails the
+    run instead of blocking it forever.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            child = queue.get(timeout=min(1.0, max(deadline - time.monotonic(), 0.1)))
+            break
+        except queue_module.Empty:
+            if not proc.is_alive():
+                raise RuntimeError(f"size {size}: benchmark process exited with code {proc.exitcode} without a result")
+            if time.monotonic() >= deadline:
+                proc.terminate()
+                proc.join(5)
+                raise RuntimeError(f"size {size}: benchmark process did not finish within {timeout:.0f}s")
+
+    # The result is in; a child stuck on exit (e.g. a pool that will not shut down) is not waited for
+    proc.join(30)
+    if proc.is_alive():
+        proc.terminate()
+        proc.join(5)
+    elif proc.exitcode:
+        print(f"Warning: size {size} benchmark process exited with code {proc.exitcode}", file=sys.stderr)
+    return child
+
+def bench_size(size: int, args: argparse.Namespace, workdir: str) -> Dict:
+    raw_path = generate_dataset(size, args.seed, workdir)
+    result: Dict = {}
+    results_path = None
+    if "pipeline" in args.parts or "api" in args.parts:
+        pipeline = bench_pipeline(size, raw_path, workdir, args.workers)
+        results_path = pipeline.pop("_output")
+        if "pipeline" in args.parts:
+            result["pipeline"] = pipeline
+
+    if "engine" in args.parts or "api" in args.parts:
+        # Fresh caches per size: the child imports app.config after these are set.
+        # The API's CPU pool spawns its own workers; the patched data paths
+        # reach them as arguments (see _build_dashboard_payload)
+        os.environ["SENTIMENT_CACHE_PATH"] = ""
+        os.environ["EMBEDDING_CACHE_DIR"] = os.path.join(workdir, f"embeddings_{size}")
+        ctx = multiprocessing.get_context("fork")
+        queue = ctx.Queue()
+        child_args = {"engine_max_rows": args.engine_max_rows, "clients": args.clients, "requests": args.requests}
+        proc = ctx.Process(
+            target=_run_in_process,
+            args=(size, raw_path, results_path if "api" in args.parts else None, workdir, child_args, queue)
+        )
+        proc.start()
+        child = _wait_for_child(proc, queue, size, args.timeout)
+        if "error" in child:
+            raise RuntimeError(f"size {size}: {child['error']}")
+        if "engine" in args.parts:
+            result["engine"] = {**child["engine"], "process_peak_rss_mb": child["peak_rss_mb"]}
+        if "api" in args.parts:
+            result["api"] = {**child["api"], "process_peak_rss_mb": child["peak_rss_mb"]}
+    return result
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return ""
+
+def run(args: argparse.Namespace) -> Dict:
+    results = {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+            "seed": args.seed,
+            "parts": args.parts,
+            "workers": args.workers
+        },
+        "sizes": {}
+    }
+    with tempfile.TemporaryDirectory(prefix="bench_suite_") as workdir:
+        for size in args.sizes:
+            print(f"Benchmarking {size} engagements...", file=sys.stderr)
+            results["sizes"][str(size)] = bench_size(size, args, workdir)
+    return results
+
+def flatten(tree: Dict, prefix: str = "") -> Dict[str, float]:
+    """Numeric leaves keyed by dotted path, e.g. sizes.1000.api.dashboard_data.p95_ms."""
+    out = {}
+    for key, value in tree.items():
+        path = f"{prefix}.{key}" if prefix else str(key)
+        if isinstance(value, dict):
+            out.update(flatten(value, path))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            out[path] = float(value)
+    return out
+
+def compare(current: Dict, baseline: Dict, tolerance: float) -> List[Dict]:
+    """Metrics that got worse than the baseline by more than tolerance (a fraction)."""
+    now, before = flatten(current.get("sizes", {}), "sizes"), flatten(baseline.get("sizes", {}), "sizes")
+    regressions = []
+    for path, value in now.items():
+        old = before.get(path)
+        if old is None:
+            continue
+        name = path.rsplit(".", 1)[-1]
+        if name.endswith(HIGHER_IS_BETTER):
+            worse = old > 0 and value < old / (1 + tolerance)
+        else:
+            floor = next((d for suffix, d in LOWER_IS_BETTER.items() if name.endswith(suffix)), None)
+            worse = floor is not None and value > old * (1 + tolerance) and value - old > floor
+        if worse:
+            regressions.append({"metric": path, "baseline": old, "current": value, "change": round(value / old - 1, 3) if old else None})
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000], help="Dataset sizes (engagements)")
+    parser.add_argument("--parts", nargs="+", choices=["pipeline", "engine", "api"], default=["pipeline", "engine", "api"])
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--workers", type=int, default=1, help="Pipeline scoring processes")
+    parser.add_argument("--engine-max-rows", type=int, default=50000, help="Cap on rows passed to analyze_engagements")
+    parser.add_argument("--clients", type=int, default=10, help="Concurrent API clients")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per endpoint after the cold one")
+    parser.add_argument("--output", default=RESULTS_PATH, help="Where to write this run's results")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Results to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the new baseline instead of comparing")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown before a metric counts as a regression")
+    parser.add_argument("--timeout", type=float, default=3600, help="Seconds allowed for the engine and API parts of one size")
+    args = parser.parse_args()
+
+    results = run(args)
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(json.dumps(results, indent=2))
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Saved baseline to {args.baseline}", file=sys.stderr)
+        return
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one", file=sys.stderr)
+        return
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline.get("meta", {}).get("cpus") != results["meta"]["cpus"]:
+        print("Warning: the baseline was recorded on a machine with a different CPU count", file=sys.stderr)
+    regressions = compare(results, baseline, args.tolerance)
+    for r in regressions:
+        print(f"REGRESSION {r['metric']}: {r['baseline']} -> {r['current']} ({r['change']:+.0%})", file=sys.stderr)
+    if regressions:
+        sys.exit(1)
+    print(f"No regressions against {args.baseline} (tolerance {args.tolerance:.0%})", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+"""
+Multi-worker serving with models shared between workers.
+
+    cd backend
+    gunicorn app.main:app -c gunicorn.conf.py
+
+The app is imported once in the master process (preload_app), which loads
+every model through the registry and freezes the GC before forking, so the
+workers inherit the weights copy-on-write instead of each loading a copy.
+/health shows "shared": true for models a worker inherited this way.
+"""
+import os
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+
+def when_ready(server):
+    # Runs in the master after the app is imported and before workers fork
+    from app.inference import engine
+    from app.model_registry import model_registry
+
+    engine.load_models()
+    model_registry.freeze()
@@ -0,0 +1,9 @@
+"""
+Code shared by the API and the root pipeline.
+
+The API imports it as `shared` (run from backend/); the pipeline, run from the
+repository root, as `backend.shared`. Keep it standard-library only, apart
+from optional imports guarded with try/except (zstandard for .zst files,
+pyarrow for Parquet), and use relative imports inside the package so both
+import paths work.
+"""
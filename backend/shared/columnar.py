@@ -0,0 +1,148 @@
+import os
+from typing import Dict, Iterable, Iterator, List, Optional
+
+# Optional: Parquet needs pyarrow; JSON/JSON Lines work without it
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+PARQUET_SUFFIX = ".parquet"
+ROW_GROUP_SIZE = 50000
+
+# Nested sentiment/topic results are stored as flat columns so readers can
+# project just what they need (e.g. sentiment_score) without parsing records;
+# nested dicts are rebuilt only for endpoints that return whole records
+FLAT_COLUMNS = [
+    ("id", "string"),
+    ("customer", "string"),
+    ("date", "string"),
+    ("status", "string"),
+    ("notes", "string"),
+    ("feedback", "string"),
+    ("technologies", "list"),
+    ("sentiment_type", "string"),
+    ("sentiment_score", "float"),
+    ("topic", "string"),
+    ("topic_confidence", "float"),
+]
+
+def is_parquet(path: str) -> bool:
+    return str(path).endswith(PARQUET_SUFFIX)
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError("pyarrow is required for Parquet files: pip install pyarrow")
+
+def flat_schema():
+    _require_pyarrow()
+    types = {"string": pa.string(), "float": pa.float64(), "list": pa.list_(pa.string())}
+    return pa.schema([(name, types[kind]) for name, kind in FLAT_COLUMNS])
+
+def flatten_record(record: Dict) -> Dict:
+    """Maps an enriched engagement onto the flat column layout."""
+    sentiment = record.get("sentiment") or {}
+    topic = record.get("topic") or {}
+    return {
+        "id": str(record.get("id")),
+        "customer": record.get("customer"),
+        "date": record.get("date"),
+        "status": record.get("status"),
+        "notes": record.get("notes"),
+        "feedback": record.get("feedback"),
+        "technologies": list(record.get("technologies") or []),
+        "sentiment_type": sentiment.get("sentiment_type", "neutral"),
+        "sentiment_score": sentiment.get("sentiment_score"),
+        "topic": topic.get("topic", "general"),
+        "topic_confidence": topic.get("confidence"),
+    }
+
+def nest_record(row: Dict) -> Dict:
+    """Rebuilds the pipeline's nested record shape from a flat row."""
+    record = dict(row)
+    record["sentiment"] = {
+        "sentiment_type": record.pop("sentiment_type", "neutral"),
+        "sentiment_score": record.pop("sentiment_score", None)
+    }
+    record["topic"] = {
+        "topic": record.pop("topic", "general"),
+        "confidence": record.pop("topic_confidence", None)
+    }
+    return record
+
+class ParquetRecordWriter:
+    """
+    Writes enriched records to a flat Parquet file, one row group per
+    row_group_size records, so memory stays bounded by a single row group.
+    """
+    def __init__(self, path: str, row_group_size: int = ROW_GROUP_SIZE):
+        _require_pyarrow()
+        self.path = path
+        self.row_group_size = row_group_size
+        self.count = 0
+        self._rows: List[Dict] = []
+        self._writer = None
+
+    def __enter__(self):
+        self._writer = pq.ParquetWriter(self.path, flat_schema(), compression="zstd")
+        return self
+
+    def write(self, record: Dict):
+        self._rows.append(flatten_record(record))
+        self.count += 1
+        if len(self._rows) >= self.row_group_size:
+            self.flush()
+
+    def write_table(self, table):
+        """Copies already-flat rows (e.g. kept from a previous file) straight through."""
+        self.flush()
+        self._writer.write_table(table.cast(flat_schema()))
+        self.count += table.num_rows
+
+    def flush(self):
+        if self._rows:
+            self._writer.write_table(pa.Table.from_pylist(self._rows, schema=flat_schema()))
+            self._rows = []
+
+    def __exit__(self, *exc):
+        self.flush()
+        self._writer.close()
+        return False
+
+def iter_parquet_records(path: str, batch_size: int = ROW_GROUP_SIZE) -> Iterator[Dict]:
+    """Yields raw engagements (e.g. from app/utils/data_generator.py) one batch at a time."""
+    _require_pyarrow()
+    parquet_file = pq.ParquetFile(path, memory_map=True)
+    for batch in parquet_file.iter_batches(batch_size=batch_size):
+        yield from batch.to_pylist()
+
+def iter_kept_row_groups(path: str, replaced_ids: Iterable[str]):
+    """Yields the row groups of an existing results file minus the rows whose id was re-scored."""
+    _require_pyarrow()
+    if not os.path.exists(path):
+        return
+    replaced = pa.array(sorted(replaced_ids), type=pa.string())
+    parquet_file = pq.ParquetFile(path, memory_map=True)
+    for i in range(parquet_file.num_row_groups):
+        table = parquet_file.read_row_group(i)
+        keep = pc.invert(pc.is_in(table["id"], value_set=replaced))
+        yield table.filter(keep)
+
+def read_columns(path: str, columns: List[str]):
+    """Reads only the given columns into a pandas DataFrame, memory-mapping the file instead of buffering it."""
+    _require_pyarrow()
+    return pq.read_table(path, columns=columns, memory_map=True).to_pandas()
+
+def iter_records(path: str, limit: Optional[int] = None, batch_size: int = 10000) -> Iterator[Dict]:
+    """Yields nested results records batch by batch, stopping early once limit rows were produced."""
+    _require_pyarrow()
+    parquet_file = pq.ParquetFile(path, memory_map=True)
+    produced = 0
+    for batch in parquet_file.iter_batches(batch_size=min(batch_size, limit or batch_size)):
+        for row in batch.to_pylist():
+            if limit is not None and produced >= limit:
+                return
+            produced += 1
+            yield nest_record(row)
@@ -0,0 +1,27 @@
+import re
+from .vocabulary import KNOWN_ENTITIES
+
+# 'template' collapses texts that differ only in known entity names and
+# numbers, 'exact' only identical texts (after whitespace), 'off' scores every row
+DEDUP_MODES = ("template", "exact", "off")
+
+# Known names only, longest first so "Databricks SQL" wins over a shorter
+# prefix. Masking arbitrary capitalized words would also mask polarity words
+# ("Migration done, Excellent outcome" vs. "..., Terrible outcome").
+ENTITY_PATTERN = r"(?i)\b(?:" + "|".join(
+    re.escape(name) for name in sorted(KNOWN_ENTITIES, key=len, reverse=True)
+) + r")\b"
+NUMBER_PATTERN = r"\d+(?:[.,]\d+)*"
+WHITESPACE_PATTERN = r"\s+"
+
+_ENTITY = re.compile(ENTITY_PATTERN)
+_NUMBER = re.compile(NUMBER_PATTERN)
+_WHITESPACE = re.compile(WHITESPACE_PATTERN)
+
+def template_key(text: str) -> str:
+    """Normalized template of a single text: known names and numbers masked, lowercased."""
+    text = _NUMBER.sub("<n>", _ENTITY.sub("<e>", text or ""))
+    return _WHITESPACE.sub(" ", text).strip().lower()
+
+def exact_key(text: str) -> str:
+    return _WHITESPACE.sub(" ", text or "").strip()
@@ -0,0 +1,81 @@
+import gzip
+import io
+import json
+from typing import Dict, Iterator, TextIO
+
+# Optional zstd support; .zst paths raise a clear error without it
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+JSONL_SUFFIXES = (".jsonl", ".jsonl.gz", ".jsonl.zst")
+
+def is_jsonl(path: str) -> bool:
+    return str(path).endswith(JSONL_SUFFIXES)
+
+def open_text(path: str, mode: str = "r") -> TextIO:
+    """
+    Opens a text stream, transparently (de)compressing .gz and .zst files.
+    mode is one of "r", "w" or "a"; compressed appends add a new frame/member.
+    """
+    path = str(path)
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    if path.endswith(".zst"):
+        if zstandard is None:
+            raise ImportError("zstandard is required for .zst files: pip install zstandard")
+        raw = open(path, mode + "b")
+        if mode == "r":
+            stream = zstandard.ZstdDecompressor().stream_reader(raw, read_across_frames=True, closefd=True)
+        else:
+            stream = zstandard.ZstdCompressor().stream_writer(raw, closefd=True)
+        return io.TextIOWrapper(stream, encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+def iter_records(path: str) -> Iterator[Dict]:
+    """
+    Yields engagement records one at a time.
+    JSON Lines files (optionally compressed) are parsed lazily line by line;
+    a plain .json array has to be loaded whole.
+    """
+    if not is_jsonl(path):
+        with open_text(path) as f:
+            yield from json.load(f)
+        return
+
+    with open_text(path) as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+def load_latest_by_id(path: str) -> Dict[str, Dict]:
+    """Reads an append-only JSON Lines log where a later line for an id replaces earlier ones."""
+    latest: Dict[str, Dict] = {}
+    for record in iter_records(path):
+        key = str(record.get("id"))
+        latest.pop(key, None)
+        latest[key] = record
+    return latest
+
+class RecordWriter:
+    """Writes records as JSON Lines, one per line, as they are produced."""
+    def __init__(self, path: str, append: bool = False):
+        self.path = path
+        self.append = append
+        self.count = 0
+        self._f = None
+
+    def __enter__(self):
+        self._f = open_text(self.path, "a" if self.append else "w")
+        return self
+
+    def write(self, record: Dict):
+        self._f.write(json.dumps(record))
+        self._f.write("\n")
+        self.count += 1
+
+    def __exit__(self, *exc):
+        self._f.close()
+        return False
@@ -0,0 +1,8 @@
+import os
+
+# backend/, whichever process (API or root pipeline) imports this
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Default sentiment cache file. The API and the pipeline both default to it, so
+# each reuses the other's results whatever directory it was started from.
+DEFAULT_SENTIMENT_CACHE_PATH = os.path.join(BACKEND_DIR, ".cache", "sentiment.sqlite")
@@ -0,0 +1,139 @@
+import os
+import re
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+def normalize_text(text: str) -> str:
+    """
+    NFKC, collapsed whitespace, stripped. Case is kept: cased models may score
+    "GREAT" and "great" differently, so only layout differences are folded.
+    """
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", text)).strip()
+
+def make_key(model_id: str, text: str) -> str:
+    return hashlib.sha256(f"{model_id}\0{normalize_text(text)}".encode("utf-8")).hexdigest()
+
+class SentimentCache:
+    """
+    Sentiment results keyed by (model identity, normalized text hash).
+
+    A bounded in-memory LRU sits in front of an optional SQLite file. The file
+    is shared by every process using the same path (WAL mode), so API workers,
+    pipeline workers and repeated runs skip texts any of them has scored before. Each process
+    opens its own connection, which also keeps it safe across fork.
+    """
+    def __init__(self, path: Optional[str], max_memory_entries: int = 50000):
+        self.path = path
+        self.max_memory_entries = max_memory_entries
+        self._memory: "OrderedDict[str, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_pid: Optional[int] = None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def _db(self) -> Optional[sqlite3.Connection]:
+        if not self.path:
+            return None
+        if self._conn is None or self._conn_pid != os.getpid():
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS sentiment ("
+                "key TEXT PRIMARY KEY, model TEXT NOT NULL, sentiment_type TEXT NOT NULL, "
+                "sentiment_score REAL NOT NULL, created_at REAL NOT NULL)"
+            )
+            self._conn, self._conn_pid = conn, os.getpid()
+        return self._conn
+
+    def _remember(self, key: str, result: Dict):
+        self._memory[key] = result
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def get_many(self, model_id: str, texts: Iterable[str]) -> Dict[str, Dict]:
+        """Cached results for the given texts, as {text: result}; misses are left out."""
+        keys = {}
+        for text in texts:
+            if text and text not in keys:
+                keys[text] = make_key(model_id, text)
+
+        found: Dict[str, Dict] = {}
+        with self._lock:
+            missing: Dict[str, List[str]] = {}
+            for text, key in keys.items():
+                result = self._memory.get(key)
+                if result is not None:
+                    self._memory.move_to_end(key)
+                    found[text] = result
+                else:
+                    missing.setdefault(key, []).append(text)
+            self.hits += len(found)
+
+            db = self._db()
+            if db is not None and missing:
+                missing_keys = list(missing)
+                # Stay well under SQLite's bound-parameter limit
+                for start in range(0, len(missing_keys), 500):
+                    chunk = missing_keys[start:start + 500]
+                    rows = db.execute(
+                        f"SELECT key, sentiment_type, sentiment_score FROM sentiment WHERE key IN ({','.join('?' * len(chunk))})",
+                        chunk
+                    ).fetchall()
+                    for key, sentiment_type, score in rows:
+                        result = {"sentiment_type": sentiment_type, "sentiment_score": score}
+                        self._remember(key, result)
+                        for text in missing[key]:
+                            found[text] = result
+                        self.disk_hits += len(missing[key])
+            self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, model_id: str, results: Dict[str, Dict]):
+        """Stores {text: result} for model_id in memory and on disk."""
+        if not results:
+            return
+        rows = []
+        now = time.time()
+        with self._lock:
+            for text, result in results.items():
+                key = make_key(model_id, text)
+                self._remember(key, result)
+                rows.append((key, model_id, result["sentiment_type"], float(result["sentiment_score"]), now))
+            db = self._db()
+            if db is not None:
+                try:
+                    with db:
+                        db.executemany("INSERT OR REPLACE INTO sentiment VALUES (?, ?, ?, ?, ?)", rows)
+                except sqlite3.Error as e:
+                    # The memory tier still serves this process
+                    logger.warning(f"Could not persist {len(rows)} sentiment results: {e}")
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            "memory_entries": len(self._memory),
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.disk_hits) / lookups, 4) if lookups else 0.0
+        }
+
+    def close(self):
+        if self._conn is not None and self._conn_pid == os.getpid():
+            self._conn.close()
+        self._conn = None
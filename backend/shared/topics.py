@@ -0,0 +1,125 @@
+from collections import deque
+from typing import Dict, Iterable, List, Tuple
+
+# Optional C implementation; the pure-Python automaton below is used without it
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Topic -> keywords, in priority order: the first topic with any hit is assigned.
+# This is the root pipeline's original vocabulary; the API's old if/elif chains
+# matched a smaller set (see "Topics" in NOTES.md).
+TOPIC_KEYWORDS: List[Tuple[str, List[str]]] = [
+    ("streaming", ["streaming", "auto loader", "kafka", "real-time"]),
+    ("governance", ["governance", "unity catalog", "permissions", "access control"]),
+    ("performance", ["performance", "slow", "optimize", "latency", "tuning"]),
+    ("migration", ["migration", "legacy", "convert", "move"]),
+    ("infrastructure", ["terraform", "deployment", "setup", "configuration", "network"]),
+]
+
+DEFAULT_TOPIC = "general"
+
+class KeywordAutomaton:
+    """
+    Aho-Corasick automaton over lowercase keywords.
+
+    Built once; count() scans a text in a single pass regardless of how many
+    keywords there are and returns occurrence counts per label.
+    """
+    def __init__(self, keywords_by_label: Iterable[Tuple[str, Iterable[str]]]):
+        self.labels: List[str] = []
+        pairs = set()
+        for label, keywords in keywords_by_label:
+            self.labels.append(label)
+            for keyword in keywords:
+                if keyword:
+                    pairs.add((keyword.lower(), label))
+
+        if ahocorasick is not None:
+            self._native = ahocorasick.Automaton()
+            by_keyword: Dict[str, List[str]] = {}
+            for keyword, label in pairs:
+                by_keyword.setdefault(keyword, []).append(label)
+            for keyword, labels in by_keyword.items():
+                self._native.add_word(keyword, tuple(labels))
+            self._native.make_automaton()
+            return
+
+        self._native = None
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[str]] = [[]]
+
+        for keyword, label in pairs:
+            state = 0
+            for ch in keyword:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                state = nxt
+            self._out[state].append(label)
+
+        # Breadth-first failure links; each state inherits its fallback's outputs
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[nxt] = self._goto[fallback].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def count(self, text: str) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        if not text:
+            return counts
+        text = text.lower()
+
+        if self._native is not None:
+            for _, labels in self._native.iter(text):
+                for label in labels:
+                    counts[label] = counts.get(label, 0) + 1
+            return counts
+
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for label in out[state]:
+                counts[label] = counts.get(label, 0) + 1
+        return counts
+
+class TopicMatcher:
+    """Assigns a topic from keyword hits, with every matched topic and its count."""
+    def __init__(self, topic_keywords: List[Tuple[str, List[str]]] = TOPIC_KEYWORDS, default: str = DEFAULT_TOPIC):
+        self.topic_keywords = topic_keywords
+        self.automaton = KeywordAutomaton(topic_keywords)
+        self.priority = [topic for topic, _ in topic_keywords]
+        self.default = default
+
+    def match(self, text: str) -> Dict:
+        """
+        Returns {"topic", "confidence", "matches"}. The topic is the highest-priority
+        topic with a hit; confidence grows with that topic's share of all hits
+        (0.95 when it is the only topic matched, 0.5 for the default topic).
+        """
+        matches = self.automaton.count(text)
+        if not matches:
+            return {"topic": self.default, "confidence": 0.5, "matches": {}}
+
+        topic = next(t for t in self.priority if t in matches)
+        share = matches[topic] / sum(matches.values())
+        return {
+            "topic": topic,
+            "confidence": round(0.5 + 0.45 * share, 2),
+            "matches": {t: matches[t] for t in self.priority if t in matches}
+        }
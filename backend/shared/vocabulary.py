@@ -0,0 +1,15 @@
+# Names the sample data generator substitutes into its note and feedback
+# templates. Dedup masks exactly these, so only texts that differ in a known
+# name (never in an arbitrary capitalized word) share a template.
+
+CUSTOMERS = [
+    "FinTech Corp", "HealthPlus", "RetailGiant", "AutoMotive Inc", "EduTech Solutions",
+    "Global Logistics", "MediaStream", "GreenEnergy", "CyberSecure", "DataDriven Co"
+]
+
+TECHNOLOGIES = [
+    "Delta Lake", "Auto Loader", "PySpark", "Unity Catalog", "Databricks SQL",
+    "MLflow", "Structured Streaming", "Photon", "Serverless", "Terraform"
+]
+
+KNOWN_ENTITIES = TECHNOLOGIES + CUSTOMERS
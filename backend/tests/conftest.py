@@ -0,0 +1,11 @@
+import pytest
+from app import inference
+from app.sentiment_cache import SentimentCache
+
+@pytest.fixture(autouse=True)
+def isolated_sentiment_cache(tmp_path, monkeypatch):
+    # Fake pipelines in tests must never write into the real on-disk cache
+    cache = SentimentCache(str(tmp_path / "sentiment.sqlite"))
+    monkeypatch.setattr(inference, "sentiment_cache", cache)
+    yield cache
+    cache.close()
@@ -0,0 +1,37 @@
+import multiprocessing
+import os
+import pytest
+from benchmarks.bench_suite import _wait_for_child, compare
+
+def _results(**metrics):
+    return {"sizes": {"1000": {"api": {"dashboard_data": metrics}}}}
+
+def test_compare_flags_only_real_regressions():
+    baseline = _results(p95_ms=100.0, throughput_rps=50.0, records_per_s=1000.0, wall_s=2.0, peak_rss_mb=200.0, rows=1000)
+    current = _results(p95_ms=140.0, throughput_rps=30.0, records_per_s=900.0, wall_s=2.004, peak_rss_mb=260.0, rows=5)
+
+    regressions = {r["metric"]: r for r in compare(current, baseline, tolerance=0.25)}
+    prefix = "sizes.1000.api.dashboard_data."
+    # Slower p95, lower throughput and more memory beyond tolerance are flagged;
+    # records_per_s is within tolerance, wall_s moved less than its floor and
+    # rows has no direction
+    assert set(regressions) == {prefix + "p95_ms", prefix + "throughput_rps", prefix + "peak_rss_mb"}
+    assert regressions[prefix + "p95_ms"]["change"] == 0.4
+
+def test_compare_ignores_improvements_and_new_metrics():
+    baseline = _results(p95_ms=100.0, throughput_rps=50.0)
+    current = _results(p95_ms=40.0, throughput_rps=80.0, p99_ms=500.0)
+    assert compare(current, baseline, tolerance=0.25) == []
+    # A tiny absolute slowdown on a fast endpoint is jitter, not a regression
+    assert compare(_results(p95_ms=3.0), _results(p95_ms=1.0), tolerance=0.25) == []
+
+def _exit_without_result(queue):
+    os._exit(3)
+
+def test_child_that_dies_without_a_result_fails_the_run():
+    ctx = multiprocessing.get_context("fork")
+    queue = ctx.Queue()
+    proc = ctx.Process(target=_exit_without_result, args=(queue,))
+    proc.start()
+    with pytest.raises(RuntimeError, match="exited with code 3"):
+        _wait_for_child(proc, queue, 10, timeout=60)
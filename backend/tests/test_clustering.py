@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+from app.clustering import cluster_embeddings, resolve_method, StreamingKMeans
+
+@pytest.fixture
+def blobs():
+    rng = np.random.default_rng(0)
+    centers = rng.normal(size=(3, 384)) * 10
+    return np.vstack([c + rng.normal(size=(200, 384)) for c in centers]).astype(np.float32)
+
+def test_auto_switches_to_minibatch_above_threshold(monkeypatch):
+    from app.config import settings
+    monkeypatch.setattr(settings, "CLUSTERING_AUTO_THRESHOLD", 100)
+    assert resolve_method(50, "auto") == "agglomerative"
+    assert resolve_method(101, "auto") == "minibatch_kmeans"
+    with pytest.raises(ValueError):
+        resolve_method(10, "dbscan")
+
+@pytest.mark.parametrize("method", ["agglomerative", "minibatch_kmeans"])
+def test_methods_recover_separated_blobs(blobs, method):
+    labels = cluster_embeddings(blobs, n_clusters=3, method=method)
+    assert len(labels) == len(blobs)
+    # Each blob maps onto a single cluster
+    assert all(len(set(labels[i:i + 200])) == 1 for i in range(0, 600, 200))
+    assert len(set(labels)) == 3
+
+def test_streaming_kmeans_fits_chunks(blobs):
+    km = StreamingKMeans(n_clusters=3, batch_size=64)
+    km.fit_chunks(np.array_split(blobs, 5))
+    assert len(set(km.predict(blobs))) == 3
+
+def test_streaming_kmeans_holds_back_a_small_first_chunk(blobs):
+    km = StreamingKMeans(n_clusters=3, batch_size=64)
+    km.partial_fit(blobs[[0, 200]])
+    assert not km.is_fitted
+
+    # The two held-back rows (one per blob) seed the centers with the third
+    km.partial_fit(blobs[[400]])
+    assert km.is_fitted
+    km.fit_chunks(np.array_split(blobs, 5))
+    labels = km.predict(blobs)
+    assert all(len(set(labels[i:i + 200])) == 1 for i in range(0, 600, 200))
+    assert len(set(labels)) == 3
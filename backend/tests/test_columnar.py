@@ -0,0 +1,70 @@
+import json
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from app import columnar
+from app.executor import ExecutionLayer
+from app.routes import analyze
+
+def _write_results(path, n):
+    table = pa.table({
+        "id": [f"ENG-{i}" for i in range(n)],
+        "customer": ["Acme"] * n,
+        "date": ["2025-11-0%d" % (1 + i % 3) for i in range(n)],
+        "status": ["at-risk" if i % 4 == 0 else "completed" for i in range(n)],
+        "notes": ["note"] * n,
+        "feedback": ["feedback"] * n,
+        "technologies": [["Delta Lake"]] * n,
+        "sentiment_type": ["positive" if i % 2 else "negative" for i in range(n)],
+        "sentiment_score": [0.8 if i % 2 else 0.2 for i in range(n)],
+        "topic": ["streaming"] * n,
+        "topic_confidence": [0.95] * n,
+    })
+    pq.write_table(table, path, row_group_size=10)
+
+def test_reads_projected_columns_and_rebuilds_nested_records(tmp_path):
+    path = str(tmp_path / "results.parquet")
+    _write_results(path, 25)
+
+    df = columnar.read_columns(path, ["sentiment_score", "topic"])
+    assert list(df.columns) == ["sentiment_score", "topic"]
+    assert len(df) == 25
+
+    records = list(columnar.iter_records(path, limit=3))
+    assert [r["id"] for r in records] == ["ENG-0", "ENG-1", "ENG-2"]
+    assert records[1]["sentiment"] == {"sentiment_type": "positive", "sentiment_score": 0.8}
+    assert records[1]["topic"] == {"topic": "streaming", "confidence": 0.95}
+
+def test_dashboard_prefers_parquet_results(tmp_path, monkeypatch):
+    path = str(tmp_path / "analytics_results.parquet")
+    summary_path = tmp_path / "analytics_results.summary.json"
+    _write_results(path, 40)
+    summary_path.write_text(json.dumps({"weekly_summary": "From parquet"}))
+    monkeypatch.setattr(analyze, "PROCESSED_PARQUET_PATH", path)
+    monkeypatch.setattr(analyze, "PROCESSED_SUMMARY_PATH", str(summary_path))
+
+    data = analyze.build_dashboard_data()
+    assert data["kpis"]["total_engagements"] == 40
+    assert data["kpis"]["at_risk_count"] == 10
+    assert data["sentiment_distribution"] == {"positive": 20, "negative": 20}
+    assert len(data["engagements"]) == analyze.DETAIL_VIEW_SIZE
+    assert data["engagements"][0]["sentiment"]["sentiment_type"] == "negative"
+    assert data["summary"] == "From parquet"
+
+def test_dashboard_payload_builds_in_a_spawned_process_pool(tmp_path):
+    path = str(tmp_path / "analytics_results.parquet")
+    summary_path = tmp_path / "analytics_results.summary.json"
+    _write_results(path, 12)
+    summary_path.write_text(json.dumps({"weekly_summary": "From a worker"}))
+
+    # Spawned workers import analyze fresh, so the paths travel as arguments
+    layer = ExecutionLayer(io_workers=1, cpu_workers=1, cpu_executor="process", start_method="spawn")
+    try:
+        payload = json.loads(layer.call_cpu(analyze._serialize_dashboard_data, path, str(summary_path)))
+    finally:
+        layer.shutdown()
+    assert payload["kpis"]["total_engagements"] == 12
+    assert payload["summary"] == "From a worker"
+
+    with pytest.raises(ValueError):
+        ExecutionLayer(io_workers=1, cpu_workers=1, start_method="fork")
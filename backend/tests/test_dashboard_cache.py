@@ -0,0 +1,84 @@
+import time
+from fastapi.testclient import TestClient
+from app.dashboard_cache import AggregateCache, file_signature
+from app.main import app
+
+def test_serves_cached_value_until_source_changes(tmp_path):
+    source = tmp_path / "data.json"
+    source.write_text("1")
+    builds = []
+
+    def build():
+        builds.append(source.read_text())
+        return source.read_text()
+
+    cache = AggregateCache(build=build, signature=lambda: file_signature(str(source)))
+
+    assert cache.get()[0] == "1"
+    value, meta = cache.get()
+    assert value == "1" and meta["status"] == "hit" and meta["hits"] == 1
+    assert builds == ["1"]
+
+    source.write_text("22")
+    value, meta = cache.get()
+    # Stale value is served while the rebuild runs in the background
+    assert value == "1" and meta["status"] == "stale"
+
+    for _ in range(100):
+        if cache.get()[0] == "22":
+            break
+        time.sleep(0.01)
+    assert cache.get()[0] == "22"
+    assert builds == ["1", "22"]
+
+def test_dashboard_endpoint_reports_cache_headers():
+    client = TestClient(app)
+    first = client.get("/api/dashboard/data")
+    second = client.get("/api/dashboard/data")
+
+    assert first.status_code == 200
+    assert second.headers["X-Cache"] == "hit"
+    assert int(second.headers["X-Cache-Hits"]) >= 1
+    assert float(second.headers["X-Cache-Age"]) >= 0
+    assert second.json() == first.json()
+    assert second.json()["kpis"]["total_engagements"] > 0
+
+def _wait_for(condition):
+    for _ in range(200):
+        if condition():
+            return
+        time.sleep(0.01)
+
+def test_failed_rebuild_backs_off_until_signature_changes_or_interval_passes():
+    state = {"signature": 1, "fail": False}
+    attempts = []
+
+    def build():
+        attempts.append(state["signature"])
+        if state["fail"]:
+            raise RuntimeError("source unreadable")
+        return state["signature"]
+
+    cache = AggregateCache(build=build, signature=lambda: state["signature"], retry_interval=60)
+    assert cache.get()[0] == 1
+
+    state.update(signature=2, fail=True)
+    cache.get()
+    _wait_for(lambda: cache.failures == 1 and not cache._rebuilding)
+    # Same failing signature: the previous value is served without new rebuilds
+    for _ in range(5):
+        assert cache.get()[0] == 1
+    assert attempts == [1, 2]
+
+    # A new signature is retried at once
+    state["signature"] = 3
+    cache.get()
+    _wait_for(lambda: cache.failures == 2 and not cache._rebuilding)
+    assert attempts == [1, 2, 3]
+
+    # So is the same signature once the retry interval has passed
+    state["fail"] = False
+    cache.retry_interval = 0
+    cache.get()
+    _wait_for(lambda: cache.get()[0] == 3)
+    assert cache.get()[0] == 3 and attempts == [1, 2, 3, 3]
@@ -0,0 +1,119 @@
+import json
+import sys
+import types
+from datetime import date, timedelta
+import pyarrow as pa
+import pytest
+from app.config import settings
+from app.databricks_client import DatabricksClient
+
+class FakeCursor:
+    def __init__(self, table):
+        self.table = table
+        self.offset = 0
+        self.executed = []
+
+    def execute(self, query, params=None):
+        self.executed.append((query, params))
+
+    def fetchmany_arrow(self, size):
+        batch = self.table.slice(self.offset, size)
+        self.offset += batch.num_rows
+        return batch
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+class FakeConnection:
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def cursor(self):
+        return self._cursor
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+@pytest.fixture
+def fake_warehouse(monkeypatch):
+    table = pa.table({
+        "id": [f"ENG-{i}" for i in range(5)],
+        "customer": ["A", "B", "C", "D", "E"],
+        "date": ["2025-01-0%d" % (i + 1) for i in range(5)],
+    })
+    cursor = FakeCursor(table)
+    sql_module = types.ModuleType("databricks.sql")
+    sql_module.connect = lambda **kwargs: FakeConnection(cursor)
+    databricks_module = types.ModuleType("databricks")
+    databricks_module.sql = sql_module
+    monkeypatch.setitem(sys.modules, "databricks", databricks_module)
+    monkeypatch.setitem(sys.modules, "databricks.sql", sql_module)
+
+    client = DatabricksClient()
+    client.host, client.token, client.http_path = "https://example", "dapi", "/sql/1.0/warehouses/x"
+    return client, cursor
+
+def test_batches_stream_as_dataframes(fake_warehouse):
+    client, cursor = fake_warehouse
+
+    frames = list(client.iter_engagement_batches(since_days=30, batch_size=2))
+
+    assert [len(f) for f in frames] == [2, 2, 1]
+    assert list(frames[0].columns) == ["id", "customer", "date"]
+    query, params = cursor.executed[0]
+    assert "date_sub(current_date(), :since_days)" in query
+    assert params == {"since_days": 30}
+
+def test_full_history_has_no_predicate(fake_warehouse):
+    client, cursor = fake_warehouse
+
+    records = client.fetch_recent_engagements(since_days=None)
+
+    assert len(records) == 5 and records[0]["id"] == "ENG-0"
+    assert "WHERE" not in cursor.executed[0][0]
+
+def test_empty_window_returns_nothing_instead_of_sample(fake_warehouse):
+    client, cursor = fake_warehouse
+    cursor.table = cursor.table.slice(0, 0)
+
+    assert list(client.iter_engagement_batches(since_days=7)) == []
+    assert client.fetch_engagements_df(since_days=7).empty
+
+def test_falls_back_to_sample_when_query_fails(fake_warehouse):
+    client, cursor = fake_warehouse
+
+    def missing_table(query, params=None):
+        raise RuntimeError("[TABLE_OR_VIEW_NOT_FOUND] engagements")
+
+    cursor.execute = missing_table
+    assert len(client.fetch_engagements_df(since_days=None)) > 0
+
+def test_sample_fallback_applies_the_date_window(tmp_path, monkeypatch):
+    today = date.today()
+    sample = tmp_path / "sample.jsonl"
+    sample.write_text("\n".join(
+        json.dumps({"id": f"ENG-{days}", "date": (today - timedelta(days=days)).isoformat()})
+        for days in (0, 3, 7, 8, 30)
+    ) + "\n")
+    monkeypatch.setattr(settings, "SAMPLE_DATA_PATH", str(sample))
+    client = DatabricksClient()
+    client.host = client.token = None
+
+    assert client.fetch_engagements_df(since_days=7)["id"].tolist() == ["ENG-0", "ENG-3", "ENG-7"]
+    assert len(client.fetch_engagements_df(since_days=None)) == 5
+
+def test_watermark_is_pushed_down(fake_warehouse):
+    client, cursor = fake_warehouse
+
+    client.fetch_engagements_after("2025-01-02", "ENG-1")
+
+    query, params = cursor.executed[0]
+    assert "(date > :wm_date OR (date = :wm_date AND id > :wm_id))" in query
+    assert query.endswith("ORDER BY date, id")
+    assert params == {"wm_date": "2025-01-02", "wm_id": "ENG-1"}
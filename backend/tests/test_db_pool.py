@@ -0,0 +1,119 @@
+import sqlite3
+import threading
+import time
+import pytest
+from app.db_pool import ConnectionPool, PoolClosed, PoolTimeout
+
+def sqlite_connect():
+    return sqlite3.connect(":memory:", check_same_thread=False)
+
+def test_reuses_connections_up_to_size():
+    pool = ConnectionPool(sqlite_connect, size=2)
+
+    with pool.connection() as first:
+        pass
+    with pool.connection() as second:
+        assert second is first
+
+    stats = pool.stats()
+    assert stats["created"] == 1 and stats["checkouts"] == 2 and stats["idle"] == 1
+
+def test_checkout_waits_for_release_and_times_out():
+    pool = ConnectionPool(sqlite_connect, size=1, checkout_timeout=0.05)
+    held = threading.Event()
+    release = threading.Event()
+
+    def hold():
+        with pool.connection():
+            held.set()
+            release.wait()
+
+    worker = threading.Thread(target=hold)
+    worker.start()
+    held.wait()
+    with pytest.raises(PoolTimeout):
+        with pool.connection():
+            pass
+
+    pool.checkout_timeout = 5
+    threading.Timer(0.05, release.set).start()
+    with pool.connection():
+        pass
+    worker.join()
+    assert pool.stats()["wait_ms_max"] >= 40
+
+def test_stale_session_is_reconnected():
+    pool = ConnectionPool(sqlite_connect, size=1, health_check_after=0)
+    with pool.connection() as conn:
+        pass
+    conn.close()  # session dies while idle
+    time.sleep(0.01)
+
+    with pool.connection() as fresh:
+        assert fresh is not conn
+        assert fresh.execute("SELECT 1").fetchone() == (1,)
+    assert pool.stats()["reconnects"] == 1
+
+def test_failed_caller_discards_connection():
+    pool = ConnectionPool(sqlite_connect, size=1)
+    with pytest.raises(ValueError):
+        with pool.connection():
+            raise ValueError("query failed")
+    assert pool.stats()["discarded"] == 1
+    with pool.connection():
+        pass
+    assert pool.stats()["created"] == 2
+
+def test_generator_closed_early_returns_connection():
+    pool = ConnectionPool(sqlite_connect, size=1)
+
+    def rows():
+        with pool.connection() as conn:
+            for row in conn.execute("SELECT 1 UNION ALL SELECT 2"):
+                yield row
+
+    stream = rows()
+    assert next(stream) == (1,)
+    stream.close()
+
+    stats = pool.stats()
+    assert stats["discarded"] == 0 and stats["idle"] == 1
+    with pool.connection():
+        pass
+    assert pool.stats()["created"] == 1
+
+class TrackedConnection:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+def test_idle_connections_are_reaped_on_return():
+    pool = ConnectionPool(TrackedConnection, size=2, idle_timeout=0.05)
+    with pool.connection() as first:
+        with pool.connection() as second:
+            pass
+    # "first" went idle later than "second"; only activity on the pool reaps
+    time.sleep(0.08)
+    assert not second.closed
+
+    with pool.connection() as third:
+        pass
+    assert second.closed and first.closed and third is not first
+    stats = pool.stats()
+    assert stats["expired"] == 2 and stats["idle"] == 1 and stats["in_use"] == 0
+
+def test_close_also_closes_connections_returned_later():
+    pool = ConnectionPool(TrackedConnection, size=2)
+    with pool.connection() as held:
+        with pool.connection() as idle:
+            pass
+        pool.close()
+        assert idle.closed and not held.closed
+    assert held.closed
+    assert pool.stats()["in_use"] == 0 and pool.stats()["idle"] == 0
+
+    with pytest.raises(PoolClosed):
+        with pool.connection():
+            pass
@@ -0,0 +1,65 @@
+import pandas as pd
+import pytest
+from app.config import settings
+from app.dedup import group_texts, template_key
+from app.inference import InferenceEngine
+
+TEXTS = pd.Series([
+    "Customer reported slow Delta Lake merges on 12 nodes.",
+    "Customer reported slow Unity Catalog merges on 40 nodes.",
+    "Customer  reported slow Delta Lake merges on 12 nodes. ",
+    "Great support.",
+    "Poor support.",
+    None
+])
+
+def test_template_mode_masks_known_names_and_numbers_only():
+    groups = group_texts(TEXTS, "template")
+    assert list(groups.codes) == [0, 0, 0, 1, 2, 3]
+    assert list(groups.representatives) == [0, 3, 4, 5]
+    assert groups.stats() == {"rows": 6, "groups": 4, "dedup_ratio": 0.3333}
+    # The per-text key agrees with the vectorized grouping
+    assert template_key(TEXTS[0]) == template_key(TEXTS[1]) != template_key(TEXTS[3])
+
+def test_template_mode_keeps_capitalized_polarity_words():
+    texts = pd.Series([
+        "Migration done, Excellent outcome.",
+        "Migration done, Terrible outcome.",
+        "Customer said: Great work on Photon.",
+        "Customer said: Awful work on Photon.",
+        "NOT happy with MLflow.",
+        "VERY happy with MLflow.",
+        "VERY happy with PySpark."
+    ])
+    groups = group_texts(texts, "template")
+    assert list(groups.codes) == [0, 1, 2, 3, 4, 5, 5]
+    assert [template_key(t) for t in texts[5:]] == ["very happy with <e>."] * 2
+
+def test_exact_and_off_modes():
+    assert list(group_texts(TEXTS, "exact").codes) == [0, 1, 0, 2, 3, 4]
+    assert group_texts(TEXTS, "off").groups == len(TEXTS)
+    with pytest.raises(ValueError):
+        group_texts(TEXTS, "fuzzy")
+
+def test_engine_scores_representatives_and_fans_out(monkeypatch):
+    monkeypatch.setattr(settings, "DEDUP_MODE", "template")
+    scored = []
+
+    def fake_pipeline(texts, **kwargs):
+        scored.extend(texts)
+        return [{"label": "NEGATIVE" if "slow" in t else "POSITIVE", "score": 0.8} for t in texts]
+
+    engine = InferenceEngine()
+    engine.models_loaded = True
+    engine.sentiment_pipeline = fake_pipeline
+    engagements = [
+        {"id": str(i), "customer": "A", "notes": note, "date": "2023-01-01"}
+        for i, note in enumerate(TEXTS.fillna("").tolist()[:4])
+    ]
+
+    report = engine.analyze_engagements(engagements)
+
+    assert len(scored) == 2
+    assert engine.last_dedup["rows"] == 4 and engine.last_dedup["groups"] == 2
+    assert engine.last_dedup["estimated_seconds_saved"] >= 0
+    assert report.plotly_data
@@ -0,0 +1,68 @@
+import multiprocessing
+import numpy as np
+from app.embedding_cache import EmbeddingCache
+
+class FakeModel:
+    def __init__(self):
+        self.encoded = []
+
+    def encode(self, texts):
+        self.encoded.extend(texts)
+        return np.array([[len(t), t.count("a"), 1.0] for t in texts], dtype=np.float32)
+
+def test_repeat_encodes_only_new_texts(tmp_path):
+    model = FakeModel()
+    cache = EmbeddingCache(str(tmp_path), max_entries=10)
+
+    first = cache.encode(model, "fake", ["alpha", "beta"])
+    second = cache.encode(model, "fake", ["beta", "gamma", "alpha"])
+
+    assert model.encoded == ["alpha", "beta", "gamma"]
+    np.testing.assert_array_equal(second[0], first[1])
+    np.testing.assert_array_equal(second[2], first[0])
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["misses"] == 3
+
+    # A fresh instance reuses the persisted matrix and index
+    reopened = EmbeddingCache(str(tmp_path), max_entries=10)
+    reopened.encode(model, "fake", ["gamma"])
+    assert model.encoded == ["alpha", "beta", "gamma"]
+    assert reopened.stats()["hits"] == 1
+
+def test_lru_eviction_respects_cap(tmp_path):
+    model = FakeModel()
+    cache = EmbeddingCache(str(tmp_path), max_entries=2)
+
+    cache.encode(model, "fake", ["a", "b"])
+    cache.encode(model, "fake", ["a"])  # "b" is now least recently used
+    cache.encode(model, "fake", ["c"])
+    cache.encode(model, "fake", ["a", "b"])
+
+    assert model.encoded == ["a", "b", "c", "b"]
+    assert cache.stats()["entries"] == 2
+    assert cache.stats()["evictions"] == 2
+
+def _encode_rounds(cache_dir, offset, queue):
+    model = FakeModel()
+    cache = EmbeddingCache(cache_dir, max_entries=8)
+    wrong = 0
+    for round_ in range(40):
+        texts = [f"text {(round_ + offset + i) % 13} " + "a" * ((round_ + offset + i) % 13) for i in range(5)]
+        vectors = cache.encode(model, "fake", texts)
+        wrong += int((vectors != FakeModel().encode(texts)).any(axis=1).sum())
+    queue.put((wrong, cache.stats()["entries"]))
+
+def test_workers_share_slots_without_clobbering(tmp_path):
+    # A small cap keeps both processes evicting and reusing the same slots
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    procs = [ctx.Process(target=_encode_rounds, args=(str(tmp_path), offset, queue)) for offset in (0, 7)]
+    for proc in procs:
+        proc.start()
+    results = [queue.get(timeout=60) for _ in procs]
+    for proc in procs:
+        proc.join(timeout=10)
+
+    assert [wrong for wrong, _ in results] == [0, 0]
+    assert all(entries == 8 for _, entries in results)
+
@@ -0,0 +1,110 @@
+from fastapi.testclient import TestClient
+from app.engagement_index import EngagementIndex
+from app.main import app
+from app.routes.analyze import load_processed_data
+
+def _records(n):
+    return [
+        {
+            "id": f"ENG-{i:03d}",
+            "date": f"2025-11-{1 + i % 10:02d}",
+            "customer": "Acme" if i % 2 else "Globex",
+            "status": "at-risk" if i % 5 == 0 else "completed",
+            "topic": {"topic": "streaming" if i % 3 else "governance", "confidence": 0.9}
+        }
+        for i in range(n)
+    ]
+
+def _walk(index, **query):
+    pages, cursor = [], None
+    while True:
+        page, cursor = index.page(cursor=cursor, **query)
+        pages.append(page)
+        if cursor is None:
+            return pages
+
+def test_cursor_pages_follow_date_order_with_filters():
+    index = EngagementIndex()
+    records = _records(100)
+    index.sync(records)
+
+    pages = _walk(index, limit=7, filters={"customer": "acme", "topic": "Streaming"})
+    seen = [r for page in pages for r in page]
+    expected = sorted(
+        (r for r in records if r["customer"] == "Acme" and r["topic"]["topic"] == "streaming"),
+        key=lambda r: (r["date"], r["id"]), reverse=True
+    )
+    assert [r["id"] for r in seen] == [r["id"] for r in expected]
+    assert all(len(page) == 7 for page in pages[:-1])
+
+    page, _ = index.page(limit=50, date_from="2025-11-03", date_to="2025-11-04", descending=False)
+    assert {r["date"] for r in page} == {"2025-11-03", "2025-11-04"}
+    assert len(page) == 20
+
+def test_date_to_includes_datetimes_on_that_day():
+    index = EngagementIndex()
+    index.sync([
+        {"id": "a", "date": "2024-01-31"},
+        {"id": "b", "date": "2024-01-31T10:00"},
+        {"id": "c", "date": "2024-01-31T23:59:59"},
+        {"id": "d", "date": "2024-02-01T00:00"}
+    ])
+    page, _ = index.page(date_from="2024-01-31", date_to="2024-01-31", descending=False)
+    assert [r["id"] for r in page] == ["a", "b", "c"]
+
+def test_sync_applies_only_the_difference():
+    index = EngagementIndex()
+    records = _records(100)
+    index.sync(records)
+    assert index.builds == 1
+
+    records = [dict(r) for r in records if r["id"] != "ENG-005"]
+    records[1]["status"] = "at-risk"
+    records.append({"id": "ENG-999", "date": "2025-12-01", "customer": "Initech", "status": "planned"})
+    assert index.sync(records) == {"added": 1, "updated": 1, "removed": 1}
+    assert index.builds == 1
+    assert len(index) == 100
+
+    newest, _ = index.page(limit=1)
+    assert newest[0]["id"] == "ENG-999"
+    at_risk, _ = index.page(limit=100, filters={"status": "at-risk"})
+    ids = {r["id"] for r in at_risk}
+    assert "ENG-001" in ids and "ENG-005" not in ids
+
+def test_slice_keeps_load_order_across_syncs():
+    index = EngagementIndex()
+    records = _records(30)
+    index.sync(records)
+    records[2] = dict(records[2], status="at-risk")
+    index.sync(records)
+
+    page, cursor = index.slice(offset=0, limit=5)
+    assert [r["id"] for r in page] == ["ENG-000", "ENG-001", "ENG-002", "ENG-003", "ENG-004"]
+    assert cursor is None
+    page, _ = index.slice(offset=1, limit=3, filters={"status": "at-risk"})
+    assert [r["id"] for r in page] == ["ENG-002", "ENG-005", "ENG-010"]
+
+def test_recent_endpoint_returns_next_cursor():
+    client = TestClient(app)
+    first = client.get("/api/engagements/recent", params={"page_size": 5})
+    assert first.status_code == 200
+    assert len(first.json()) == 5
+    dates = [r["date"] for r in first.json()]
+    assert dates == sorted(dates, reverse=True)
+
+    second = client.get("/api/engagements/recent", params={"page_size": 5, "cursor": first.headers["X-Next-Cursor"]})
+    assert {r["id"] for r in second.json()}.isdisjoint(r["id"] for r in first.json())
+    assert second.json()[0]["date"] <= dates[-1]
+
+    assert client.get("/api/engagements/recent", params={"cursor": "not-a-cursor"}).status_code == 400
+
+def test_page_number_requests_keep_file_order():
+    client = TestClient(app)
+    first = client.get("/api/engagements/recent", params={"page": 1, "page_size": 5}).json()
+    second = client.get("/api/engagements/recent", params={"page": 2, "page_size": 5}).json()
+    expected = [str(r["id"]) for r in load_processed_data()['engagements'][:10]]
+    assert [str(r["id"]) for r in first + second] == expected
+
+    newest = client.get("/api/engagements/recent", params={"page": 1, "page_size": 5, "order": "desc"}).json()
+    dates = [r["date"] for r in newest]
+    assert dates == sorted(dates, reverse=True)
@@ -0,0 +1,56 @@
+import time
+from app.config import settings
+from app.generation import GenerationCache, GenerationService
+
+class FakeTokenizer:
+    def __call__(self, prompts, **kwargs):
+        return {"input_ids": list(prompts)}
+
+    def batch_decode(self, outputs, skip_special_tokens=True):
+        return [f"summary of {p}" for p in outputs]
+
+class FakeModel:
+    def __init__(self):
+        self.batches = []
+
+    def generate(self, input_ids, **kwargs):
+        self.batches.append((list(input_ids), kwargs))
+        return input_ids
+
+def test_batches_misses_and_serves_repeats_from_cache():
+    model = FakeModel()
+    service = GenerationService(FakeTokenizer(), model, "flan", GenerationCache(10, ttl_seconds=0), batch_size=2)
+
+    out = service.generate_batch(["a", "b", "a", "c"])
+    assert out == ["summary of a", "summary of b", "summary of a", "summary of c"]
+    # Duplicate prompt generated once; three unique prompts in batches of two
+    assert [b for b, _ in model.batches] == [["a", "b"], ["c"]]
+    assert model.batches[0][1]["max_new_tokens"] == settings.GENERATION_MAX_NEW_TOKENS
+
+    assert service.generate("b") == "summary of b"
+    assert len(model.batches) == 2
+    assert service.cache.stats()["hits"] == 1
+
+def test_changed_decoding_limits_and_expired_entries_regenerate(monkeypatch):
+    model = FakeModel()
+    service = GenerationService(FakeTokenizer(), model, "flan", GenerationCache(10, ttl_seconds=0.05))
+
+    service.generate("a")
+    monkeypatch.setattr(settings, "GENERATION_MAX_NEW_TOKENS", 20)
+    service.generate("a")
+    assert len(model.batches) == 2
+    assert model.batches[1][1]["max_new_tokens"] == 20
+
+    time.sleep(0.06)
+    service.generate("a")
+    assert len(model.batches) == 3
+    assert service.cache.stats()["expired"] == 1
+
+def test_lru_evicts_oldest():
+    cache = GenerationCache(max_entries=2, ttl_seconds=0)
+    cache.put("x", "1")
+    cache.put("y", "2")
+    cache.get("x")
+    cache.put("z", "3")
+    assert cache.get("y") is None
+    assert cache.get("x") == "1" and cache.get("z") == "3"
@@ -0,0 +1,91 @@
+import asyncio
+import json
+import httpx
+import pytest
+from app.config import settings
+from app.hf_client import HFAPIError, HFInferenceClient
+from app.inference import InferenceEngine
+
+class MockHub:
+    """Local stand-in for the Inference API: classification, feature extraction and generation."""
+    def __init__(self, fail_first=0):
+        self.requests = []
+        self.fail_first = fail_first
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        self.requests.append((request.url.path, body))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            if self.fail_first:
+                self.fail_first -= 1
+                return httpx.Response(503, json={"error": "Model is loading"}, headers={"Retry-After": "0"})
+            inputs = body["inputs"]
+            if request.url.path.endswith("/pipeline/feature-extraction"):
+                return httpx.Response(200, json=[[float(len(t)), 1.0] for t in inputs])
+            if "parameters" in body:
+                return httpx.Response(200, json=[{"generated_text": f"summary: {t}"} for t in inputs])
+            return httpx.Response(200, json=[
+                [{"label": "NEGATIVE", "score": 0.8}, {"label": "POSITIVE", "score": 0.2}] if "slow" in t
+                else [{"label": "POSITIVE", "score": 0.9}, {"label": "NEGATIVE", "score": 0.1}]
+                for t in inputs
+            ])
+        finally:
+            self.in_flight -= 1
+
+def _client(hub, **kwargs):
+    return HFInferenceClient("hf_test", base_url="http://hub.local/models", transport=httpx.MockTransport(hub), backoff=0, **kwargs)
+
+def test_batches_run_concurrently_within_the_limit():
+    hub = MockHub()
+    client = _client(hub, batch_size=3, max_concurrency=2)
+    try:
+        texts = [f"text {i}" if i % 2 else f"slow job {i}" for i in range(10)]
+        results = client.sentiment(texts, "sst2")
+        embeddings = client.embed(texts[:4], "minilm")
+    finally:
+        client.close()
+
+    assert [r["label"] for r in results[:2]] == ["NEGATIVE", "POSITIVE"]
+    assert len(results) == 10
+    assert [len(body["inputs"]) for path, body in hub.requests if path == "/models/sst2"] == [3, 3, 3, 1]
+    assert hub.max_in_flight == 2
+    assert embeddings.shape == (4, 2)
+    assert client.stats()["sentiment"]["calls"] == 4
+
+def test_retries_then_gives_up():
+    hub = MockHub(fail_first=2)
+    client = _client(hub, max_retries=2)
+    try:
+        assert client.generate(["a"], "flan", max_new_tokens=10) == ["summary: a"]
+        assert client.stats()["generation"]["retries"] == 2
+
+        hub.fail_first = 10
+        with pytest.raises(HFAPIError):
+            client.generate(["b"], "flan", max_new_tokens=10)
+        assert client.stats()["generation"]["errors"] == 1
+    finally:
+        client.close()
+
+def test_engine_api_mode_uses_remote_models(monkeypatch):
+    hub = MockHub()
+    monkeypatch.setattr(settings, "MODEL_MODE", "huggingface_api")
+    monkeypatch.setattr(settings, "HUGGINGFACE_API_KEY", "hf_test")
+    engine = InferenceEngine()
+    engine.remote = _client(hub)
+    try:
+        engine.load_models()
+        sentiments = engine._get_sentiments(["slow queries", "works great"])
+        summary = engine._generate_text("Summarize these issues")
+    finally:
+        engine.close()
+
+    assert [s["sentiment_type"] for s in sentiments] == ["negative", "positive"]
+    assert summary == "summary: Summarize these issues"
+    models = engine.readiness()["models"]
+    assert {m["backend"] for m in models.values()} == {"huggingface_api"}
+    assert all(m["state"] == "ready" for m in models.values())
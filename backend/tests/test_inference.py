@@ -1,6 +1,8 @@
+import json
 import pytest
 from app.inference import InferenceEngine
 from app.schemas import AnalysisReport
+from app.config import settings
 
 @pytest.fixture
 def sample_engagements():
@@ -19,7 +21,7 @@ def test_analyze_engagements_structure(sample_engagements):
     
     assert isinstance(report, AnalysisReport)
     assert len(report.plotly_data) == 3
-    assert "Performance" in str(report.plotly_data) or "Governance" in str(report.plotly_data)
+    assert "performance" in str(report.plotly_data) or "governance" in str(report.plotly_data)
     assert len(report.fixes) > 0
 
 def test_sentiment_fallback():
@@ -27,3 +29,87 @@ def test_sentiment_fallback():
     res = engine._get_sentiment("I love this!")
     assert res['sentiment_type'] == 'positive'
     assert res['sentiment_score'] > 0
+
+def test_batched_sentiment_matches_pipeline_output(monkeypatch):
+    monkeypatch.setattr(settings, "SENTIMENT_BATCH_SIZE", 2)
+    calls = []
+
+    def fake_pipeline(texts, **kwargs):
+        if isinstance(texts, str):
+            raise RuntimeError("single-text call")
+        calls.append(len(texts))
+        if any("boom" in t for t in texts):
+            raise RuntimeError("bad batch")
+        return [{"label": "NEGATIVE" if "slow" in t else "POSITIVE", "score": 0.9} for t in texts]
+
+    engine = InferenceEngine()
+    engine.sentiment_pipeline = fake_pipeline
+    texts = ["slow jobs", "works well", "", "boom I love this"]
+
+    results = engine._get_sentiments(texts)
+
+    assert results[0] == {"sentiment_type": "negative", "sentiment_score": -0.9}
+    assert results[1] == {"sentiment_type": "positive", "sentiment_score": 0.9}
+    assert results[2] == {"sentiment_type": "neutral", "sentiment_score": 0.0}
+    # Failed batch rows fall back individually (here to TextBlob)
+    assert results[3]['sentiment_type'] == 'positive'
+    assert calls == [2, 1]
+
+def test_stream_emits_partial_results_per_chunk(sample_engagements):
+    engine = InferenceEngine()
+    engine.models_loaded = True
+
+    events = [json.loads(e) for e in engine.stream_analyze_generator(iter(sample_engagements * 3), chunk_size=4)]
+    chunks = [e["data"] for e in events if e["event"] == "chunk_ready"]
+
+    assert [c["processed"] for c in chunks] == [4, 8, 9]
+    assert sum(chunks[-1]["sentiment_counts"].values()) == 9
+    assert chunks[-1]["topic_counts"]["governance"] == 3
+    assert chunks[0]["interim_summary"].startswith("Analyzed 4 engagements")
+
+    final = events[-1]
+    assert final["event"] == "final_report"
+    assert sum(c["size"] for c in final["data"]["clusters"]) == 9
+    assert len(final["data"]["plotly_data"]) == 3
+
+def test_background_startup_warms_models_and_reports_readiness(monkeypatch):
+    engine = InferenceEngine()
+    started = []
+
+    def fake_sentiment():
+        started.append("sentiment")
+        engine.sentiment_pipeline = lambda texts, **kwargs: []
+
+    def missing_embedding():
+        raise ImportError("No module named 'sentence_transformers'")
+
+    monkeypatch.setattr(engine, "_load_sentiment", fake_sentiment)
+    monkeypatch.setattr(engine, "_load_embedding", missing_embedding)
+    monkeypatch.setattr(engine, "_load_generation", lambda: None)
+
+    engine.start("background")
+    engine._warmup_thread.join(timeout=5)
+    # A request arriving after warm-up does not load again
+    engine.load_models()
+
+    readiness = engine.readiness()
+    models = readiness["models"]
+    assert readiness["policy"] == "background"
+    assert started == ["sentiment"]
+    assert models["sentiment"]["state"] == "ready"
+    assert models["sentiment"]["load_seconds"] >= 0
+    assert models["embedding"]["state"] == "fallback"
+    assert "sentence_transformers" in models["embedding"]["error"]
+    assert engine.embedding_model is None
+
+def test_lazy_startup_loads_nothing(monkeypatch):
+    monkeypatch.setattr(settings, "MODEL_STARTUP", "eager")
+    engine = InferenceEngine()
+    assert engine.readiness()["policy"] is None
+    engine.start("lazy")
+    assert not engine.models_loaded
+    # The applied policy is reported, not the configured one
+    assert engine.readiness()["policy"] == "lazy"
+    assert {m["state"] for m in engine.readiness()["models"].values()} == {"pending"}
+    with pytest.raises(ValueError):
+        engine.start("sometimes")
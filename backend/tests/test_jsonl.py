@@ -0,0 +1,25 @@
+import gzip
+import json
+from app.jsonl import iter_records, load_latest_by_id
+
+def test_reads_compressed_jsonl_lazily_and_keeps_last_version(tmp_path):
+    path = tmp_path / "results.jsonl.gz"
+    with gzip.open(path, "wt") as f:
+        for record in [{"id": "1", "v": 1}, {"id": "2", "v": 1}, {"id": "1", "v": 2}]:
+            f.write(json.dumps(record) + "\n")
+    # Appended runs add a new gzip member
+    with gzip.open(path, "at") as f:
+        f.write(json.dumps({"id": "3", "v": 1}) + "\n\n")
+
+    records = iter_records(str(path))
+    assert next(records) == {"id": "1", "v": 1}
+    assert len(list(records)) == 3
+
+    latest = load_latest_by_id(str(path))
+    assert list(latest) == ["2", "1", "3"]
+    assert latest["1"]["v"] == 2
+
+def test_plain_json_array_still_supported(tmp_path):
+    path = tmp_path / "sample.json"
+    path.write_text(json.dumps([{"id": "a"}, {"id": "b"}]))
+    assert [r["id"] for r in iter_records(str(path))] == ["a", "b"]
@@ -0,0 +1,51 @@
+from fastapi.testclient import TestClient
+from app.inference import InferenceEngine
+from app.main import app
+from app.metrics import Metrics, metrics
+
+def test_stage_timer_accumulates_and_renders_histogram():
+    registry = Metrics(buckets=(0.5, 1.0))
+    timings = {}
+    registry.observe_stage("sentiment", 0.75)
+    with registry.stage("sentiment", timings):
+        pass
+    with registry.stage("sentiment", timings):
+        pass
+    registry.inc("model_calls_total", model="sentiment")
+    registry.inc("model_calls_total", 2, model="sentiment")
+
+    assert set(timings) == {"sentiment"} and timings["sentiment"] < 0.5
+    assert registry.counter("model_calls_total", model="sentiment") == 3
+
+    text = registry.render({"sentiment": {"hits": 2, "disk_hits": 1, "misses": 4}})
+    assert 'analysis_stage_seconds_bucket{le="0.5",stage="sentiment"} 2' in text
+    assert 'analysis_stage_seconds_bucket{le="1",stage="sentiment"} 3' in text
+    assert 'analysis_stage_seconds_bucket{le="+Inf",stage="sentiment"} 3' in text
+    assert 'analysis_stage_seconds_count{stage="sentiment"} 3' in text
+    assert 'model_calls_total{model="sentiment"} 3' in text
+    assert 'cache_hits_total{cache="sentiment"} 3' in text
+    assert "# TYPE process_resident_memory_bytes gauge" in text
+
+def test_report_timings_and_metrics_endpoint():
+    metrics.reset()
+    engine = InferenceEngine()
+    engine.models_loaded = True
+    engagements = [
+        {"id": str(i), "customer": "A", "notes": note, "date": "2023-01-0%d" % (i + 1)}
+        for i, note in enumerate(["Slow Spark jobs.", "Great Delta Lake support.", "Slow Spark jobs."])
+    ]
+
+    report = engine.analyze_engagements(engagements)
+
+    assert {"prepare", "dedup", "sentiment", "topics", "summary", "plots", "total"} <= set(report.timings)
+    assert report.timings["total"] >= report.timings["sentiment"]
+    # No sentiment model is loaded, so the two distinct texts are scored with TextBlob
+    assert metrics.counter("sentiment_fallbacks_total") == 2
+    assert metrics.counter("analysis_rows_total", entry="batch") == 3
+
+    resp = TestClient(app).get("/metrics")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain")
+    assert 'analysis_stage_seconds_count{stage="plots"} 1' in resp.text
+    assert 'analysis_rows_total{entry="batch"} 3' in resp.text
+    assert 'cache_misses_total{cache="sentiment"}' in resp.text
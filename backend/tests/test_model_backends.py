@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+from app.config import settings
+from app.inference import InferenceEngine
+from app.model_backends import embedding_cache_id, parity_report, validate_backend
+
+def test_parity_report_flags_label_flips_and_embedding_drift():
+    baseline = [
+        {"sentiment_type": "positive", "sentiment_score": 0.91},
+        {"sentiment_type": "negative", "sentiment_score": -0.80}
+    ]
+    same = [dict(s) for s in baseline]
+    flipped = [dict(baseline[0]), {"sentiment_type": "positive", "sentiment_score": 0.51}]
+    emb = np.array([[1.0, 0.0], [0.6, 0.8]], dtype=np.float32)
+
+    ok = parity_report(baseline, same, emb, emb * 2)
+    assert ok["passed"] and ok["label_agreement"] == 1.0 and ok["min_cosine"] == 1.0
+
+    bad = parity_report(baseline, flipped, emb, emb)
+    assert not bad["passed"]
+    assert bad["label_agreement"] == 0.5
+    assert bad["max_score_drift"] == pytest.approx(1.31)
+
+    rotated = parity_report(baseline, same, emb, np.array([[0.0, 1.0], [0.6, 0.8]]))
+    assert not rotated["passed"] and rotated["min_cosine"] == 0.0
+
+def test_backends_keep_separate_embedding_cache_namespaces(monkeypatch):
+    assert embedding_cache_id("all-MiniLM-L6-v2", "torch") == "all-MiniLM-L6-v2"
+    assert embedding_cache_id("all-MiniLM-L6-v2", "onnx") == "all-MiniLM-L6-v2+onnx"
+    with pytest.raises(ValueError):
+        validate_backend("tensorrt")
+
+    monkeypatch.setattr(settings, "INFERENCE_BACKEND", "quantized")
+    engine = InferenceEngine()
+    assert engine.readiness()["models"]["sentiment"]["backend"] == "quantized"
@@ -0,0 +1,88 @@
+import gc
+import multiprocessing
+import threading
+import time
+import numpy as np
+import pytest
+from app.model_registry import ModelRegistry, model_footprint
+
+class FakeTensor:
+    def __init__(self, n, itemsize=4):
+        self.n, self.itemsize = n, itemsize
+
+    def numel(self):
+        return self.n
+
+    def element_size(self):
+        return self.itemsize
+
+class FakeModule:
+    def parameters(self):
+        return [FakeTensor(1000), FakeTensor(24)]
+
+    def buffers(self):
+        return [FakeTensor(8, itemsize=8)]
+
+class FakePipeline:
+    model = FakeModule()
+
+def test_concurrent_gets_load_once():
+    registry = ModelRegistry()
+    loads = []
+    barrier = threading.Barrier(8)
+
+    def loader():
+        loads.append(1)
+        time.sleep(0.05)
+        return FakePipeline()
+
+    results = []
+    def worker():
+        barrier.wait()
+        results.append(registry.get(("sentiment", "sst2", "torch"), loader))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(loads) == 1
+    assert all(r is results[0] for r in results)
+    stats = registry.stats()["sentiment/sst2/torch"]
+    assert stats["loaded"] and not stats["shared"]
+    assert model_footprint(results[0]) == 1024 * 4 + 64
+    assert model_footprint((FakeModule(), "tokenizer")) == 1024 * 4 + 64
+
+def test_failed_load_is_not_retried():
+    registry = ModelRegistry()
+    calls = []
+
+    def broken():
+        calls.append(1)
+        raise ImportError("no transformers")
+
+    for _ in range(3):
+        with pytest.raises(ImportError):
+            registry.get("generation", broken)
+    assert len(calls) == 1
+    assert registry.stats()["generation"]["error"] == "no transformers"
+
+def _child_stats(registry, queue):
+    value = registry.get("embedding", lambda: pytest.fail("reloaded in child"))
+    queue.put((registry.stats()["embedding"]["shared"], float(value.sum())))
+
+def test_forked_workers_inherit_preloaded_models():
+    registry = ModelRegistry()
+    registry.get("embedding", lambda: np.ones(1000, dtype=np.float32))
+    registry.freeze()
+    gc.unfreeze()
+
+    ctx = multiprocessing.get_context("fork")
+    queue = ctx.Queue()
+    proc = ctx.Process(target=_child_stats, args=(registry, queue))
+    proc.start()
+    shared, total = queue.get(timeout=10)
+    proc.join()
+
+    assert shared is True and total == 1000.0
@@ -0,0 +1,41 @@
+from app.inference import InferenceEngine
+from app.sentiment_cache import SentimentCache, make_key
+
+def test_normalized_keys_and_model_identity():
+    assert make_key("sst2", "Slow  jobs\n") == make_key("sst2", "Slow jobs")
+    assert make_key("sst2", "Slow jobs") != make_key("sst2", "slow jobs")
+    assert make_key("sst2", "Slow jobs") != make_key("textblob", "Slow jobs")
+
+def test_results_survive_restart_through_sqlite(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    first = SentimentCache(path, max_memory_entries=1)
+    first.put_many("sst2", {"a": {"sentiment_type": "positive", "sentiment_score": 0.9},
+                            "b": {"sentiment_type": "negative", "sentiment_score": -0.4}})
+    # Only one entry fits in memory; the other comes back from disk
+    assert first.get_many("sst2", ["a", "b"])["a"]["sentiment_score"] == 0.9
+    first.close()
+
+    restarted = SentimentCache(path)
+    found = restarted.get_many("sst2", ["a", "b", "c", ""])
+    assert set(found) == {"a", "b"}
+    assert restarted.get_many("other-model", ["a"]) == {}
+    stats = restarted.stats()
+    assert stats["disk_hits"] == 2 and stats["misses"] == 2
+
+def test_engine_scores_each_distinct_text_once(isolated_sentiment_cache):
+    calls = []
+
+    def fake_pipeline(texts, **kwargs):
+        calls.append(list(texts))
+        return [{"label": "POSITIVE", "score": 0.8} for _ in texts]
+
+    engine = InferenceEngine()
+    engine.sentiment_pipeline = fake_pipeline
+    texts = ["Great support", "Great support", "Slow cluster"]
+
+    first = engine._get_sentiments(texts)
+    second = engine._get_sentiments(["Slow cluster", "Great support"])
+
+    assert calls == [["Great support", "Slow cluster"]]
+    assert first[0] == first[1] == second[1]
+    assert isolated_sentiment_cache.stats()["hits"] >= 2
@@ -0,0 +1,48 @@
+import pandas as pd
+from app.config import settings
+from app.jsonl import iter_records
+from app.topics import KeywordAutomaton, topic_matcher
+
+def test_automaton_counts_overlapping_keywords_in_one_pass():
+    automaton = KeywordAutomaton([("x", ["he", "she", "hers"]), ("y", ["s"])])
+    assert automaton.count("USHERS") == {"x": 3, "y": 2}
+    assert automaton.count("") == {}
+
+def test_matcher_reports_all_topics_and_keeps_priority():
+    result = topic_matcher.match("Slow Kafka streaming jobs")
+    assert result["topic"] == "streaming"
+    assert result["matches"] == {"streaming": 2, "performance": 1}
+    assert 0.5 < result["confidence"] < 0.95
+
+    only = topic_matcher.match("Unity Catalog permissions")
+    assert only == {"topic": "governance", "confidence": 0.95, "matches": {"governance": 2}}
+    assert topic_matcher.match("Nothing to see")["topic"] == "general"
+
+def test_topics_match_the_pipeline_vocabulary():
+    # First-match topics of the pipeline's original per-keyword scan
+    original = {
+        "streaming": ["streaming", "auto loader", "kafka", "real-time"],
+        "governance": ["governance", "unity catalog", "permissions", "access control"],
+        "performance": ["performance", "slow", "optimize", "latency", "tuning"],
+        "migration": ["migration", "legacy", "convert", "move"],
+        "infrastructure": ["terraform", "deployment", "setup", "configuration", "network"]
+    }
+    texts = [k.upper() for keywords in original.values() for k in keywords] + [
+        "Moving to production next week.",
+        "Initial setup of Unity Catalog was challenging due to legacy data formats.",
+        "Unity adoption",
+        "Nothing to see"
+    ]
+    for text in texts:
+        expected = next((t for t, keywords in original.items() if any(k in text.lower() for k in keywords)), "general")
+        assert topic_matcher.match(text)["topic"] == expected, text
+    # "unity" on its own is not a governance keyword; "unity catalog" is
+    assert topic_matcher.match("Unity adoption")["topic"] == "general"
+
+def test_vectorized_assign_matches_row_by_row():
+    texts = [f"{r.get('notes', '')} {r.get('feedback', '')}" for r in iter_records(settings.SAMPLE_DATA_PATH)]
+    texts += ["", None, "Kafka latency (tuning) [legacy]", "UNITY catalog move"]
+    series = pd.Series(texts)
+
+    expected = [topic_matcher.match(t or "")["topic"] for t in texts]
+    assert topic_matcher.assign(series).tolist() == expected
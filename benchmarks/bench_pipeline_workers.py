@@ -0,0 +1,76 @@
+"""
+Throughput of main_pipeline.score_engagements for 1..N worker processes.
+
+Writes a seeded synthetic dataset once with app.utils.data_generator, streams
+it through the scorer once per worker count and checks that every run produces
+identical output. Records are read and hashed as they go, so memory stays
+bounded by the chunks in flight whatever --records is.
+
+    python -m benchmarks.bench_pipeline_workers --records 1000000 --max-workers 8
+"""
+import argparse
+import hashlib
+import json
+import os
+import tempfile
+import time
+from app.main_pipeline import score_engagements, read_input, CHUNK_SIZE
+from app.utils.data_generator import write_dataset
+from backend.shared.vocabulary import CUSTOMERS
+
+DATASET_SPEC = {
+    "seed": 42,
+    "customers": len(CUSTOMERS),
+    "customer_skew": 0.0,
+    "tech_skew": 0.0,
+    "start_date": "2025-01-01",
+    "days": 90
+}
+
+def make_dataset(path, n):
+    write_dataset(path, n, DATASET_SPEC, workers=os.cpu_count() or 1)
+
+def run(path, workers, chunk_size):
+    """Scores the dataset at path; returns (records, output digest, seconds)."""
+    digest = hashlib.sha256()
+    count = 0
+    start = time.perf_counter()
+    # No sentiment cache: measure scoring, not cache lookups
+    for r in score_engagements(read_input(path), workers=workers, chunk_size=chunk_size, sentiment_cache_path=None):
+        digest.update(f"{r['id']}\t{r['sentiment']['sentiment_score']}\t{r['topic']['topic']}\n".encode("utf-8"))
+        count += 1
+    elapsed = time.perf_counter() - start
+    return count, digest.hexdigest(), elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=1_000_000)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--dataset", help="Reuse (or create) this .jsonl/.parquet dataset instead of a temporary one")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.dataset or os.path.join(tmp, "engagements.jsonl")
+        if not os.path.exists(path):
+            print(f"Generating {args.records} records into {path}...")
+            make_dataset(path, args.records)
+
+        baseline = None
+        results = []
+        for workers in range(1, args.max_workers + 1):
+            count, digest, elapsed = run(path, workers, args.chunk_size)
+            if baseline is None:
+                baseline = digest
+            result = {
+                "workers": workers,
+                "seconds": round(elapsed, 2),
+                "records_per_s": round(count / elapsed, 1),
+                "speedup": round(results[0]["seconds"] / elapsed, 2) if results else 1.0,
+                "identical_output": digest == baseline
+            }
+            results.append(result)
+            print(json.dumps(result))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Keyword matching cost as the vocabulary grows: per-keyword substring scans
+(the previous TopicExtractor approach) vs. the single-pass KeywordAutomaton.
+
+    python -m benchmarks.bench_topic_matcher --texts 2000 --keywords 10 100 1000 5000
+"""
+import argparse
+import json
+import random
+import time
+from backend.shared.topics import TOPIC_KEYWORDS, KeywordAutomaton, ahocorasick
+from app.utils.data_generator import generate_columns
+from backend.shared.vocabulary import CUSTOMERS
+
+# Seeded synthetic engagements for the texts to match
+TEXT_SPEC = {
+    "seed": 7,
+    "customers": len(CUSTOMERS),
+    "customer_skew": 0.0,
+    "tech_skew": 0.0,
+    "start_date": "2025-01-01",
+    "days": 90
+}
+
+def make_vocabulary(n_keywords, rng):
+    """The real topic keywords padded with synthetic ones, spread over 50 labels."""
+    vocab = [(topic, list(keywords)) for topic, keywords in TOPIC_KEYWORDS]
+    extra = n_keywords - sum(len(k) for _, k in vocab)
+    for i in range(max(0, extra)):
+        word = "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(5, 12)))
+        vocab.append((f"label_{i % 50}", [word]))
+    return vocab
+
+def naive_count(vocab, text):
+    text_lower = text.lower()
+    return {label: 1 for label, keywords in vocab if any(k in text_lower for k in keywords)}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--texts", type=int, default=2000)
+    parser.add_argument("--keywords", type=int, nargs="+", default=[25, 100, 1000, 5000])
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    columns = generate_columns(0, args.texts, TEXT_SPEC)
+    texts = [f"{notes} {feedback}" for notes, feedback in zip(columns["notes"], columns["feedback"])]
+
+    print(f"automaton backend: {'pyahocorasick' if ahocorasick else 'pure Python'}")
+    for n_keywords in args.keywords:
+        vocab = make_vocabulary(n_keywords, rng)
+
+        start = time.perf_counter()
+        automaton = KeywordAutomaton(vocab)
+        build_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for text in texts:
+            naive_count(vocab, text)
+        naive_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for text in texts:
+            automaton.count(text)
+        automaton_s = time.perf_counter() - start
+
+        print(json.dumps({
+            "keywords": n_keywords,
+            "texts": len(texts),
+            "naive_ms": round(naive_s * 1000, 1),
+            "automaton_ms": round(automaton_s * 1000, 1),
+            "build_ms": round(build_s * 1000, 1),
+            "speedup": round(naive_s / automaton_s, 2)
+        }))
+
+if __name__ == "__main__":
+    main()
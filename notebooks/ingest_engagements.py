@@ -1,12 +1,13 @@
 # Databricks notebook source
 # MAGIC %md
 # MAGIC # Ingest Engagements Data (Embedded)
-# MAGIC This notebook contains sample data inline and creates a Delta table.
+# MAGIC This notebook contains new or changed sample data inline and merges it into a Delta table.
 
 # COMMAND ----------
 
 from pyspark.sql.types import StructType, StructField, StringType, ArrayType, FloatType
 from pyspark.sql.functions import col, to_date
+from delta.tables import DeltaTable
 
 # Sample Data (Embedded)
 raw_data = [
@@ -665,12 +666,20 @@ display(df)
 
 # COMMAND ----------
 
-# Create table
+# Upsert into the table: only new or changed engagements are embedded above
 table_name = "engagements"
 df_processed = df.withColumn("date", to_date(col("date")))
-df_processed.write.format("delta").mode("overwrite").saveAsTable(table_name)
 
-print(f"Successfully created table '{table_name}' with {len(raw_data)} records.")
+if spark.catalog.tableExists(table_name):
+    (DeltaTable.forName(spark, table_name).alias("t")
+        .merge(df_processed.alias("s"), "t.id = s.id")
+        .whenMatchedUpdateAll()
+        .whenNotMatchedInsertAll()
+        .execute())
+    print(f"Merged {len(raw_data)} new or changed records into '{table_name}'.")
+else:
+    df_processed.write.format("delta").saveAsTable(table_name)
+    print(f"Successfully created table '{table_name}' with {len(raw_data)} records.")
 
 # COMMAND ----------
 
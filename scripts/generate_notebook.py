@@ -1,19 +1,58 @@
+import argparse
 import json
+import os
+import sys
 
-# Read sample data
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app.utils.watermark import WatermarkStore
+
+MAX_EMBEDDED_RECORDS = 50
+WATERMARK_PATH = 'data/processed/notebook_watermark.json'
+# Records embedded in the last generated notebook, until it is marked as ingested
+PENDING_PATH = 'data/processed/notebook_pending.json'
+
+parser = argparse.ArgumentParser(description="Generate the Databricks ingest notebook.")
+parser.add_argument("--full", action="store_true", help="Embed from scratch instead of only new or changed engagements")
+parser.add_argument("--mark-ingested", action="store_true",
+                    help="Record the last generated notebook's engagements as ingested, after it ran successfully")
+args = parser.parse_args()
+
+watermark = WatermarkStore(WATERMARK_PATH)
+
+if args.mark_ingested:
+    # The watermark only moves once the notebook has actually merged its records
+    if not os.path.exists(PENDING_PATH):
+        sys.exit(f"Nothing to mark: {PENDING_PATH} not found. Generate a notebook first.")
+    with open(PENDING_PATH) as f:
+        pending = json.load(f)
+    if pending["full"]:
+        watermark.reset()
+    ingested = pending["records"]
+    for record in ingested:
+        watermark.advance(record)
+    watermark.save()
+    os.remove(PENDING_PATH)
+    print(f"Marked {len(ingested)} engagements as ingested. Watermark: {watermark.last_date} / {watermark.last_id}")
+    sys.exit(0)
+
+if args.full:
+    watermark.reset()
+
+# Read sample data, keeping only engagements not yet pushed to the Delta table
 with open('backend/sample_data/engagements_sample.json') as f:
-    data = json.load(f)[:50] # Take 50 records
+    data = list(watermark.changed(json.load(f)))[:MAX_EMBEDDED_RECORDS] # Take 50 records
 
 # Create notebook content
 notebook_content = f"""# Databricks notebook source
 # MAGIC %md
 # MAGIC # Ingest Engagements Data (Embedded)
-# MAGIC This notebook contains sample data inline and creates a Delta table.
+# MAGIC This notebook contains new or changed sample data inline and merges it into a Delta table.
 
 # COMMAND ----------
 
 from pyspark.sql.types import StructType, StructField, StringType, ArrayType, FloatType
 from pyspark.sql.functions import col, to_date
+from delta.tables import DeltaTable
 
 # Sample Data (Embedded)
 raw_data = {json.dumps(data, indent=2)}
@@ -45,12 +84,20 @@ display(df)
 
 # COMMAND ----------
 
-# Create table
+# Upsert into the table: only new or changed engagements are embedded above
 table_name = "engagements"
 df_processed = df.withColumn("date", to_date(col("date")))
-df_processed.write.format("delta").mode("overwrite").saveAsTable(table_name)
 
-print(f"Successfully created table '{{table_name}}' with {{len(raw_data)}} records.")
+if spark.catalog.tableExists(table_name):
+    (DeltaTable.forName(spark, table_name).alias("t")
+        .merge(df_processed.alias("s"), "t.id = s.id")
+        .whenMatchedUpdateAll()
+        .whenNotMatchedInsertAll()
+        .execute())
+    print(f"Merged {{len(raw_data)}} new or changed records into '{{table_name}}'.")
+else:
+    df_processed.write.format("delta").saveAsTable(table_name)
+    print(f"Successfully created table '{{table_name}}' with {{len(raw_data)}} records.")
 
 # COMMAND ----------
 
@@ -61,4 +108,11 @@ print(f"Successfully created table '{{table_name}}' with {{len(raw_data)}} recor
 with open('notebooks/ingest_engagements.py', 'w') as f:
     f.write(notebook_content)
 
-print("Generated notebooks/ingest_engagements.py with embedded data.")
+# Not advanced here: the records count as ingested only after the notebook runs
+# and --mark-ingested is called (which also applies a --full reset)
+os.makedirs(os.path.dirname(PENDING_PATH), exist_ok=True)
+with open(PENDING_PATH, 'w') as f:
+    json.dump({"full": args.full, "records": data}, f)
+
+print(f"Generated notebooks/ingest_engagements.py with {len(data)} new or changed records.")
+print("After running it in Databricks, record them with: python scripts/generate_notebook.py --mark-ingested")
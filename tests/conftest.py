@@ -0,0 +1,6 @@
+import os
+import sys
+
+# The pipeline runs as `python -m app.main_pipeline` from the repo root; put
+# that root on sys.path so `pytest tests` works from anywhere
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,43 @@
+import numpy as np
+import pyarrow.parquet as pq
+from app.main_pipeline import read_input
+from app.utils.data_generator import main, zipf_weights
+
+def generate(path, *extra):
+    main(["--output", str(path), "--seed", "7", "--end-date", "2025-01-31", *extra])
+
+def test_output_does_not_depend_on_worker_count(tmp_path):
+    generate(tmp_path / "one.jsonl", "--count", "250", "--chunk-size", "60", "--workers", "1")
+    generate(tmp_path / "two.jsonl", "--count", "250", "--chunk-size", "60", "--workers", "2")
+    assert (tmp_path / "one.jsonl").read_bytes() == (tmp_path / "two.jsonl").read_bytes()
+
+def test_formats_round_trip_through_read_input(tmp_path):
+    for fmt in ("json", "jsonl", "jsonl.gz", "parquet"):
+        generate(tmp_path / f"out.{fmt}", "--count", "120", "--chunk-size", "50", "--workers", "1")
+
+    expected = list(read_input(str(tmp_path / "out.json")))
+    assert len(expected) == 120
+    assert [r["id"] for r in expected[:2]] == ["ENG-001", "ENG-002"]
+    assert all(1 <= len(r["technologies"]) <= 4 and "2024-11-02" <= r["date"] <= "2025-01-31" for r in expected)
+    for fmt in ("jsonl", "jsonl.gz", "parquet"):
+        assert list(read_input(str(tmp_path / f"out.{fmt}"))) == expected, fmt
+
+def test_zero_count_writes_empty_files_with_schema(tmp_path):
+    for fmt in ("json", "jsonl", "parquet"):
+        generate(tmp_path / f"empty.{fmt}", "--count", "0")
+        assert list(read_input(str(tmp_path / f"empty.{fmt}"))) == []
+    assert "technologies" in pq.read_schema(tmp_path / "empty.parquet").names
+
+def test_zipf_weights():
+    assert np.allclose(zipf_weights(4, 0), 0.25)
+    weights = zipf_weights(10, 1.5)
+    assert np.isclose(weights.sum(), 1.0)
+    assert np.all(np.diff(weights) < 0)
+    assert np.isclose(weights[0] / weights[1], 2 ** 1.5)
+
+def test_customer_skew_concentrates_records(tmp_path):
+    generate(tmp_path / "skewed.jsonl", "--count", "2000", "--customers", "50", "--customer-skew", "2")
+    customers = [r["customer"] for r in read_input(str(tmp_path / "skewed.jsonl"))]
+    top_share = customers.count(max(set(customers), key=customers.count)) / len(customers)
+    # Rank 1 carries 1 / sum(1 / k**2 for k <= 50), about 61%, of the mass
+    assert 0.55 < top_share < 0.67
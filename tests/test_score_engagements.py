@@ -0,0 +1,35 @@
+import time
+from app import main_pipeline
+
+CHUNK_SIZE = 4
+WORKERS = 2
+
+class StubSentimentModel:
+    """Answers in reverse chunk order (earlier ids sleep longer), so out-of-order completion is likely."""
+    MODEL_ID = "stub"
+
+    def analyze_many(self, texts, cache=None):
+        first_id = int(texts[0].split()[0])
+        time.sleep(max(0.0, 0.2 - 0.01 * first_id))
+        return [{"sentiment_type": "neutral", "sentiment_score": float(text.split()[0])} for text in texts]
+
+def test_two_workers_keep_input_order_and_bound_in_flight_chunks():
+    pulled = 0
+
+    def engagements(n):
+        nonlocal pulled
+        for i in range(n):
+            pulled += 1
+            yield {"id": i, "notes": str(i), "feedback": "note"}
+
+    scored = []
+    for eng in main_pipeline.score_engagements(
+        engagements(40), workers=WORKERS, chunk_size=CHUNK_SIZE, sentiment_cache_path=None, dedup="off",
+        sentiment_model=StubSentimentModel
+    ):
+        scored.append(eng)
+        # Records read but not yet handed back never exceed 2 * workers chunks
+        assert pulled - len(scored) < 2 * WORKERS * CHUNK_SIZE
+
+    assert [eng["id"] for eng in scored] == list(range(40))
+    assert [eng["sentiment"]["sentiment_score"] for eng in scored] == [float(i) for i in range(40)]
@@ -0,0 +1,44 @@
+import os
+from app import main_pipeline
+from app.llm.sentiment_model import SentimentModel
+from app.utils.sentiment_cache import SENTIMENT_CACHE_PATH, SentimentCache
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def records(notes):
+    return [{"id": str(i), "notes": note, "feedback": ""} for i, note in enumerate(notes)]
+
+def test_default_path_is_the_api_cache_file():
+    if "SENTIMENT_CACHE_PATH" not in os.environ:
+        assert os.path.realpath(SENTIMENT_CACHE_PATH) == os.path.join(REPO_ROOT, "backend", ".cache", "sentiment.sqlite")
+
+def test_results_persist_across_cache_instances(tmp_path):
+    path = str(tmp_path / "sentiment.sqlite")
+    first = SentimentCache(path)
+    scored = SentimentModel().analyze_many(["Great  support.", "Slow jobs."], first)
+    first.close()
+
+    second = SentimentCache(path)
+    found = second.get_many(SentimentModel.MODEL_ID, ["Great support.", "Slow jobs.", "New text."])
+    # Keys use normalized text, so the whitespace difference still hits
+    assert found["Great support."] == scored[0]
+    assert set(found) == {"Great support.", "Slow jobs."} and second.misses == 1
+    second.close()
+
+def test_single_process_runs_reuse_one_connection(tmp_path, monkeypatch):
+    monkeypatch.setattr(main_pipeline, "_worker_models", None)
+    path = str(tmp_path / "sentiment.sqlite")
+
+    list(main_pipeline.score_engagements(records(["Great support."]), sentiment_cache_path=path))
+    cache = main_pipeline._worker_models[2]
+    connection = cache._conn
+    list(main_pipeline.score_engagements(records(["Great support."]), sentiment_cache_path=path))
+
+    assert main_pipeline._worker_models[2] is cache and cache._conn is connection
+    # The second run was answered from the in-memory tier of the same cache
+    assert cache.hits == 1
+
+    # A different file closes the previous connection
+    list(main_pipeline.score_engagements(records(["Great support."]), sentiment_cache_path=str(tmp_path / "other.sqlite")))
+    assert cache._conn is None
+    main_pipeline._worker_models[2].close()
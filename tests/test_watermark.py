@@ -0,0 +1,104 @@
+import json
+from app.main_pipeline import main
+from app.utils.watermark import WatermarkStore
+
+def make_records(n):
+    return [
+        {"id": f"ENG-{i:03d}", "customer": "A", "notes": f"Slow Kafka job {i}.", "feedback": "Great help.",
+         "date": f"2024-01-{i % 28 + 1:02d}"}
+        for i in range(n)
+    ]
+
+def write_jsonl(path, records):
+    with open(path, "w") as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+
+def run(input_path, output_path, *extra):
+    main(["--input", str(input_path), "--output", str(output_path), "--sentiment-cache", "", *extra])
+
+def test_store_tracks_changes_and_round_trips(tmp_path):
+    path = str(tmp_path / "wm" / "watermark.json")
+    records = make_records(3)
+    store = WatermarkStore(path)
+    assert list(store.changed(records)) == records
+
+    for record in records[:2]:
+        store.advance(record)
+    assert [r["id"] for r in store.changed(records)] == ["ENG-002"]
+    assert (store.last_date, store.last_id) == ("2024-01-02", "ENG-001")
+
+    # Derived fields do not count as a change; edited source fields do
+    enriched = dict(records[0], sentiment={"sentiment_type": "positive"}, topic={"topic": "streaming"})
+    edited = dict(records[1], notes="Edited.")
+    assert list(store.changed([enriched, edited])) == [edited]
+
+    store.save()
+    loaded = WatermarkStore(path)
+    assert (loaded.last_date, loaded.last_id) == ("2024-01-02", "ENG-001")
+    assert [r["id"] for r in loaded.changed(records)] == ["ENG-002"]
+
+    loaded.reset()
+    assert loaded.last_date is None and list(loaded.changed(records)) == records
+
+def test_batch_run_merges_changed_records_into_existing_results(tmp_path):
+    records = make_records(3)
+    (tmp_path / "in.json").write_text(json.dumps(records))
+    run(tmp_path / "in.json", tmp_path / "out.json")
+
+    records[1]["notes"] = "Governance review with Unity Catalog."
+    records.append(dict(records[0], id="ENG-NEW"))
+    (tmp_path / "in.json").write_text(json.dumps(records))
+    run(tmp_path / "in.json", tmp_path / "out.json")
+
+    output = json.loads((tmp_path / "out.json").read_text())
+    # The edited record is replaced in place and the new one appended
+    assert [e["id"] for e in output["engagements"]] == ["ENG-000", "ENG-001", "ENG-002", "ENG-NEW"]
+    assert output["engagements"][1]["topic"]["topic"] == "governance"
+    assert "4 engagements analyzed" in output["weekly_summary"]
+    state = json.loads((tmp_path / "out.watermark.json").read_text())
+    assert sorted(state["hashes"]) == ["ENG-000", "ENG-001", "ENG-002", "ENG-NEW"]
+
+def test_full_batch_run_drops_records_missing_from_the_input(tmp_path):
+    (tmp_path / "in.json").write_text(json.dumps(make_records(3)))
+    run(tmp_path / "in.json", tmp_path / "out.json")
+    (tmp_path / "in.json").write_text(json.dumps(make_records(2)))
+    run(tmp_path / "in.json", tmp_path / "out.json", "--full")
+
+    output = json.loads((tmp_path / "out.json").read_text())
+    assert [e["id"] for e in output["engagements"]] == ["ENG-000", "ENG-001"]
+    assert sorted(json.loads((tmp_path / "out.watermark.json").read_text())["hashes"]) == ["ENG-000", "ENG-001"]
+
+def test_streaming_keeps_hashes_on_disk_and_summarizes_every_engagement(tmp_path):
+    records = make_records(5)
+    write_jsonl(tmp_path / "in.jsonl", records)
+    run(tmp_path / "in.jsonl", tmp_path / "out.jsonl")
+
+    records[0]["notes"] = "Terrible outage."
+    records.append(dict(records[1], id="ENG-NEW"))
+    write_jsonl(tmp_path / "in.jsonl", records)
+    run(tmp_path / "in.jsonl", tmp_path / "out.jsonl")
+
+    # Only the edited and the new record are appended
+    assert len((tmp_path / "out.jsonl").read_text().splitlines()) == 7
+    state = json.loads((tmp_path / "out.watermark.json").read_text())
+    assert "hashes" not in state
+    # The summary covers all six engagements, not only this run's two
+    summary = json.loads((tmp_path / "out.summary.json").read_text())
+    assert summary["engagements"] == 6
+
+    store = WatermarkStore(str(tmp_path / "out.watermark.json"), index_path=str(tmp_path / "out.watermark.sqlite"))
+    assert list(store.changed(records)) == []
+    sentiments, topics = store.index.counts()
+    # The edited record is counted with its new topic only
+    assert sum(sentiments.values()) == 6 and topics == {"streaming": 5, "general": 1}
+    store.close()
+
+def test_full_streaming_run_clears_the_index(tmp_path):
+    write_jsonl(tmp_path / "in.jsonl", make_records(4))
+    run(tmp_path / "in.jsonl", tmp_path / "out.jsonl")
+    write_jsonl(tmp_path / "in.jsonl", make_records(2))
+    run(tmp_path / "in.jsonl", tmp_path / "out.jsonl", "--full")
+
+    assert len((tmp_path / "out.jsonl").read_text().splitlines()) == 2
+    assert json.loads((tmp_path / "out.summary.json").read_text())["engagements"] == 2